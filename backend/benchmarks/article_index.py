@@ -0,0 +1,90 @@
+"""
+In-memory article index benchmark.
+
+Indexes synthetic articles (1M by default) drawn from a Zipf-like
+vocabulary, then reports build time, index size and per-query latency
+(first run and repeated) for term, AND, OR, NOT and phrase queries.
+
+Run with:
+    python -m backend.benchmarks.article_index [count]
+"""
+import itertools
+import json
+import random
+import sys
+import time
+import timeit
+
+from backend.services.article_index import ArticleIndex
+
+QUERIES = [
+    'rare7',
+    'common3',
+    'market',
+    'election climate',
+    'election OR climate',
+    'climate -election',
+    '"climate research"',
+    '(bitcoin OR crypto) regulation'
+]
+
+
+def vocabulary(size: int = 50000) -> tuple:
+    """Words with cumulative Zipf-like weights: a few common, a long rare tail."""
+    words = [
+        'election', 'climate', 'research', 'bitcoin', 'crypto', 'regulation',
+        'market', 'minister', 'energy', 'health'
+    ] + [f'common{i}' for i in range(90)] + [f'rare{i}' for i in range(size - 100)]
+    return words, list(itertools.accumulate(1 / (rank + 10) for rank in range(len(words))))
+
+
+def synthetic_articles(count: int, seed: int = 0, batch: int = 100):
+    """Yield windows of encoded articles, like the service's fetched windows."""
+    rng = random.Random(seed)
+    words, cum_weights = vocabulary()
+    for start in range(0, count, batch):
+        window = []
+        for i in range(start, min(start + batch, count)):
+            title = rng.choices(words, cum_weights=cum_weights, k=8)
+            description = rng.choices(words, cum_weights=cum_weights, k=25)
+            if i % 50 == 0:
+                description[:2] = ['climate', 'research']
+            window.append(json.dumps({
+                'source': {'id': None, 'name': 'Example'},
+                'author': None,
+                'title': ' '.join(title),
+                'description': ' '.join(description),
+                'url': f'https://example.com/{i}',
+                'urlToImage': None,
+                'publishedAt': f'2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z',
+                'content': None
+            }))
+        yield window
+
+
+def main(count: int = 1_000_000, number: int = 20) -> None:
+    """Build the index and time each query."""
+    index = ArticleIndex()
+    started = time.perf_counter()
+    for window in synthetic_articles(count):
+        index.add(window)
+    build = time.perf_counter() - started
+
+    stats = index.stats()
+    print(f"indexed {stats['articles']:,} articles in {build:.1f}s "
+          f"({build / count * 1e6:.1f} us/article)")
+    print(f"{stats['terms']:,} terms, {stats['postings']:,} postings, "
+          f"{stats['posting_bytes'] / 2 ** 20:.1f} MiB of posting arrays")
+
+    # First run builds cached term/phrase bitmaps; repeats reuse them
+    print(f"\n{'query':<34} {'matches':>9} {'ms first':>9} {'ms/query':>9}")
+    for query in QUERIES:
+        started = time.perf_counter()
+        total, _ = index.search(query)
+        first = time.perf_counter() - started
+        seconds = min(timeit.repeat(lambda: index.search(query), number=number, repeat=3)) / number
+        print(f"{query:<34} {total:>9,} {first * 1e3:>9.3f} {seconds * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,77 @@
+"""
+Cache compression benchmark.
+
+Stores cached 100-article windows (as NewsAPIService caches them) in the
+in-memory backend with each compression setting, and reports bytes per
+entry, how many entries fit in the default 64 MiB budget, and the cost
+of a cache hit including decompression and page encoding.
+
+Run with:
+    python -m backend.benchmarks.cache_compression
+"""
+import importlib.util
+import random
+import timeit
+
+from backend.benchmarks.cache_hit import make_upstream_page
+from backend.services.news_api import NewsAPIService
+from backend.utils.cache import NewsCache
+from backend.utils.cache_backends import EntryCodec, MemoryBackend
+
+BUDGET = 64 * 1024 * 1024
+
+
+def varied_page(rng: random.Random, count: int = 100) -> dict:
+    """make_upstream_page with varied prose, which compresses like real text."""
+    words = [
+        'market', 'government', 'election', 'climate', 'research', 'company',
+        'report', 'minister', 'season', 'growth', 'energy', 'health', 'city',
+        'court', 'policy', 'team', 'data', 'price', 'study', 'launch'
+    ] + [f'term{i}' for i in range(2000)]
+
+    def text(n: int) -> str:
+        return ' '.join(rng.choice(words) for _ in range(n))
+
+    page = make_upstream_page(count)
+    for article in page['articles']:
+        article['title'] = text(10)
+        article['description'] = text(35)
+        article['content'] = text(40)
+    return page
+
+
+def codecs():
+    """Compression settings to compare (zstd only when installed)."""
+    yield EntryCodec("none")
+    for level in (1, 6, 9):
+        yield EntryCodec("zlib", level)
+    if importlib.util.find_spec("zstandard") is not None:
+        for level in (1, 3, 9):
+            yield EntryCodec("zstd", level)
+
+
+def main(entries: int = 50, number: int = 500) -> None:
+    """Measure size and hit latency for every compression setting."""
+    service = NewsAPIService()
+    rng = random.Random(0)
+    windows = [service._encode_window(varied_page(rng)) for _ in range(entries)]
+
+    print(f"{'codec':>10} {'bytes/entry':>12} {'entries/64MiB':>14} {'us/hit':>8}")
+    for codec in codecs():
+        cache = NewsCache(backend=MemoryBackend(maxsize=entries, codec=codec))
+        for i, window in enumerate(windows):
+            cache.set('headlines', {'page': i}, window)
+
+        per_entry = cache.backend.bytes / entries
+
+        def hit() -> bytes:
+            window = cache.get('headlines', {'page': 0})
+            return service._encode_page(window, 1, 10)
+
+        seconds = min(timeit.repeat(hit, number=number, repeat=3)) / number
+        name = codec.compression if codec.level is None else f"{codec.compression}-{codec.level}"
+        print(f"{name:>10} {per_entry:>12,.0f} {BUDGET / per_entry:>14,.0f} {seconds * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cache hit latency benchmark.
+
+Compares serving a cached 100-article page the old way (rebuild the
+NewsResponse from a cached dict, then serialize it like FastAPI's
+response_model path) with the pre-encoded path (join cached article
+JSON fragments into the response body).
+
+Run with:
+    python -m backend.benchmarks.cache_hit
+"""
+import json
+import timeit
+
+from backend.models.article import NewsResponse
+from backend.services.news_api import NewsAPIService
+
+
+def make_upstream_page(count: int = 100) -> dict:
+    """Build a NewsAPI-style page with realistic article sizes."""
+    return {
+        'status': 'ok',
+        'totalResults': count,
+        'articles': [
+            {
+                'source': {'id': 'bbc-news', 'name': 'BBC News'},
+                'author': 'Jane Doe',
+                'title': f'Article number {i} about markets, politics and science',
+                'description': 'A short description of the article. ' * 4,
+                'url': f'https://example.com/news/2024/01/15/article-{i}',
+                'urlToImage': f'https://cdn.example.com/images/article-{i}.jpg',
+                'publishedAt': '2024-01-15T10:30:00Z',
+                'content': 'Body text of the article truncated by NewsAPI... ' * 5
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def main(count: int = 100, number: int = 2000) -> None:
+    """Time both hit paths and print per-hit latency."""
+    service = NewsAPIService()
+    # The synthetic articles are near-duplicates; keep all of them
+    service.dedup_threshold = None
+    upstream = make_upstream_page(count)
+
+    # Old path: cache held model_dump() of the response
+    cached_dict = service._transform_response(upstream, 1, count).model_dump(mode='json')
+
+    def old_hit() -> bytes:
+        response = NewsResponse(**cached_dict)
+        content = response.model_dump(mode='json', by_alias=True)
+        return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode()
+
+    # New path: cache holds pre-encoded article fragments
+    window = service._encode_window(upstream)
+
+    def new_hit() -> bytes:
+        return service._encode_page(window, 1, count)
+
+    assert json.loads(old_hit()) == json.loads(new_hit())
+
+    for name, fn in (('validate + serialize', old_hit), ('pre-encoded bytes', new_hit)):
+        seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(f"{name:>22}: {seconds * 1e6:9.1f} us per {count}-article hit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Story clustering benchmark.
+
+Feeds synthetic articles (20k by default) about a smaller number of
+stories into the clusterer in fetched windows of 100, then reports the
+per-article clustering cost, the size of the centroids, clustering
+quality (purity and completeness) and the latency of cluster queries.
+
+Run with:
+    python -m backend.benchmarks.clustering [count]
+"""
+from collections import Counter
+import itertools
+import json
+import random
+import sys
+import time
+import timeit
+
+from backend.services.clustering import StoryClusterer
+
+SOURCES = ['Reuters', 'AP', 'AFP', 'BBC', 'CNN', 'Bloomberg']
+
+
+def synthetic_articles(count: int, seed: int = 0, batch: int = 100):
+    """
+    Yield windows of encoded articles and the story of each article.
+
+    Every story has its own key words; its articles mix several of them
+    with common background words, so copies are related but not
+    identical.
+    """
+    rng = random.Random(seed)
+    background = [f'common{i}' for i in range(2000)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 5) for rank in range(len(background))))
+    stories = []
+    for start in range(0, count, batch):
+        window, labels = [], []
+        for i in range(start, min(start + batch, count)):
+            if not stories or rng.random() < 0.25:
+                stories.append([f's{len(stories)}k{j}' for j in range(12)])
+                story = len(stories) - 1
+            else:
+                # Recent stories keep getting new articles
+                story = rng.randrange(max(0, len(stories) - 300), len(stories))
+            keys = stories[story]
+            title = rng.sample(keys, 4) + rng.choices(background, cum_weights=cum_weights, k=4)
+            description = rng.sample(keys, 6) + rng.choices(background, cum_weights=cum_weights, k=20)
+            rng.shuffle(title)
+            rng.shuffle(description)
+            window.append(json.dumps({
+                'source': {'id': None, 'name': rng.choice(SOURCES)},
+                'author': None,
+                'title': ' '.join(title),
+                'description': ' '.join(description),
+                'url': f'https://example.com/{i}',
+                'urlToImage': None,
+                'publishedAt': f'2024-01-01T{i % 24:02d}:00:00Z',
+                'content': None
+            }))
+            labels.append(story)
+        yield window, labels
+
+
+def main(count: int = 20_000, number: int = 50) -> None:
+    """Cluster the articles, score the result and time cluster queries."""
+    clusterer = StoryClusterer()
+    labels = {}
+    elapsed = 0.0
+    for window, window_labels in synthetic_articles(count):
+        started = time.perf_counter()
+        clusterer.add(window)
+        elapsed += time.perf_counter() - started
+        for body, label in zip(window, window_labels):
+            labels[json.loads(body)['url']] = label
+
+    stats = clusterer.stats()
+    stories = len(set(labels.values()))
+    print(f"clustered {stats['articles']:,} articles in {elapsed:.1f}s "
+          f"({elapsed / count * 1e6:.0f} us/article)")
+    print(f"{stats['stories']:,} clusters for {stories:,} true stories, "
+          f"{stats['centroid_entries']:,} centroid entries")
+
+    # Purity: share of articles in their cluster's majority story;
+    # completeness: share in their story's majority cluster
+    by_cluster, by_story = {}, {}
+    for row, story in clusterer._rows.items():
+        for _, _, url, _ in story.members:
+            pair = (row, labels[url])
+            by_cluster.setdefault(row, Counter())[pair] += 1
+            by_story.setdefault(labels[url], Counter())[pair] += 1
+    purity = sum(max(c.values()) for c in by_cluster.values()) / count
+    completeness = sum(max(c.values()) for c in by_story.values()) / count
+    print(f"purity {purity:.3f}, completeness {completeness:.3f}")
+
+    for limit in (10, 100):
+        seconds = min(timeit.repeat(lambda: clusterer.clusters(limit=limit), number=number, repeat=3)) / number
+        print(f"clusters(limit={limit}): {seconds * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,71 @@
+"""
+Near-duplicate detection benchmark.
+
+Generates synthetic articles (100k by default) in which a share of
+stories is republished by other sources with small edits (a source
+suffix on the title, a dropped or swapped word), then reports the time
+to sign and collapse them and how many copies were found.
+
+Run with:
+    python -m backend.benchmarks.dedup [count]
+"""
+import itertools
+import random
+import sys
+import time
+
+from backend.utils.dedup import article_signature, collapse
+
+SOURCES = ['Reuters', 'AP', 'AFP', 'BBC', 'CNN']
+
+
+def synthetic_articles(count: int, copy_rate: float = 0.3, seed: int = 0):
+    """
+    Build (title, description, content, story) tuples.
+
+    Roughly ``copy_rate`` of the articles are edited copies of an
+    earlier story; ``story`` identifies the original for scoring.
+    """
+    rng = random.Random(seed)
+    words = [f'w{i}' for i in range(20000)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 10) for rank in range(len(words))))
+    stories = []
+    articles = []
+    for _ in range(count):
+        if stories and rng.random() < copy_rate:
+            story = rng.randrange(max(0, len(stories) - 500), len(stories))
+            title, description = stories[story]
+            description = list(description)
+            for _ in range(rng.randint(0, 2)):
+                description[rng.randrange(len(description))] = rng.choice(words)
+            articles.append((f'{title} - {rng.choice(SOURCES)}', ' '.join(description), None, story))
+        else:
+            title = ' '.join(rng.choices(words, cum_weights=cum_weights, k=8))
+            description = rng.choices(words, cum_weights=cum_weights, k=30)
+            stories.append((title, description))
+            articles.append((title, ' '.join(description), None, len(stories) - 1))
+    return articles, len(stories)
+
+
+def main(count: int = 100_000, threshold: float = 0.7) -> None:
+    """Sign and collapse the articles, then score the groups."""
+    articles, stories = synthetic_articles(count)
+
+    started = time.perf_counter()
+    signatures = [article_signature(title, description, content) for title, description, content, _ in articles]
+    signed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    groups = collapse(zip(signatures, articles), threshold)
+    collapsed = time.perf_counter() - started
+
+    wrong = sum(copy[3] != kept[3] for kept, copies in groups for copy in copies)
+    print(f"{count:,} articles, {stories:,} distinct stories")
+    print(f"signatures: {signed:.2f}s ({signed / count * 1e6:.1f} us/article)")
+    print(f"collapse:   {collapsed:.2f}s ({collapsed / count * 1e6:.1f} us/article)")
+    print(f"{len(groups):,} groups, {count - len(groups):,} copies merged, "
+          f"{wrong:,} merged into the wrong story")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,69 @@
+"""
+JSON encoding throughput benchmark.
+
+Encodes a 100-article NewsResponse the ways the API can: FastAPI's
+classic path (jsonable_encoder + json.dumps), Pydantic's own
+model_dump_json, and FastJSONResponse with orjson (and its stdlib
+fallback) on a plain model_dump whose datetimes and URLs are encoded
+natively.
+
+Run with:
+    python -m backend.benchmarks.json_encoding
+"""
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.benchmarks.cache_hit import make_upstream_page
+from backend.services.news_api import NewsAPIService
+from backend.utils import responses
+from backend.utils.responses import FastJSONResponse
+
+
+def main(count: int = 100, number: int = 500) -> None:
+    """Time each encoder and print payloads and megabytes per second."""
+    service = NewsAPIService()
+    # The synthetic articles are near-duplicates; keep all of them
+    service.dedup_threshold = None
+    model = service._transform_response(make_upstream_page(count), 1, count)
+    orjson = responses.orjson
+
+    def classic() -> bytes:
+        content = jsonable_encoder(model, by_alias=True)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode()
+
+    def pydantic_json() -> bytes:
+        return model.model_dump_json(by_alias=True).encode()
+
+    def fast_response() -> bytes:
+        return FastJSONResponse(model.model_dump(by_alias=True)).body
+
+    def stdlib_fallback() -> bytes:
+        responses.orjson = None
+        try:
+            return responses.dumps(model.model_dump(by_alias=True))
+        finally:
+            responses.orjson = orjson
+
+    expected = json.loads(pydantic_json())
+    encoders = [
+        ('jsonable_encoder + json', classic),
+        ('model_dump_json', pydantic_json),
+        ('FastJSONResponse (stdlib)', stdlib_fallback),
+    ]
+    if orjson is not None:
+        encoders.append(('FastJSONResponse (orjson)', fast_response))
+
+    for name, fn in encoders:
+        body = fn()
+        assert json.loads(body) == expected, name
+        seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(
+            f"{name:>26}: {seconds * 1e6:8.1f} us/payload "
+            f"{1 / seconds:8.0f} payloads/s {len(body) / seconds / 1e6:7.1f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
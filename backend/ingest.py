@@ -0,0 +1,256 @@
+"""
+Background ingestion of headlines and searches into local storage.
+
+Cycles through configured headline targets and search queries, pulls the
+newest articles for each from NewsAPI, drops URLs it has already ingested
+unchanged, and writes the rest to the article listeners (local store and
+index) in batches, so user reads can be served from local data.
+
+Runs inside the app lifespan when INGEST_ENABLED is set, or on its own:
+    python -m backend.ingest [--once]
+
+A separate process shares articles with the app only through a file
+backed store, so standalone runs refuse to start unless ARTICLE_STORE_PATH
+is a file.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import argparse
+import asyncio
+import hashlib
+import json
+import statistics
+import time
+
+from backend.services.news_api import (
+    CircuitOpenError,
+    NewsAPIError,
+    NewsAPIService,
+    QuotaExhaustedError,
+    get_news_service
+)
+from backend.services.warmer import parse_targets
+from backend.utils.config import get_settings
+from backend.utils.normalize import normalize_headline_params, normalize_search_params
+
+# ('headlines' | 'search', canonical parameters)
+Source = Tuple[str, Dict[str, Any]]
+
+
+def parse_sources(
+    targets: Iterable[str],
+    queries: Iterable[str],
+    language: Optional[str] = None
+) -> List[Source]:
+    """
+    Build ingestion sources from settings.
+
+    Args:
+        targets: Headline target specs, as for the cache warmer
+            ('us', 'us:technology', '*')
+        queries: Search queries to follow
+        language: Language for the search queries
+
+    Returns:
+        Unique sources: headline targets first, then searches
+    """
+    sources: List[Source] = [
+        ('headlines', normalize_headline_params(country, category))
+        for country, category in parse_targets(targets)
+    ]
+    for query in queries:
+        source = ('search', normalize_search_params(query, language))
+        if source not in sources:
+            sources.append(source)
+    return sources
+
+
+class IngestWorker:
+    """
+    Periodically pull the newest articles for every source.
+
+    Calls run at background priority, so ingestion stops for the cycle as
+    soon as the remaining quota is reserved for user-facing requests.
+    Articles are deduplicated by URL across sources and cycles; an
+    article is only written again when its content changed.
+    """
+
+    def __init__(
+        self,
+        service: NewsAPIService,
+        sources: List[Source],
+        interval: float = 300,
+        batch_size: int = 500,
+        max_seen: int = 100000
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            service: NewsAPI service to fetch through and publish to
+            sources: Headline targets and searches to ingest
+            interval: Seconds from the start of one cycle to the next
+            batch_size: Articles per write to the article listeners
+            max_seen: URLs remembered for deduplication
+        """
+        self.service = service
+        self.sources = sources
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_seen = max_seen
+        # url -> digest of the last ingested version
+        self._seen: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: Dict[Optional[str], List[str]] = {}
+        self.cycles = 0
+        self.ingested = 0
+        self.failures = 0
+        self.last_cycle: Dict[str, Any] = {}
+
+    def _is_new(self, url: str, body: str) -> bool:
+        """Record an article, returning False if it was seen unchanged."""
+        digest = hashlib.blake2b(body.encode(), digest_size=8).digest()
+        if self._seen.get(url) == digest:
+            self._seen.move_to_end(url)
+            return False
+        self._seen[url] = digest
+        self._seen.move_to_end(url)
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return True
+
+    def _add(self, articles: List[str], language: Optional[str]) -> None:
+        """Buffer articles, writing a batch once it is full."""
+        pending = self._pending.setdefault(language, [])
+        pending.extend(articles)
+        if len(pending) >= self.batch_size:
+            self._flush(language)
+
+    def _flush(self, language: Optional[str]) -> None:
+        """Write the buffered articles of one language."""
+        batch = self._pending.pop(language, [])
+        if batch:
+            self.service.publish_articles(batch, {'language': language})
+
+    async def run_once(self) -> Dict[str, Any]:
+        """
+        Run one ingestion cycle.
+
+        Returns:
+            Cycle statistics: sources visited, articles fetched, new
+            articles written, duplicates skipped, duration, throughput
+            (new articles per second) and lag (seconds from publication
+            to ingestion, median and maximum over new articles)
+        """
+        started = time.time()
+        visited = fetched = duplicates = 0
+        lags: List[float] = []
+
+        for endpoint, params in self.sources:
+            try:
+                articles = await self.service.fetch_latest(endpoint, params)
+            except (QuotaExhaustedError, CircuitOpenError):
+                # No budget or NewsAPI is down: try again next cycle
+                self.failures += 1
+                break
+            except NewsAPIError:
+                self.failures += 1
+                continue
+
+            visited += 1
+            fetched += len(articles)
+            fresh = []
+            for body in articles:
+                article = json.loads(body)
+                if not self._is_new(article['url'], body):
+                    duplicates += 1
+                    continue
+                fresh.append(body)
+                published = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00'))
+                lags.append(max(0.0, started - published.timestamp()))
+            self._add(fresh, params.get('language'))
+
+        for language in list(self._pending):
+            self._flush(language)
+        # Writes run in the service's worker thread: finish them within the cycle
+        await self.service.flush_articles()
+
+        seconds = time.time() - started
+        self.cycles += 1
+        self.ingested += len(lags)
+        self.last_cycle = {
+            'sources': visited,
+            'fetched': fetched,
+            'new': len(lags),
+            'duplicates': duplicates,
+            'seconds': round(seconds, 3),
+            'articles_per_second': round(len(lags) / seconds, 1) if seconds > 0 else None,
+            'median_lag_seconds': round(statistics.median(lags)) if lags else None,
+            'max_lag_seconds': round(max(lags)) if lags else None
+        }
+        return self.last_cycle
+
+    async def run(self) -> None:
+        """Ingest every interval seconds until cancelled."""
+        while True:
+            started = time.monotonic()
+            await self.run_once()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics."""
+        return {
+            'sources': len(self.sources),
+            'cycles': self.cycles,
+            'ingested': self.ingested,
+            'failures': self.failures,
+            'last_cycle': self.last_cycle
+        }
+
+
+def create_worker(service: NewsAPIService) -> IngestWorker:
+    """Build an ingestion worker from settings."""
+    settings = get_settings()
+    return IngestWorker(
+        service,
+        parse_sources(settings.ingest_targets, settings.ingest_queries, settings.ingest_language),
+        interval=settings.ingest_interval,
+        batch_size=settings.ingest_batch_size
+    )
+
+
+async def _main(once: bool) -> None:
+    """
+    Run the worker standalone, printing each cycle's statistics.
+
+    Raises:
+        SystemExit: If articles would only go to a store private to this
+            process (spending quota for nothing)
+    """
+    settings = get_settings()
+    if not settings.article_store_enabled or settings.article_store_path == ":memory:":
+        raise SystemExit(
+            "backend.ingest: standalone ingestion needs a file-backed article store; "
+            "set ARTICLE_STORE_ENABLED=true and ARTICLE_STORE_PATH to the file the app uses"
+        )
+
+    service = get_news_service()
+    worker = create_worker(service)
+    try:
+        while True:
+            started = time.monotonic()
+            print(json.dumps(await worker.run_once()), flush=True)
+            if once:
+                break
+            await asyncio.sleep(max(0.0, worker.interval - (time.monotonic() - started)))
+    finally:
+        await service.aclose()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Ingest NewsAPI articles into the local store.")
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    try:
+        asyncio.run(_main(parser.parse_args().once))
+    except KeyboardInterrupt:
+        pass
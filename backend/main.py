@@ -2,23 +2,66 @@
 News Aggregator API - Main Application
 FastAPI backend for the News Aggregator web application.
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timezone
 
-from backend.routers import headlines, search, filters
+from backend.ingest import create_worker
+from backend.routers import headlines, search, filters, clusters
+from backend.services.news_api import NewsAPIService, get_news_service
+from backend.services.warmer import CacheWarmer, parse_targets
 from backend.utils.config import get_settings
+from backend.utils.responses import FastJSONResponse
 
 # Get application settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan.
+
+    Creates the shared NewsAPI service on startup so its cache and
+    connection pool are reused by every request, starts periodic cache
+    compaction, headline warming (when targets are configured) and
+    article ingestion (when enabled), and closes everything on shutdown.
+    """
+    service = get_news_service()
+    tasks = [asyncio.create_task(
+        service.cache.compact_periodically(settings.cache_compact_interval)
+    )]
+    if settings.warmer_targets:
+        warmer = CacheWarmer(
+            service,
+            parse_targets(settings.warmer_targets),
+            interval=settings.warmer_interval,
+            max_per_cycle=settings.warmer_max_per_cycle
+        )
+        tasks.append(asyncio.create_task(warmer.run()))
+    app.state.ingest = None
+    if settings.ingest_enabled:
+        app.state.ingest = create_worker(service)
+        tasks.append(asyncio.create_task(app.state.ingest.run()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await service.aclose()
+    get_news_service.cache_clear()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="A modern news aggregator API powered by NewsAPI.org",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,6 +77,7 @@ app.add_middleware(
 app.include_router(headlines.router)
 app.include_router(search.router)
 app.include_router(filters.router)
+app.include_router(clusters.router)
 
 
 @app.get("/")
@@ -47,18 +91,23 @@ async def root():
         "endpoints": {
             "headlines": "/api/headlines",
             "search": "/api/search",
-            "filters": "/api/filters"
+            "filters": "/api/filters",
+            "clusters": "/api/clusters"
         }
     }
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request, service: NewsAPIService = Depends(get_news_service)):
     """Health check endpoint."""
+    ingest = getattr(request.app.state, "ingest", None)
     return {
         "status": "ok",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "version": settings.app_version
+        "version": settings.app_version,
+        "quota": service.get_quota_status(),
+        "upstream": service.get_upstream_status(),
+        "ingest": ingest.stats() if ingest is not None else None
     }
 
 
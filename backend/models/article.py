@@ -24,6 +24,8 @@ class Article(BaseModel):
     url_to_image: Optional[HttpUrl] = Field(None, alias="urlToImage")
     published_at: datetime = Field(alias="publishedAt")
     content: Optional[str] = None
+    # Near-duplicate copies of this story collapsed into it
+    duplicates: int = 0
 
 
 class NewsResponse(BaseModel):
@@ -0,0 +1,30 @@
+"""
+Data models for story clusters.
+"""
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+
+from backend.models.article import Article
+
+
+class StoryCluster(BaseModel):
+    """A group of articles about the same story."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: int
+    # Articles in the story, counting collapsed near-duplicates
+    size: int
+    # Source names, most frequent first
+    sources: list[str]
+    latest_published_at: datetime = Field(alias="latestPublishedAt")
+    # Member closest to the story centroid
+    article: Article
+
+
+class ClustersResponse(BaseModel):
+    """Response model for the clusters endpoint."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    status: str = "ok"
+    total_clusters: int = Field(alias="totalClusters")
+    clusters: list[StoryCluster]
@@ -0,0 +1,58 @@
+"""
+Clusters router - Groups recent articles into stories.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from backend.services.news_api import NewsAPIService, get_news_service
+from backend.models.cluster import ClustersResponse
+
+router = APIRouter(prefix="/api/clusters", tags=["clusters"])
+
+
+@router.get("", response_model=ClustersResponse)
+async def get_clusters(
+    limit: int = Query(
+        20,
+        ge=1,
+        le=100,
+        description="Number of stories to return (max 100)"
+    ),
+    min_size: int = Query(
+        2,
+        ge=1,
+        description="Only stories with at least this many articles"
+    ),
+    language: Optional[str] = Query(
+        None,
+        description="2-letter ISO language code of searches the story came from",
+        max_length=2,
+        pattern="^[a-z]{2}$"
+    ),
+    service: NewsAPIService = Depends(get_news_service)
+):
+    """
+    Get the largest current stories.
+
+    Articles fetched through headlines and searches (and by the ingestion
+    worker) are grouped into stories as they arrive, so this endpoint
+    only ranks existing clusters and never calls NewsAPI.
+
+    - **limit**: Number of stories to return (1-100)
+    - **min_size**: Minimum number of articles in a story
+    - **language**: Only stories started by articles fetched for this language
+
+    Each story has its size, its sources and a representative article.
+    """
+    if service.story_clusters is None:
+        raise HTTPException(status_code=503, detail={
+            "error": "CLUSTERING_DISABLED",
+            "message": "Story clustering is disabled (CLUSTERS_ENABLED=false)"
+        })
+
+    total, clusters = service.story_clusters.clusters(
+        limit=limit,
+        min_size=min_size,
+        language=language
+    )
+    return ClustersResponse(total_clusters=total, clusters=clusters)
@@ -1,9 +1,11 @@
 """
 Filters router - Provides available filter options.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from backend.models.filters import FiltersResponse, Language, Country, SortOption
+from backend.utils.config import get_settings
+from backend.utils.responses import conditional_response, dumps, make_etag
 
 router = APIRouter(prefix="/api/filters", tags=["filters"])
 
@@ -99,8 +101,18 @@ SORT_OPTIONS = [
 ]
 
 
+# The filter data never changes at runtime: encode it once at import
+FILTERS_BODY = dumps(FiltersResponse(
+    categories=CATEGORIES,
+    languages=LANGUAGES,
+    countries=COUNTRIES,
+    sort_options=SORT_OPTIONS
+))
+FILTERS_ETAG = make_etag(FILTERS_BODY)
+
+
 @router.get("", response_model=FiltersResponse)
-async def get_filters():
+async def get_filters(request: Request) -> Response:
     """
     Get available filter options.
 
@@ -111,10 +123,13 @@ async def get_filters():
     - **sort_options**: Available sorting options
 
     Use these options to populate filter dropdowns in the frontend.
+    The payload is served with a strong ETag; send it back in
+    If-None-Match to get 304 Not Modified.
     """
-    return FiltersResponse(
-        categories=CATEGORIES,
-        languages=LANGUAGES,
-        countries=COUNTRIES,
-        sort_options=SORT_OPTIONS
+    max_age = get_settings().filters_cache_max_age
+    return conditional_response(
+        request,
+        FILTERS_BODY,
+        FILTERS_ETAG,
+        headers={'Cache-Control': f'public, max-age={max_age}'}
     )
@@ -1,17 +1,25 @@
 """
 Headlines router - Handles top headlines requests.
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 
-from backend.services.news_api import NewsAPIService, NewsAPIError
+from backend.services.news_api import (
+    NewsAPIService,
+    NewsAPIError,
+    CircuitOpenError,
+    QuotaExhaustedError,
+    get_news_service
+)
 from backend.models.article import NewsResponse
+from backend.utils.responses import conditional_response
 
 router = APIRouter(prefix="/api/headlines", tags=["headlines"])
 
 
 @router.get("", response_model=NewsResponse)
 async def get_headlines(
+    request: Request,
     country: Optional[str] = Query(
         None,
         description="2-letter ISO country code (e.g., us, gb, ca)",
@@ -33,7 +41,8 @@ async def get_headlines(
         ge=1,
         le=100,
         description="Number of articles per page (max 100)"
-    )
+    ),
+    service: NewsAPIService = Depends(get_news_service)
 ):
     """
     Get top headlines.
@@ -46,17 +55,36 @@ async def get_headlines(
     - **page_size**: Number of articles per page (1-100)
 
     Returns a paginated list of news articles.
+
+    Responses carry an ETag plus Cache-Control/Age from the cached data;
+    send the ETag back in If-None-Match to get 304 Not Modified.
     """
     try:
-        service = NewsAPIService()
-        response = await service.get_top_headlines(
+        result = await service.get_top_headlines_result(
             country=country,
             category=category,
             page=page,
             page_size=page_size
         )
-        return response
+        # Pre-encoded body: skips response_model validation and serialization.
+        # A client sending a matching If-None-Match gets 304 and no body.
+        return conditional_response(
+            request,
+            lambda: result.body,
+            result.etag,
+            headers=result.cache_headers()
+        )
 
+    except QuotaExhaustedError as e:
+        raise HTTPException(status_code=503, detail={
+            "error": "QUOTA_EXHAUSTED",
+            "message": str(e)
+        })
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail={
+            "error": "UPSTREAM_UNAVAILABLE",
+            "message": str(e)
+        })
     except NewsAPIError as e:
         raise HTTPException(status_code=500, detail={
             "error": "API_ERROR",
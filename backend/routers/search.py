@@ -1,17 +1,25 @@
 """
 Search router - Handles news search requests.
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 
-from backend.services.news_api import NewsAPIService, NewsAPIError
+from backend.services.news_api import (
+    NewsAPIService,
+    NewsAPIError,
+    CircuitOpenError,
+    QuotaExhaustedError,
+    get_news_service
+)
 from backend.models.article import NewsResponse
+from backend.utils.responses import conditional_response
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
 
 @router.get("", response_model=NewsResponse)
 async def search_news(
+    request: Request,
     q: str = Query(
         ...,
         description="Search query (keyword or phrase)",
@@ -51,7 +59,8 @@ async def search_news(
         ge=1,
         le=100,
         description="Number of articles per page (max 100)"
-    )
+    ),
+    service: NewsAPIService = Depends(get_news_service)
 ):
     """
     Search news articles by keyword.
@@ -67,10 +76,12 @@ async def search_news(
     - **page_size**: Number of articles per page (1-100)
 
     Returns a paginated list of matching articles.
+
+    Responses carry an ETag plus Cache-Control/Age from the cached data;
+    send the ETag back in If-None-Match to get 304 Not Modified.
     """
     try:
-        service = NewsAPIService()
-        response = await service.search_news(
+        result = await service.search_news_result(
             query=q,
             language=language,
             from_date=from_date,
@@ -79,8 +90,25 @@ async def search_news(
             page=page,
             page_size=page_size
         )
-        return response
+        # Pre-encoded body: skips response_model validation and serialization.
+        # A client sending a matching If-None-Match gets 304 and no body.
+        return conditional_response(
+            request,
+            lambda: result.body,
+            result.etag,
+            headers=result.cache_headers()
+        )
 
+    except QuotaExhaustedError as e:
+        raise HTTPException(status_code=503, detail={
+            "error": "QUOTA_EXHAUSTED",
+            "message": str(e)
+        })
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail={
+            "error": "UPSTREAM_UNAVAILABLE",
+            "message": str(e)
+        })
     except NewsAPIError as e:
         if "empty" in str(e).lower():
             raise HTTPException(status_code=400, detail={
@@ -0,0 +1,385 @@
+"""
+In-memory inverted index over recently fetched articles.
+
+Keeps the last few days of articles NewsAPIService has seen in compact
+posting lists (``array`` of document ids, one per folded word), so
+searches over recent news are answered without touching NewsAPI or
+SQLite. Boolean queries are evaluated on bitmaps (Python ints, bit i for
+document id i), so AND/OR/NOT over large posting lists run in C.
+"""
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import json
+import re
+import threading
+import time
+
+from backend.utils.query import QueryNode, parse_query, tokenize
+
+_NONZERO = re.compile(rb'[^\x00]')
+
+
+def _contains(postings: Sequence[int], doc_id: int) -> bool:
+    """Binary search a sorted posting list."""
+    i = bisect_left(postings, doc_id)
+    return i < len(postings) and postings[i] == doc_id
+
+
+class ArticleIndex:
+    """
+    Inverted index with time-based expiry.
+
+    Document ids are assigned in order of first fetch, so every posting
+    list is sorted, results come out most recently fetched first without
+    a sort over the matches, and expired documents always form a prefix
+    that is cut off in one slice. Within a fetched window ids follow
+    NewsAPI's own order. Re-fetching an unchanged article is a no-op; a
+    changed one gets a new id and the old one is skipped until it
+    expires. A lock serializes writers (the service's listener thread)
+    with searches.
+    """
+
+    # Articles added between expiry sweeps
+    EXPIRE_EVERY = 10000
+    # Terms with at least this many postings keep their bitmap cached
+    BITMAP_MIN_POSTINGS = 1024
+    # Cached term and phrase bitmaps (least recently used are dropped)
+    BITMAP_CACHE_SIZE = 256
+
+    def __init__(self, window: float = 72 * 3600):
+        """
+        Initialize the index.
+
+        Args:
+            window: Seconds an article stays searchable after it was fetched
+        """
+        self.window = window
+        self._postings: Dict[str, array] = {}
+        # doc id -> (encoded article, url, publishedAt, language, folded text)
+        self._docs: Dict[int, Tuple[str, str, str, Optional[str], str]] = {}
+        self._urls: Dict[str, int] = {}
+        self._superseded: Set[int] = set()
+        # term -> (postings covered, bitmap), relative to _base
+        self._bitmaps: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        # phrase -> (first id not yet verified, bitmap of verified matches)
+        self._phrases: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        # Fetch time of every id from _base on, for expiry
+        self._added = array('d')
+        self._base = 0
+        self._next_id = 0
+        self._since_expire = 0
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        articles: List[str],
+        params: Optional[Dict[str, Any]] = None,
+        now: Optional[float] = None
+    ) -> int:
+        """
+        Index encoded articles.
+
+        Args:
+            articles: Articles as JSON text (by alias), as cached by the
+                service, in NewsAPI's order
+            params: Request parameters they were fetched with; 'language'
+                is recorded when present
+            now: Fetch time (default: the current monotonic time)
+
+        Returns:
+            Number of new or changed articles indexed
+        """
+        now = time.monotonic() if now is None else now
+        language = (params or {}).get('language')
+        parsed = [(body, json.loads(body)) for body in reversed(articles)]
+        with self._lock:
+            return self._add(parsed, language, now)
+
+    def _add(self, articles: List[Tuple[str, Dict[str, Any]]], language: Optional[str], now: float) -> int:
+        """Index decoded articles, last first (lock held)."""
+        postings = self._postings
+        added = 0
+        # Last in gets the highest id, which is returned first
+        for body, article in articles:
+            url = article['url']
+            previous = self._urls.get(url)
+            if previous is not None:
+                if self._docs[previous][0] == body:
+                    continue
+                del self._docs[previous]
+                self._superseded.add(previous)
+            added += 1
+
+            words = tokenize(self._text(article))
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = (body, url, article['publishedAt'], language, ' ' + ' '.join(words) + ' ')
+            self._urls[url] = doc_id
+            self._added.append(now)
+
+            for word in set(words):
+                if word in postings:
+                    postings[word].append(doc_id)
+                else:
+                    postings[word] = array('I', (doc_id,))
+
+        self._since_expire += added
+        if self._since_expire >= self.EXPIRE_EVERY:
+            self._expire(now)
+        return added
+
+    @staticmethod
+    def _text(article: Dict[str, Any]) -> str:
+        """Searchable text of an article: title, description, content, source."""
+        return ' '.join(filter(None, (
+            article.get('title'),
+            article.get('description'),
+            article.get('content'),
+            (article.get('source') or {}).get('name')
+        )))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop articles fetched more than ``window`` seconds ago.
+
+        Args:
+            now: Current time on the clock passed to add()
+
+        Returns:
+            Number of document ids removed
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._expire(now)
+
+    def _expire(self, now: float) -> int:
+        """Drop expired articles (lock held)."""
+        self._since_expire = 0
+        count = bisect_left(self._added, now - self.window)
+        if not count:
+            return 0
+
+        floor = self._base + count
+        for doc_id in range(self._base, floor):
+            doc = self._docs.pop(doc_id, None)
+            if doc is not None:
+                del self._urls[doc[1]]
+        self._superseded = {doc_id for doc_id in self._superseded if doc_id >= floor}
+        del self._added[:count]
+        self._base = floor
+        self._bitmaps.clear()
+        self._phrases.clear()
+
+        for word in list(self._postings):
+            postings = self._postings[word]
+            cut = bisect_left(postings, floor)
+            if cut == len(postings):
+                del self._postings[word]
+            elif cut:
+                del postings[:cut]
+        return count
+
+    def _bits(self, ids: Sequence[int]) -> int:
+        """Bitmap of sorted document ids."""
+        if not len(ids):
+            return 0
+        start = (ids[0] - self._base) & ~7
+        bits = bytearray(((ids[-1] - self._base - start) >> 3) + 1)
+        for doc_id in ids:
+            offset = doc_id - self._base - start
+            bits[offset >> 3] |= 1 << (offset & 7)
+        return int.from_bytes(bits, 'little') << start
+
+    def _ids(self, bits: int) -> Iterator[int]:
+        """Document ids of a bitmap, highest first."""
+        # Most significant byte first; the regex skips empty bytes in C
+        data = bits.to_bytes((bits.bit_length() + 7) >> 3, 'little')[::-1]
+        top = len(data) - 1
+        for match in _NONZERO.finditer(data):
+            byte = match.group()[0]
+            offset = self._base + ((top - match.start()) << 3)
+            for bit in range(7, -1, -1):
+                if byte >> bit & 1:
+                    yield offset + bit
+
+    def _term_bits(self, word: str) -> int:
+        """Bitmap of a word's postings, cached for frequent words."""
+        postings = self._postings.get(word)
+        if postings is None:
+            return 0
+        if len(postings) < self.BITMAP_MIN_POSTINGS:
+            return self._bits(postings)
+
+        covered, bits = self._bitmaps.pop(word, (0, 0))
+        if covered < len(postings):
+            # Postings only grow at the end between expiry sweeps
+            bits |= self._bits(postings[covered:])
+        self._bitmaps[word] = (len(postings), bits)
+        if len(self._bitmaps) > self.BITMAP_CACHE_SIZE:
+            self._bitmaps.popitem(last=False)
+        return bits
+
+    def _evaluate(self, node: QueryNode) -> int:
+        """Bitmap of ids matching a parsed query (may include superseded ids)."""
+        kind = node[0]
+        if kind == 'phrase':
+            return self._phrase(node[1])
+        if kind == 'and':
+            bits = -1
+            for child in node[1]:
+                bits &= self._evaluate(child)
+                if not bits:
+                    break
+            return bits
+        if kind == 'or':
+            bits = 0
+            for child in node[1]:
+                bits |= self._evaluate(child)
+            return bits
+        # 'not'
+        bits = self._evaluate(node[1])
+        return bits & ~self._evaluate(node[2]) if bits else 0
+
+    def _phrase(self, words: Tuple[str, ...]) -> int:
+        """Bitmap of ids containing all words, and for phrases, in sequence."""
+        bits = -1
+        for word in set(words):
+            bits &= self._term_bits(word)
+            if not bits:
+                return 0
+        if len(words) == 1:
+            return bits
+
+        # Only candidates added since the phrase was last verified are checked
+        phrase = ' ' + ' '.join(words) + ' '
+        covered, verified = self._phrases.pop(phrase, (self._base, 0))
+        shift = covered - self._base
+        docs = self._docs
+        verified |= self._bits([
+            doc_id for doc_id in reversed(list(self._ids(bits >> shift << shift)))
+            if doc_id in docs and phrase in docs[doc_id][4]
+        ])
+        self._phrases[phrase] = (self._next_id, verified)
+        if len(self._phrases) > self.BITMAP_CACHE_SIZE:
+            self._phrases.popitem(last=False)
+        return verified
+
+    def search(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        now: Optional[float] = None
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Search indexed articles, most recently fetched first.
+
+        Without filters only the requested page is materialized; language
+        and date filters check every match. Articles past the window are
+        skipped even before a sweep has dropped them.
+
+        Args:
+            query: NewsAPI-style query (terms, "phrases", +/-, AND/OR/NOT)
+            language: Only articles fetched for this language
+            from_date: Earliest publication date (YYYY-MM-DD, inclusive)
+            to_date: Latest publication date (YYYY-MM-DD, inclusive)
+            limit: Maximum number of articles returned
+            offset: Number of matches to skip
+            now: Current time on the clock passed to add()
+
+        Returns:
+            Tuple of the total number of matches and the requested slice
+            of encoded articles, or None if the query cannot be evaluated
+            locally
+        """
+        node = parse_query(query)
+        if node is None:
+            return None
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._search(node, language, from_date, to_date, limit, offset, now)
+
+    def _search(
+        self,
+        node: QueryNode,
+        language: Optional[str],
+        from_date: Optional[str],
+        to_date: Optional[str],
+        limit: int,
+        offset: int,
+        now: float
+    ) -> Tuple[int, List[str]]:
+        """Evaluate a parsed query (lock held)."""
+        # Ids below floor were fetched too long ago but not yet swept
+        floor = self._base + bisect_left(self._added, now - self.window)
+        if node[0] == 'phrase' and len(node[1]) == 1:
+            # Single word: walk its posting list directly
+            postings = self._postings.get(node[1][0], array('I'))
+            cut = bisect_left(postings, floor)
+            candidates: Iterator[int] = (postings[i] for i in range(len(postings) - 1, cut - 1, -1))
+            count = len(postings) - cut
+
+            def matched(doc_id: int) -> bool:
+                return _contains(postings, doc_id)
+        else:
+            bits = self._evaluate(node)
+            shift = floor - self._base
+            bits = bits >> shift << shift
+            candidates = self._ids(bits)
+            count = bits.bit_count()
+
+            def matched(doc_id: int) -> bool:
+                return bool(bits >> (doc_id - self._base) & 1)
+
+        docs = self._docs
+        if language or from_date or to_date:
+            matches = [
+                doc for doc in (docs.get(doc_id) for doc_id in candidates)
+                if doc is not None
+                and (not language or doc[3] == language)
+                and (not from_date or doc[2][:10] >= from_date[:10])
+                and (not to_date or doc[2][:10] <= to_date[:10])
+            ]
+            return len(matches), [doc[0] for doc in matches[offset:offset + limit]]
+
+        total = count - sum(1 for doc_id in self._superseded if doc_id >= floor and matched(doc_id))
+        page: List[str] = []
+        skip = offset
+        for doc_id in candidates:
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            if len(page) == limit:
+                break
+            page.append(doc[0])
+        return total, page
+
+    def size(self) -> int:
+        """Get the number of searchable articles."""
+        return len(self._docs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with article, term and posting counts, and the
+            bytes held by posting arrays
+        """
+        with self._lock:
+            postings = sum(len(p) for p in self._postings.values())
+            terms = len(self._postings)
+        return {
+            'articles': len(self._docs),
+            'terms': terms,
+            'postings': postings,
+            'posting_bytes': postings * array('I').itemsize
+        }
@@ -0,0 +1,322 @@
+"""
+Local article store with full-text search.
+
+Every article NewsAPIService fetches is written to SQLite and indexed
+with FTS5 (title, description, content, source), so searches over
+articles we already have can be answered without calling NewsAPI.
+Near-duplicate copies of a stored story are merged into it.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+import time
+
+from backend.utils.dedup import MinHashLSH, article_signature, pack, unpack
+from backend.utils.query import to_fts_query
+
+# Column weights for BM25: title matches count most, content least
+_BM25 = "bm25(articles_fts, 10.0, 4.0, 1.0, 2.0)"
+
+
+class ArticleStore:
+    """
+    SQLite table of articles with an FTS5 index over their text.
+
+    Articles are stored as their encoded JSON (by alias), keyed by URL, so
+    search results can be served as pre-encoded fragments. Articles not
+    seen again within ``retention`` seconds are pruned.
+
+    An article whose MinHash similarity to a stored one reaches
+    ``dedup_threshold`` is recorded as a copy of it instead of being stored. The stored
+    article's ``duplicates`` is its own count (copies merged before it
+    arrived) plus one for each copy, plus that copy's own count. It is
+    recomputed from the latest values, so re-fetching a story never
+    inflates it.
+    """
+
+    # Articles added between retention sweeps
+    PRUNE_EVERY = 1000
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        retention: float = 7 * 86400,
+        dedup_threshold: Optional[float] = 0.7
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database path (':memory:' for a per-process store)
+            retention: Seconds an article is kept after it was last fetched
+            dedup_threshold: Estimated Jaccard similarity at which an article
+                is a copy of a stored story (None disables merging)
+        """
+        self.retention = retention
+        self.dedup_threshold = dedup_threshold
+        self._since_prune = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                body TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                content TEXT,
+                source TEXT,
+                language TEXT,
+                published_at TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                signature BLOB,
+                own_duplicates INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at);
+            CREATE INDEX IF NOT EXISTS articles_fetched ON articles (fetched_at);
+
+            -- Copies of a stored story from other URLs
+            CREATE TABLE IF NOT EXISTS copies (
+                url TEXT PRIMARY KEY,
+                article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+                duplicates INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS copies_article ON copies (article_id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, description, content, source,
+                content='articles', content_rowid='id',
+                tokenize='porter unicode61 remove_diacritics 2'
+            );
+
+            -- Keep the external-content index in step with the table
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, description, content, source)
+                VALUES (new.id, new.title, new.description, new.content, new.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description, content, source)
+                VALUES ('delete', old.id, old.title, old.description, old.content, old.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description, content, source)
+                VALUES ('delete', old.id, old.title, old.description, old.content, old.source);
+                INSERT INTO articles_fts (rowid, title, description, content, source)
+                VALUES (new.id, new.title, new.description, new.content, new.source);
+            END;
+        """)
+        self._signatures: MinHashLSH[int] = MinHashLSH(dedup_threshold or 1.0)
+        self._load_signatures()
+
+    def _load_signatures(self) -> None:
+        """Rebuild the in-memory signature lookup from the table."""
+        self._signatures.clear()
+        if self.dedup_threshold is None:
+            return
+        for article_id, packed in self._conn.execute(
+            "SELECT id, signature FROM articles WHERE signature IS NOT NULL"
+        ):
+            self._signatures.add(unpack(packed), article_id)
+
+    def add(self, articles: List[str], params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Store encoded articles, replacing earlier copies with the same URL.
+
+        Args:
+            articles: Articles as JSON text (by alias), as cached by the service
+            params: Request parameters they were fetched with; 'language'
+                is recorded when present
+
+        Returns:
+            Number of articles written (stored or merged into a story)
+        """
+        language = (params or {}).get('language')
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                touched = {self._add_one(json.loads(body), body, language, now) for body in articles}
+                for article_id in touched:
+                    self._update_duplicates(article_id)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Drop signatures indexed for rows that no longer exist
+                self._load_signatures()
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+            self._since_prune += len(articles)
+            if self._since_prune >= self.PRUNE_EVERY:
+                self._prune(now)
+        return len(articles)
+
+    def _add_one(self, article: Dict[str, Any], body: str, language: Optional[str], now: float) -> int:
+        """Store or merge one article (lock held), returning the story's id."""
+        conn = self._conn
+        url = article['url']
+        own = article.get('duplicates', 0)
+
+        row = conn.execute("SELECT id, signature FROM articles WHERE url = ?", (url,)).fetchone()
+        copy = None if row else conn.execute(
+            "SELECT article_id FROM copies WHERE url = ?", (url,)
+        ).fetchone()
+        if copy is not None:
+            conn.execute("UPDATE copies SET duplicates = ? WHERE url = ?", (own, url))
+            conn.execute("UPDATE articles SET fetched_at = ? WHERE id = ?", (now, copy[0]))
+            return copy[0]
+
+        signature = None
+        if self.dedup_threshold is not None:
+            signature = article_signature(article['title'], article.get('description'), article.get('content'))
+            story = self._signatures.find(signature) if row is None else None
+            if story is not None and conn.execute(
+                "SELECT 1 FROM articles WHERE id = ?", (story,)
+            ).fetchone():
+                conn.execute("INSERT INTO copies (url, article_id, duplicates) VALUES (?, ?, ?)", (url, story, own))
+                conn.execute("UPDATE articles SET fetched_at = ? WHERE id = ?", (now, story))
+                return story
+
+        values = (
+            body,
+            article['title'],
+            article.get('description'),
+            article.get('content'),
+            (article.get('source') or {}).get('name'),
+            language,
+            article['publishedAt'],
+            now,
+            pack(signature) if signature else None,
+            own
+        )
+        if row is not None:
+            conn.execute("""
+                UPDATE articles SET
+                    body = ?, title = ?, description = ?, content = ?, source = ?,
+                    language = COALESCE(?, language), published_at = ?, fetched_at = ?,
+                    signature = ?, own_duplicates = ?
+                WHERE id = ?
+            """, (*values, row[0]))
+            article_id = row[0]
+        else:
+            article_id = conn.execute("""
+                INSERT INTO articles
+                    (body, title, description, content, source, language, published_at, fetched_at,
+                     signature, own_duplicates, url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (*values, url)).lastrowid
+        # Re-fetches usually leave the signature as it was: only index changes
+        previous = unpack(row[1]) if row is not None and row[1] else ()
+        if signature != previous and self.dedup_threshold is not None:
+            self._signatures.remove(previous, article_id)
+            if signature:
+                self._signatures.add(signature, article_id)
+        return article_id
+
+    def _update_duplicates(self, article_id: int) -> None:
+        """Write a story's current duplicate count into its body (lock held)."""
+        body, count = self._conn.execute("""
+            SELECT body, own_duplicates + COALESCE(
+                (SELECT SUM(1 + duplicates) FROM copies WHERE article_id = articles.id), 0)
+            FROM articles WHERE id = ?
+        """, (article_id,)).fetchone()
+        article = json.loads(body)
+        if article.get('duplicates', 0) != count:
+            article['duplicates'] = count
+            self._conn.execute(
+                "UPDATE articles SET body = ? WHERE id = ?",
+                (json.dumps(article, ensure_ascii=False, separators=(',', ':')), article_id)
+            )
+
+    def _prune(self, now: float) -> int:
+        """Delete articles older than the retention (lock must be held)."""
+        self._since_prune = 0
+        cursor = self._conn.execute(
+            "DELETE FROM articles WHERE fetched_at < ?", (now - self.retention,)
+        )
+        if cursor.rowcount:
+            self._load_signatures()
+        return cursor.rowcount
+
+    def prune(self) -> int:
+        """
+        Delete articles not fetched within the retention period.
+
+        Returns:
+            Number of articles removed
+        """
+        with self._lock:
+            return self._prune(time.time())
+
+    def search(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        sort_by: str = 'publishedAt',
+        limit: int = 10,
+        offset: int = 0
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Full-text search over stored articles.
+
+        Args:
+            query: NewsAPI-style query (terms, "phrases", +/-, AND/OR/NOT)
+            language: Only articles fetched for this language
+            from_date: Earliest publication date (YYYY-MM-DD, inclusive)
+            to_date: Latest publication date (YYYY-MM-DD, inclusive)
+            sort_by: 'publishedAt' (newest first); 'relevancy' and
+                'popularity' rank by BM25
+            limit: Maximum number of articles returned
+            offset: Number of ranked matches to skip
+
+        Returns:
+            Tuple of the total number of matches and the requested slice
+            of encoded articles, or None if the query cannot be evaluated
+            locally
+        """
+        expression = to_fts_query(query)
+        if expression is None:
+            return None
+
+        where = ["articles_fts MATCH ?"]
+        args: List[Any] = [expression]
+        if language:
+            where.append("a.language = ?")
+            args.append(language)
+        if from_date:
+            where.append("substr(a.published_at, 1, 10) >= ?")
+            args.append(from_date[:10])
+        if to_date:
+            where.append("substr(a.published_at, 1, 10) <= ?")
+            args.append(to_date[:10])
+
+        source = "articles_fts JOIN articles a ON a.id = articles_fts.rowid WHERE " + " AND ".join(where)
+        order = "a.published_at DESC" if sort_by == 'publishedAt' else f"{_BM25}, a.published_at DESC"
+
+        try:
+            with self._lock:
+                total = self._conn.execute(f"SELECT COUNT(*) FROM {source}", args).fetchone()[0]
+                rows = self._conn.execute(
+                    f"SELECT a.body FROM {source} ORDER BY {order} LIMIT ? OFFSET ?",
+                    [*args, limit, offset]
+                ).fetchall()
+        except sqlite3.OperationalError:
+            # e.g. unbalanced parentheses: let NewsAPI interpret the query
+            return None
+        return total, [row[0] for row in rows]
+
+    def size(self) -> int:
+        """Get the number of stored articles."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,442 @@
+"""
+Incremental story clustering over recently fetched articles.
+
+Groups articles NewsAPIService has seen into stories as they arrive: each
+article becomes a TF-IDF vector over hashed word features, is scored
+against every active story centroid with vectorized NumPy operations, and
+joins the most similar story when the cosine similarity reaches a
+threshold (otherwise it starts a new story). Cluster queries only rank
+the stories already built, so they cost milliseconds whatever the corpus
+size.
+"""
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from backend.utils.query import tokenize
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_hash(word: str) -> int:
+    """Stable hash of a word, reduced to a feature by masking."""
+    return zlib.crc32(word.encode())
+
+
+def _grown(values: np.ndarray, size: int, fill: float = 0) -> np.ndarray:
+    """Copy of an array with room for at least ``size`` entries."""
+    if size <= len(values):
+        return values
+    grown = np.full(max(size, 2 * len(values)), fill, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+@dataclass
+class _Story:
+    """A cluster of articles and its cached representative."""
+    id: int
+    language: Optional[str]
+    # feature -> slot of the centroid entry in the clusterer's entry arrays
+    slots: Dict[int, int] = field(default_factory=dict)
+    # (feature ids, scaled term frequencies, url, encoded article) of every member
+    members: List[Tuple[np.ndarray, np.ndarray, str, str]] = field(default_factory=list)
+    sources: Counter = field(default_factory=Counter)
+    latest: str = ''
+    representative: Optional[str] = None
+
+
+class StoryClusterer:
+    """
+    Single-pass clustering of articles into stories.
+
+    A story centroid is the sum of its members' term-frequency vectors,
+    each scaled to unit TF-IDF length. Centroids are sparse: every nonzero
+    is an entry (story row, feature, value) in flat arrays, and each
+    feature keeps a posting list of its entries, so scoring an article
+    touches only the stories sharing one of its features, in a single
+    ``np.bincount``.
+
+    Document frequencies are kept incrementally and IDF weights are
+    applied at scoring time, so stories formed while the corpus was small
+    are not dominated by words that only later turn out to be common.
+    Centroid norms follow the IDF in one pass over the centroid entries
+    whenever the corpus has grown by REWEIGHT_AFTER. A story expires ``window`` seconds after it
+    last gained or re-fetched an article, and its members stop counting
+    towards IDF. Only the first version of an article is clustered.
+    """
+
+    # Articles added between expiry sweeps
+    EXPIRE_EVERY = 1000
+    # Words in more than this share of articles (and at least MIN_DF_CUTOFF
+    # of them) carry no weight, so their long posting lists are never scanned
+    MAX_DF = 0.05
+    MIN_DF_CUTOFF = 20
+    # Relative change in the article count before centroid norms are refreshed
+    REWEIGHT_AFTER = 0.1
+
+    def __init__(self, window: float = 24 * 3600, threshold: float = 0.3, features: int = 1 << 20):
+        """
+        Initialize the clusterer.
+
+        Args:
+            window: Seconds a story stays active after its last article
+            threshold: Minimum cosine similarity to join a story
+            features: Hashed feature dimensions (a power of two)
+        """
+        self.window = window
+        self.threshold = threshold
+        self._mask = features - 1
+        self._df = np.zeros(features, dtype=np.int32)
+        self._articles = 0
+
+        # Per story row; rows of expired stories are reused
+        self._norms = np.zeros(64)
+        self._sizes = np.zeros(64, dtype=np.int64)
+        self._updated = np.full(64, -np.inf)
+        self._rows: Dict[int, _Story] = {}
+        self._free: List[int] = []
+        self._used = 0
+
+        # Centroid entries, and the entry slots of each feature
+        self._entry_rows = np.zeros(1024, dtype=np.int32)
+        self._entry_features = np.zeros(1024, dtype=np.int32)
+        self._entry_values = np.zeros(1024, dtype=np.float32)
+        self._entries = 0
+        self._postings: Dict[int, array] = {}
+
+        # Article count when centroid norms were last computed
+        self._weighted_at = -1
+
+        self._urls: Dict[str, int] = {}
+        self._next_id = 0
+        self._since_expire = 0
+        # Serializes writers (the service's listener thread) with queries
+        self._lock = threading.Lock()
+
+    def _idf(self, features: np.ndarray) -> np.ndarray:
+        """Current IDF weights of some features (zero for stop words)."""
+        df = self._df[features]
+        idf = np.log((1 + self._articles) / (1 + df)).astype(np.float32) + 1
+        # Stop words: too common to tell stories apart
+        idf[df > max(self.MAX_DF * self._articles, self.MIN_DF_CUTOFF)] = 0
+        return idf
+
+    def _reweight(self) -> None:
+        """
+        Refresh centroid norms once the corpus has changed by more than
+        REWEIGHT_AFTER since they were computed.
+
+        Costs one pass over the centroid entries, which is small while
+        the corpus is small and refreshes are frequent.
+        """
+        articles = self._articles
+        if abs(articles - self._weighted_at) <= self.REWEIGHT_AFTER * self._weighted_at:
+            return
+        self._weighted_at = articles
+
+        n = self._entries
+        values = self._entry_values[:n]
+        idf = self._idf(self._entry_features[:n])
+        squares = np.bincount(self._entry_rows[:n], values * values * idf * idf, minlength=self._used)
+        self._norms[:self._used] = np.sqrt(squares[:self._used])
+
+    def _vector(self, article: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature ids and raw term counts of an article (title counted twice)."""
+        title = tokenize(article.get('title') or '')
+        words = title + title + tokenize(' '.join(filter(None, (
+            article.get('description'),
+            article.get('content')
+        ))))
+        hashes = np.fromiter(map(_word_hash, words), dtype=np.int64, count=len(words))
+        features, counts = np.unique(hashes & self._mask, return_counts=True)
+        return features.astype(np.int32), counts
+
+    def add(
+        self,
+        articles: List[str],
+        params: Optional[Dict[str, Any]] = None,
+        now: Optional[float] = None
+    ) -> int:
+        """
+        Cluster encoded articles.
+
+        Args:
+            articles: Articles as JSON text (by alias), as cached by the service
+            params: Request parameters they were fetched with; 'language'
+                is recorded for new stories when present
+            now: Fetch time (default: the current monotonic time)
+
+        Returns:
+            Number of new articles clustered
+        """
+        now = time.monotonic() if now is None else now
+        language = (params or {}).get('language')
+        added = 0
+        for body in articles:
+            article = json.loads(body)
+            # Locked per article, so cluster queries wait for one at most
+            with self._lock:
+                added += self._add_one(article, body, language, now)
+
+        with self._lock:
+            self._since_expire += added
+            if self._since_expire >= self.EXPIRE_EVERY:
+                self._expire(now)
+        return added
+
+    def _add_one(self, article: Dict[str, Any], body: str, language: Optional[str], now: float) -> int:
+        """Cluster one article (lock held), returning 1 if it was new."""
+        url = article['url']
+        row = self._urls.get(url)
+        if row is not None:
+            self._updated[row] = now
+            return 0
+
+        features, counts = self._vector(article)
+        if not len(features):
+            return 0
+        self._reweight()
+        idf = self._idf(features)
+        tf = (1 + np.log(counts)).astype(np.float32)
+        length = np.linalg.norm(tf * idf)
+        if length > 0:
+            tf /= length
+
+        row = self._assign(features, tf * idf * idf)
+        story = self._rows.get(row)
+        if story is None:
+            story = self._rows[row] = _Story(id=self._next_id, language=language)
+            self._next_id += 1
+        self._add_to_centroid(row, story, features, tf)
+        story.members.append((features, tf, url, body))
+        story.sources[(article.get('source') or {}).get('name')] += 1
+        story.latest = max(story.latest, article['publishedAt'])
+        story.representative = None
+        self._sizes[row] += 1 + article.get('duplicates', 0)
+        self._updated[row] = now
+        self._urls[url] = row
+        self._df[features] += 1
+        self._articles += 1
+        return 1
+
+    def _assign(self, features: np.ndarray, query: np.ndarray) -> int:
+        """
+        Row of the most similar story, or a free row if none is similar enough.
+
+        Args:
+            features: The article's feature ids
+            query: Its unit TF-IDF weights, multiplied by IDF once more so
+                the product with raw centroid values is the TF-IDF dot product
+        """
+        postings, weights = [], []
+        for f, weight in zip(features.tolist(), query.tolist()):
+            if weight and f in self._postings:
+                postings.append(np.frombuffer(self._postings[f], dtype=np.uint32))
+                weights.append(weight)
+        if postings:
+            slots = np.concatenate(postings)
+            # Query weight of each entry's feature
+            repeated = np.repeat(np.array(weights, dtype=np.float32), [len(p) for p in postings])
+            dots = np.bincount(
+                self._entry_rows[slots],
+                self._entry_values[slots] * repeated,
+                minlength=self._used
+            )
+            norms = self._norms[:self._used]
+            scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return best
+
+        if self._free:
+            return self._free.pop()
+        row = self._used
+        self._used += 1
+        self._norms = _grown(self._norms, self._used)
+        self._sizes = _grown(self._sizes, self._used)
+        self._updated = _grown(self._updated, self._used, fill=-np.inf)
+        return row
+
+    def _add_to_centroid(
+        self,
+        row: int,
+        story: _Story,
+        features: np.ndarray,
+        tf: np.ndarray
+    ) -> None:
+        """Add a member's vector to a story centroid and update its norm."""
+        slots = story.slots
+        new = [f for f in features.tolist() if f not in slots]
+        if new:
+            start = self._entries
+            self._entries += len(new)
+            self._entry_rows = _grown(self._entry_rows, self._entries)
+            self._entry_features = _grown(self._entry_features, self._entries)
+            self._entry_values = _grown(self._entry_values, self._entries)
+            self._entry_rows[start:self._entries] = row
+            self._entry_features[start:self._entries] = new
+            for slot, f in enumerate(new, start):
+                slots[f] = slot
+                if f in self._postings:
+                    self._postings[f].append(slot)
+                else:
+                    self._postings[f] = array('I', (slot,))
+
+        story_slots = np.fromiter((slots[f] for f in features.tolist()), dtype=np.int64, count=len(features))
+        self._entry_values[story_slots] += tf
+        every = np.fromiter(slots.values(), dtype=np.int64, count=len(slots))
+        values = self._entry_values[every]
+        idf = self._idf(self._entry_features[every])
+        self._norms[row] = np.sqrt(values * values @ (idf * idf))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop stories without articles for ``window`` seconds.
+
+        Args:
+            now: Current time on the clock passed to add()
+
+        Returns:
+            Number of stories removed
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._expire(now)
+
+    def _expire(self, now: float) -> int:
+        """Drop expired stories (lock held)."""
+        self._since_expire = 0
+        # Free rows (updated at -inf) have no story left to expire
+        expired = [
+            row for row in np.flatnonzero(self._updated[:self._used] < now - self.window).tolist()
+            if row in self._rows
+        ]
+        for row in expired:
+            story = self._rows.pop(row)
+            for features, _, url, _ in story.members:
+                self._df[features] -= 1
+                del self._urls[url]
+            self._articles -= len(story.members)
+            self._norms[row] = 0
+            self._sizes[row] = 0
+            self._updated[row] = -np.inf
+            self._free.append(row)
+        if expired:
+            self._rebuild_entries()
+            self._weighted_at = -1
+        return len(expired)
+
+    def _rebuild_entries(self) -> None:
+        """Rebuild centroid entries and postings from the remaining stories."""
+        old_values = self._entry_values
+        rows, features, values = [], [], []
+        for row, story in self._rows.items():
+            for f, slot in story.slots.items():
+                story.slots[f] = len(rows)
+                rows.append(row)
+                features.append(f)
+                values.append(old_values[slot])
+
+        self._entries = len(rows)
+        self._entry_rows = np.array(rows or [0], dtype=np.int32)
+        self._entry_features = np.array(features or [0], dtype=np.int32)
+        self._entry_values = np.array(values or [0], dtype=np.float32)
+        self._postings = {}
+        for slot, f in enumerate(features):
+            if f in self._postings:
+                self._postings[f].append(slot)
+            else:
+                self._postings[f] = array('I', (slot,))
+
+    def _representative(self, row: int) -> str:
+        """Encoded member closest to the story centroid (cached until it changes)."""
+        story = self._rows[row]
+        if story.representative is None:
+            scores = []
+            for features, tf, _, _ in story.members:
+                values = self._entry_values[[story.slots[f] for f in features.tolist()]]
+                scores.append(float(values * self._idf(features) ** 2 @ tf))
+            story.representative = story.members[scores.index(max(scores))][3]
+        return story.representative
+
+    def clusters(
+        self,
+        limit: int = 20,
+        min_size: int = 2,
+        language: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Get the largest active stories.
+
+        Args:
+            limit: Maximum number of stories returned
+            min_size: Only stories with at least this many articles
+            language: Only stories started by articles fetched for this language
+            now: Current time on the clock passed to add()
+
+        Returns:
+            Tuple of the number of matching stories and the largest ones
+            (most recently updated first among equal sizes), each with
+            its id, size (counting collapsed duplicates), sources (most
+            frequent first), newest publication date and representative
+            article (decoded JSON)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._clusters(limit, min_size, language, now)
+
+    def _clusters(
+        self,
+        limit: int,
+        min_size: int,
+        language: Optional[str],
+        now: float
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Rank active stories (lock held)."""
+        used = self._used
+        rows = np.flatnonzero(
+            (self._sizes[:used] >= min_size) & (self._updated[:used] >= now - self.window)
+        )
+        rows = rows[np.lexsort((-self._updated[rows], -self._sizes[rows]))].tolist()
+        if language:
+            rows = [row for row in rows if self._rows[row].language == language]
+
+        clusters = []
+        for row in rows[:limit]:
+            story = self._rows[row]
+            clusters.append({
+                'id': story.id,
+                'size': int(self._sizes[row]),
+                'sources': [name for name, _ in story.sources.most_common() if name],
+                'latestPublishedAt': story.latest,
+                'article': json.loads(self._representative(row))
+            })
+        return len(rows), clusters
+
+    def size(self) -> int:
+        """Get the number of clustered articles."""
+        return self._articles
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get clustering statistics.
+
+        Returns:
+            Dictionary with article and story counts and the number of
+            nonzero centroid entries
+        """
+        with self._lock:
+            return {
+                'articles': self._articles,
+                'stories': len(self._rows),
+                'centroid_entries': self._entries
+            }
@@ -2,72 +2,525 @@
 NewsAPI service layer.
 Handles all interactions with the NewsAPI.org external service.
 """
+import asyncio
+from collections import Counter
 import httpx
-from typing import Optional, Dict, Any
-from datetime import datetime
+import importlib.util
+import json
+from functools import cached_property, lru_cache
+from pydantic import TypeAdapter
+from typing import Optional, Dict, Any, Awaitable, Callable, List, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
 import math
+import time
 
+from backend.services.article_index import ArticleIndex
+from backend.services.article_store import ArticleStore
+from backend.services.clustering import StoryClusterer
 from backend.utils.config import get_settings
+from backend.utils.dedup import article_signature, collapse
 from backend.utils.cache import NewsCache
+from backend.utils.cache_backends import CacheEntry, create_cache_backend
+from backend.utils.normalize import normalize_headline_params, normalize_search_params
+from backend.utils.quota import BACKGROUND, USER, QuotaTracker
+from backend.utils.resilience import CircuitBreaker, HedgePolicy, backoff_delays
+from backend.utils.responses import make_etag
+from backend.utils.singleflight import SingleFlight
+from backend.utils.ttl import AdaptiveTTL
 from backend.models.article import NewsResponse, Article
 
+logger = logging.getLogger(__name__)
+
 
 class NewsAPIError(Exception):
     """Custom exception for NewsAPI errors."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Human-readable error message
+            status_code: HTTP status NewsAPI answered with, if any
+            code: NewsAPI error code (e.g. 'parameterInvalid'), if any
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class QuotaExhaustedError(NewsAPIError):
+    """Raised instead of calling NewsAPI when the request budget is spent."""
     pass
 
 
+class CircuitOpenError(NewsAPIError):
+    """Raised instead of calling NewsAPI while it is failing repeatedly."""
+    pass
+
+
+class _TransientError(NewsAPIError):
+    """A failure worth retrying: timeout, network error or 5xx."""
+    pass
+
+
+_ARTICLES = TypeAdapter(List[Article])
+
+# NewsAPI answers that depend only on the request, so repeating it is pointless
+_DETERMINISTIC_ERRORS = {400, 426}
+
+
+class NewsResult:
+    """
+    An encoded news page together with how it was served from the cache.
+
+    ``body`` is the exact JSON the API returns. ``response`` parses it back
+    into a NewsResponse only for callers that need the model.
+
+    The body may be given as a callable so it is only encoded when needed:
+    a client revalidating with a matching ``etag`` gets a 304 without it.
+    """
+
+    def __init__(
+        self,
+        body: Union[bytes, Callable[[], bytes]],
+        cache_status: str = 'MISS',
+        etag: Optional[str] = None,
+        age: float = 0.0,
+        max_age: float = 0.0
+    ):
+        """
+        Initialize the result.
+
+        Args:
+            body: JSON-encoded NewsResponse (by alias), or a function
+                producing it
+            cache_status: 'HIT', 'MISS' or 'STALE'
+            etag: Entity tag of the body (default: hash of the body)
+            age: Seconds since the underlying data was fetched
+            max_age: Seconds the data stays fresh
+        """
+        self._body = body
+        self._etag = etag
+        self.cache_status = cache_status
+        self.age = age
+        self.max_age = max_age
+
+    @property
+    def body(self) -> bytes:
+        """The encoded page."""
+        if callable(self._body):
+            self._body = self._body()
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag identifying the page content."""
+        if self._etag is None:
+            self._etag = make_etag(self.body)
+        return self._etag
+
+    def cache_headers(self) -> Dict[str, str]:
+        """Cache-Control, Age and X-Cache headers for the page."""
+        return {
+            'Cache-Control': f'public, max-age={int(self.max_age)}',
+            'Age': str(int(self.age)),
+            'X-Cache': self.cache_status
+        }
+
+    @cached_property
+    def response(self) -> NewsResponse:
+        """The page as a NewsResponse model."""
+        return NewsResponse.model_validate_json(self.body)
+
+
 class NewsAPIService:
     """
     Service for interacting with NewsAPI.org.
     Implements caching and error handling.
     """
 
-    def __init__(self):
-        """Initialize the NewsAPI service with settings and cache."""
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the NewsAPI service with settings and cache.
+
+        Args:
+            client: Optional pre-built HTTP client. When omitted, a pooled
+                keep-alive client is created lazily on first use.
+        """
         self.settings = get_settings()
         self.base_url = self.settings.news_api_base_url
         self.api_key = self.settings.news_api_key
-        self.cache = NewsCache(ttl=self.settings.cache_ttl)
+        ttl_policy = None
+        if self.settings.cache_adaptive_ttl:
+            ttl_policy = AdaptiveTTL(self.settings.cache_ttl_bounds, default_ttl=self.settings.cache_ttl)
+        self.cache = NewsCache(
+            ttl=self.settings.cache_ttl,
+            stale_ttl=self.settings.cache_stale_ttl,
+            backend=create_cache_backend(self.settings),
+            ttl_policy=ttl_policy
+        )
+        self._client = client
+        self._closed = False
+        self._inflight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        # Requests per (country, category), used to prioritize cache warming
+        self.headline_popularity: Counter = Counter()
+        self.quota = QuotaTracker(
+            limit=self.settings.quota_limit,
+            window=self.settings.quota_window,
+            background_reserve=self.settings.quota_background_reserve,
+            safety_margin=self.settings.quota_safety_margin,
+            cooldown=self.settings.quota_cooldown,
+            path=self.settings.quota_state_path
+        )
+
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.settings.circuit_failure_threshold,
+            reset_timeout=self.settings.circuit_reset_timeout
+        )
+        self.retries = self.settings.upstream_retries
+        self.retry_backoff_base = self.settings.retry_backoff_base
+        self.retry_backoff_max = self.settings.retry_backoff_max
+        self.hedge: Optional[HedgePolicy] = None
+        if self.settings.hedge_enabled:
+            self.hedge = HedgePolicy(
+                percentile=self.settings.hedge_percentile,
+                max_rate=self.settings.hedge_max_rate,
+                initial_delay=self.settings.hedge_initial_delay
+            )
+
+        # NewsAPI accepts at most 100 articles per request
+        self.window_size = max(1, min(self.settings.upstream_window_size, 100))
+        self.max_results = self.settings.upstream_max_results
+
+        # Short-lived cache entries for rejected and empty queries
+        self.negative_ttl = self.settings.cache_negative_ttl
+        self.negative_hits = 0
+
+        # Called with (encoded articles, cache params) for every fetched window,
+        # in a worker thread fed by _publisher so requests never wait on them
+        self._article_listeners: List[Callable[[List[str], Dict[str, Any]], Any]] = []
+        self._published: Optional[asyncio.Queue] = None
+        self._publisher: Optional[asyncio.Task] = None
+        self.listener_errors = 0
+        self.article_store: Optional[ArticleStore] = None
+        if self.settings.article_store_enabled:
+            self.article_store = ArticleStore(
+                path=self.settings.article_store_path,
+                retention=self.settings.article_store_retention,
+                dedup_threshold=self.settings.dedup_similarity if self.settings.dedup_enabled else None
+            )
+            self.add_article_listener(self.article_store.add)
+        self.article_index: Optional[ArticleIndex] = None
+        if self.settings.article_index_enabled:
+            self.article_index = ArticleIndex(window=self.settings.article_index_window)
+            self.add_article_listener(self.article_index.add)
+        self.story_clusters: Optional[StoryClusterer] = None
+        if self.settings.clusters_enabled:
+            self.story_clusters = StoryClusterer(
+                window=self.settings.clusters_window,
+                threshold=self.settings.clusters_similarity
+            )
+            self.add_article_listener(self.story_clusters.add)
+        # Near-duplicate stories are collapsed when windows are encoded
+        self.dedup_threshold: Optional[float] = None
+        if self.settings.dedup_enabled:
+            self.dedup_threshold = self.settings.dedup_similarity
+        self.search_mode = self.settings.search_mode
+        self.local_search_min_results = self.settings.local_search_min_results
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the long-lived upstream client from settings."""
+        settings = self.settings
+        http2 = settings.http2 and importlib.util.find_spec("h2") is not None
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                connect=settings.http_connect_timeout,
+                read=settings.http_read_timeout,
+                write=settings.http_write_timeout,
+                pool=settings.http_pool_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            http2=http2
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared upstream HTTP client (connections are pooled and reused)."""
+        if self._closed:
+            raise RuntimeError("NewsAPIService is closed")
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Cancel background refreshes and in-flight fetches, let the article
+        listeners catch up, and close the upstream client, cache and
+        article store. The service cannot be used afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        # Shielded fetches outlive their cancelled callers
+        await self._inflight.cancel_all()
+
+        await self.flush_articles()
+        if self._publisher is not None:
+            self._publisher.cancel()
+            await asyncio.gather(self._publisher, return_exceptions=True)
+            self._publisher = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+        self.cache.close()
+        self.quota.close()
+        if self.article_store is not None:
+            self.article_store.close()
+
+    def add_article_listener(self, listener: Callable[[List[str], Dict[str, Any]], Any]) -> None:
+        """
+        Register a callback for articles fetched from NewsAPI.
+
+        Args:
+            listener: Called with the window's encoded articles (JSON text,
+                by alias) and the canonical parameters they were fetched with
+        """
+        self._article_listeners.append(listener)
+
+    def publish_articles(self, articles: List[str], params: Dict[str, Any]) -> None:
+        """
+        Hand encoded articles to every article listener.
+
+        Inside an event loop the articles are queued and the listeners run
+        in a worker thread, in publication order, so indexing never holds
+        up requests; use flush_articles() to wait for them. Without a
+        running loop the listeners are called directly. Nothing is
+        published once the service is closed.
+
+        Args:
+            articles: Articles as JSON text (by alias)
+            params: Parameters they were fetched with
+        """
+        if not self._article_listeners or self._closed:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._notify_listeners(articles, params)
+            return
+
+        if self._publisher is None or self._publisher.done() or self._publisher.get_loop() is not loop:
+            self._published = asyncio.Queue()
+            self._publisher = loop.create_task(self._run_publisher(self._published))
+        self._published.put_nowait((articles, params))
+
+    async def _run_publisher(self, queue: asyncio.Queue) -> None:
+        """Feed queued articles to the listeners, one batch at a time."""
+        while True:
+            articles, params = await queue.get()
+            try:
+                await asyncio.to_thread(self._notify_listeners, articles, params)
+            finally:
+                queue.task_done()
+
+    async def flush_articles(self) -> None:
+        """Wait until every published article has reached the listeners."""
+        publisher = self._publisher
+        if publisher is not None and not publisher.done() and publisher.get_loop() is asyncio.get_running_loop():
+            await self._published.join()
 
-    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _notify_listeners(self, articles: List[str], params: Dict[str, Any]) -> None:
+        """
+        Call every article listener.
+
+        A failing listener (e.g. a store locked by another process) is
+        logged and skipped: the articles are already paid for and cached,
+        and the other listeners still get them.
+        """
+        for listener in self._article_listeners:
+            try:
+                listener(articles, params)
+            except Exception:
+                self.listener_errors += 1
+                logger.exception("Article listener %r failed", listener)
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        priority: str = USER
+    ) -> Dict[str, Any]:
         """
         Make an HTTP request to NewsAPI.
 
+        Timeouts, network errors and 5xx responses are retried with jittered
+        exponential backoff. Repeated failures open the circuit breaker, after
+        which calls fail fast (callers fall back to stale cache entries).
+
         Args:
             endpoint: API endpoint (e.g., 'top-headlines', 'everything')
             params: Query parameters
+            priority: USER for user-facing misses, BACKGROUND for refreshes;
+                background calls stop earlier to leave budget for users
 
         Returns:
             JSON response from NewsAPI
 
         Raises:
-            NewsAPIError: If the API request fails
+            QuotaExhaustedError: If the request budget does not allow the call
+            CircuitOpenError: If NewsAPI has been failing and is not probed yet
+            NewsAPIError: If the API request fails after retries
         """
+        if not self.breaker.allow():
+            raise CircuitOpenError("NewsAPI is unavailable - failing fast until it recovers")
+
         # Add API key to parameters
         params['apiKey'] = self.api_key
 
         url = f"{self.base_url}/{endpoint}"
+        delays = backoff_delays(self.retry_backoff_base, self.retry_backoff_max)
+        completed = False
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 401:
-                    raise NewsAPIError("Invalid API key")
-                elif response.status_code == 429:
-                    raise NewsAPIError("Rate limit exceeded")
-                else:
-                    error_data = response.json()
-                    message = error_data.get('message', 'Unknown error')
-                    raise NewsAPIError(f"NewsAPI error: {message}")
+            for attempt in range(self.retries + 1):
+                # Every attempt is a real upstream call and counts against the budget
+                if not self.quota.try_acquire(priority):
+                    raise QuotaExhaustedError("NewsAPI request budget exhausted - serving cached results only")
 
+                try:
+                    data = await self._request_once(url, params, priority)
+                except _TransientError:
+                    if attempt < self.retries:
+                        await asyncio.sleep(next(delays))
+                        continue
+                    completed = True
+                    self.breaker.record_failure()
+                    raise
+                except NewsAPIError:
+                    # NewsAPI answered, so it is up even though it refused the request
+                    completed = True
+                    self.breaker.record_success()
+                    raise
+
+                completed = True
+                self.breaker.record_success()
+                return data
+        finally:
+            if not completed:
+                self.breaker.release()
+
+    async def _request_once(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        priority: str = USER
+    ) -> Dict[str, Any]:
+        """
+        Make a single HTTP request to NewsAPI.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters, including the API key
+            priority: Quota priority for a hedged duplicate request
+
+        Returns:
+            JSON response from NewsAPI
+
+        Raises:
+            _TransientError: On timeouts, network errors and 5xx responses
+            NewsAPIError: If NewsAPI rejects the request
+        """
+        try:
+            if self.hedge is None:
+                response = await self.client.get(url, params=params)
+            else:
+                response = await self._hedged_get(url, params, priority)
         except httpx.TimeoutException:
-            raise NewsAPIError("Request timeout - NewsAPI is taking too long to respond")
+            raise _TransientError("Request timeout - NewsAPI is taking too long to respond")
         except httpx.RequestError as e:
-            raise NewsAPIError(f"Network error: {str(e)}")
+            raise _TransientError(f"Network error: {str(e)}")
+
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 401:
+            raise NewsAPIError("Invalid API key")
+        elif response.status_code == 429:
+            self.quota.mark_exhausted()
+            raise NewsAPIError("Rate limit exceeded")
+
+        try:
+            error_data = response.json()
+        except ValueError:
+            error_data = {}
+        message = error_data.get('message', 'Unknown error')
+        error = _TransientError if response.status_code >= 500 else NewsAPIError
+        raise error(
+            f"NewsAPI error: {message}",
+            status_code=response.status_code,
+            code=error_data.get('code')
+        )
+
+    async def _hedged_get(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        priority: str
+    ) -> httpx.Response:
+        """
+        GET with a duplicate request if the first one is unusually slow.
+
+        If no response arrives within the hedge delay (a latency percentile),
+        an identical request is sent when the hedge rate cap and the quota
+        allow it. The first successful response wins and the other request
+        is cancelled.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters, including the API key
+            priority: Quota priority for the duplicate request
+
+        Returns:
+            The first successful HTTP response
+
+        Raises:
+            httpx.RequestError: If every request sent failed
+        """
+        started = time.monotonic()
+        delay = self.hedge.begin()
+        pending = {asyncio.ensure_future(self.client.get(url, params=params))}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and self.hedge.try_hedge() and self.quota.try_acquire(priority):
+                pending.add(asyncio.ensure_future(self.client.get(url, params=params)))
+
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge.record(time.monotonic() - started)
+                        return task.result()
+                if not pending:
+                    # Every request failed: raise the last error
+                    return done.pop().result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _transform_response(
         self,
@@ -78,6 +531,9 @@ class NewsAPIService:
         """
         Transform NewsAPI response to our standardized format.
 
+        Near-duplicate articles are collapsed, and the copies merged away
+        are left out of totalResults and totalPages.
+
         Args:
             data: Raw NewsAPI response
             page: Current page number
@@ -86,20 +542,312 @@ class NewsAPIService:
         Returns:
             Standardized NewsResponse object
         """
-        total_results = data.get('totalResults', 0)
-        total_pages = math.ceil(total_results / page_size) if total_results > 0 else 0
-
-        articles = data.get('articles', [])
+        fetched = _ARTICLES.validate_python(data.get('articles', []))
+        total_results = max(data.get('totalResults', 0), len(fetched))
+        articles = self._collapse_duplicates(fetched)
+        collapsed = len(fetched) - len(articles)
 
         return NewsResponse(
             status=data.get('status', 'ok'),
-            totalResults=total_results,
+            totalResults=total_results - collapsed,
             page=page,
             pageSize=page_size,
-            totalPages=total_pages,
+            totalPages=self._total_pages(total_results, page_size, collapsed),
             articles=articles
         )
 
+    def _collapse_duplicates(self, articles: List[Article]) -> List[Article]:
+        """
+        Merge near-duplicate articles into the first copy of each story.
+
+        Args:
+            articles: Articles in NewsAPI's order
+
+        Returns:
+            One article per story, with ``duplicates`` counting the
+            copies merged into it
+        """
+        if self.dedup_threshold is None:
+            return articles
+        groups = collapse(
+            ((article_signature(a.title, a.description, a.content), a) for a in articles),
+            self.dedup_threshold
+        )
+        return [
+            article if not copies else article.model_copy(update={
+                'duplicates': article.duplicates + sum(1 + copy.duplicates for copy in copies)
+            })
+            for article, copies in groups
+        ]
+
+    def _total_pages(self, total_results: int, page_size: int, collapsed: int = 0) -> int:
+        """Number of pages, counting only results NewsAPI lets us fetch and we serve."""
+        reachable = min(total_results, self.max_results) if self.max_results else total_results
+        reachable -= collapsed
+        return math.ceil(reachable / page_size) if reachable > 0 else 0
+
+    def _encode_window(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a raw NewsAPI page once and pre-encode its articles.
+
+        Each article is stored as its JSON text (by alias), so cache hits
+        can assemble a response body without re-validating anything.
+
+        Args:
+            data: Raw NewsAPI response
+
+        Returns:
+            Window dict with status, NewsAPI's totalResults, encoded
+            articles, the number of copies collapsed into them and their
+            content digest
+        """
+        response = self._transform_response(data, 1, self.window_size)
+        collapsed = len(data.get('articles', [])) - len(response.articles)
+        window = {
+            'status': response.status,
+            'totalResults': response.total_results + collapsed,
+            'collapsed': collapsed,
+            'articles': [article.model_dump_json(by_alias=True) for article in response.articles]
+        }
+        window['digest'] = self._window_digest(window)
+        return window
+
+    @staticmethod
+    def _window_digest(window: Dict[str, Any]) -> str:
+        """Content hash of an encoded window, used to build page ETags."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{window['status']}:{window['totalResults']}".encode())
+        for article in window['articles']:
+            digest.update(b'\0' + article.encode())
+        return digest.hexdigest()
+
+    def _encode_page(self, window: Dict[str, Any], page: int, page_size: int) -> bytes:
+        """
+        Build the JSON body of a NewsResponse from pre-encoded articles.
+
+        Produces the same document as serializing the NewsResponse model
+        by alias, without constructing it.
+
+        Args:
+            window: Window dict whose 'articles' are this page's encoded
+                articles; an optional 'collapsed' count of merged copies
+                is left out of the totals
+            page: Current page number
+            page_size: Items per page
+
+        Returns:
+            JSON-encoded response body
+        """
+        total_results = window['totalResults']
+        collapsed = window.get('collapsed', 0)
+        head = json.dumps({
+            'status': window['status'],
+            'totalResults': total_results - collapsed,
+            'page': page,
+            'pageSize': page_size,
+            'totalPages': self._total_pages(total_results, page_size, collapsed)
+        }, separators=(',', ':'))
+        body = head[:-1] + ',"articles":[' + ','.join(window['articles']) + ']}'
+        return body.encode()
+
+    async def _get_window(
+        self,
+        cache_endpoint: str,
+        cache_params: Dict[str, Any],
+        api_endpoint: str,
+        params: Dict[str, Any]
+    ) -> Tuple[CacheEntry, str]:
+        """
+        Get one upstream page (a window) from cache, or NewsAPI on a miss.
+
+        Concurrent misses for the same cache key share one upstream request.
+        Stale entries (past the soft TTL) are returned immediately while a
+        background task refreshes them; if that refresh fails the stale
+        entry keeps being served until its hard TTL.
+
+        Args:
+            cache_endpoint: Cache namespace ('headlines' or 'search')
+            cache_params: Parameters identifying the cache entry
+            api_endpoint: NewsAPI endpoint to call on a miss
+            params: NewsAPI query parameters, including page and pageSize
+
+        Returns:
+            Tuple of the cache entry holding the encoded window (see
+            _encode_window) and its cache status
+
+        Raises:
+            NewsAPIError: If the API request fails and nothing is cached
+        """
+        def fetch(priority: str = USER):
+            return self._fetch_window(cache_endpoint, cache_params, api_endpoint, params, priority)
+
+        key = self.cache._generate_key(cache_endpoint, cache_params)
+
+        # Check cache
+        entry = self.cache.get_entry(cache_endpoint, cache_params)
+        if entry is not None and entry.value.get('status') == 'error':
+            # Negative entry: NewsAPI rejected this exact request moments ago
+            self.negative_hits += 1
+            error = entry.value
+            raise NewsAPIError(error['message'], status_code=error['statusCode'], code=error['code'])
+        if entry is not None:
+            if not entry.is_stale:
+                return entry, 'HIT'
+            self._refresh_in_background(key, lambda: fetch(BACKGROUND))
+            return entry, 'STALE'
+
+        return await self._inflight.do(key, fetch), 'MISS'
+
+    async def _fetch_window(
+        self,
+        cache_endpoint: str,
+        cache_params: Dict[str, Any],
+        api_endpoint: str,
+        params: Dict[str, Any],
+        priority: str = USER,
+        publish: bool = True
+    ) -> CacheEntry:
+        """
+        Fetch one window from NewsAPI and store it in the cache.
+
+        Deterministic rejections (bad parameters) and empty results are
+        cached for negative_ttl only, so a repeated bad query costs nothing
+        upstream but a query that starts matching is picked up quickly.
+        Fetched articles go to the article listeners unless publish is
+        False (the caller publishes them itself, e.g. in batches).
+        """
+        try:
+            data = await self._make_request(api_endpoint, dict(params), priority)
+        except NewsAPIError as e:
+            if e.status_code in _DETERMINISTIC_ERRORS and self.negative_ttl > 0:
+                self.cache.set(cache_endpoint, cache_params, {
+                    'status': 'error',
+                    'statusCode': e.status_code,
+                    'code': e.code,
+                    'message': str(e)
+                }, ttl=self.negative_ttl)
+            raise
+
+        window = self._encode_window(data)
+        if window['articles'] or self.negative_ttl <= 0:
+            entry = self.cache.set(cache_endpoint, cache_params, window)
+        else:
+            entry = self.cache.set(cache_endpoint, cache_params, window, ttl=self.negative_ttl)
+        if publish:
+            self.publish_articles(window['articles'], cache_params)
+        return entry
+
+    async def _get_page(
+        self,
+        cache_endpoint: str,
+        cache_params: Dict[str, Any],
+        api_endpoint: str,
+        params: Dict[str, Any],
+        page: int,
+        page_size: int
+    ) -> NewsResult:
+        """
+        Serve any page/page_size by slicing cached upstream windows.
+
+        Upstream is always asked for aligned windows of window_size
+        articles, so e.g. pages 1-10 of size 10 cost a single NewsAPI call.
+        Dedup shortens windows, so pages are sliced from the collapsed
+        windows laid end to end: a page needs every window before it, and
+        the ones after it until it is full.
+
+        Args:
+            cache_endpoint: Cache namespace ('headlines' or 'search')
+            cache_params: Query parameters identifying the result set
+            api_endpoint: NewsAPI endpoint to call on a miss
+            params: NewsAPI query parameters (without page/pageSize)
+            page: Page number (1-indexed)
+            page_size: Number of articles per page
+
+        Returns:
+            NewsResult with the response and its cache status
+
+        Raises:
+            NewsAPIError: If the API request fails and nothing is cached
+        """
+        size = self.window_size
+        start = (page - 1) * page_size
+        end = start + page_size
+
+        def get(w: int) -> Awaitable[Tuple[CacheEntry, str]]:
+            return self._get_window(
+                cache_endpoint,
+                {**cache_params, 'page': w + 1, 'pageSize': size},
+                api_endpoint,
+                {**params, 'page': w + 1, 'pageSize': size}
+            )
+
+        def reachable(w: int) -> bool:
+            # Never ask for windows past the upstream result cap
+            return not self.max_results or w * size < self.max_results
+
+        # Collapsed windows hold at most size articles, so the page
+        # starts in window start // size at the earliest
+        windows = [w for w in range(start // size + 1) if reachable(w)] or [0]
+        results: List[Tuple[CacheEntry, str]] = list(await asyncio.gather(*[get(w) for w in windows]))
+        total_results = results[0][0].value['totalResults']
+        served = sum(len(entry.value['articles']) for entry, _ in results)
+        w = windows[-1] + 1
+        while served < end and w * size < total_results and reachable(w):
+            results.append(await get(w))
+            served += len(results[-1][0].value['articles'])
+            w += 1
+        entries = [entry for entry, _ in results]
+
+        def encode() -> bytes:
+            articles: List[Any] = []
+            offset = 0
+            for entry in entries:
+                window = entry.value['articles']
+                articles.extend(window[max(start - offset, 0):max(end - offset, 0)])
+                offset += len(window)
+
+            first = entries[0].value
+            return self._encode_page({
+                'status': first['status'],
+                'totalResults': first['totalResults'],
+                'collapsed': sum(entry.value.get('collapsed', 0) for entry in entries),
+                'articles': articles
+            }, page, page_size)
+
+        # The page is determined by its windows' content and the slicing
+        digests = [entry.value.get('digest') or self._window_digest(entry.value) for entry in entries]
+        etag = make_etag(f"{','.join(digests)}:{page}:{page_size}".encode())
+
+        statuses = {status for _, status in results}
+        if 'MISS' in statuses:
+            cache_status = 'MISS'
+        elif 'STALE' in statuses:
+            cache_status = 'STALE'
+        else:
+            cache_status = 'HIT'
+
+        now = time.time()
+        return NewsResult(
+            encode,
+            cache_status,
+            etag=etag,
+            age=max(0.0, now - min(entry.stored_at for entry in entries)),
+            max_age=max(0.0, min(entry.fresh_until for entry in entries) - now)
+        )
+
+    def _refresh_in_background(self, key: str, fetch) -> None:
+        """Refresh a stale cache entry without blocking the caller."""
+        async def refresh() -> None:
+            try:
+                await self._inflight.do(key, fetch)
+            except NewsAPIError:
+                # Keep serving the stale entry until its hard TTL
+                pass
+
+        task = asyncio.ensure_future(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
     async def get_top_headlines(
         self,
         country: Optional[str] = None,
@@ -110,6 +858,21 @@ class NewsAPIService:
         """
         Fetch top headlines from NewsAPI.
 
+        Same as get_top_headlines_result, without the cache metadata.
+        """
+        result = await self.get_top_headlines_result(country, category, page, page_size)
+        return result.response
+
+    async def get_top_headlines_result(
+        self,
+        country: Optional[str] = None,
+        category: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10
+    ) -> NewsResult:
+        """
+        Fetch top headlines from NewsAPI.
+
         Args:
             country: 2-letter country code (e.g., 'us', 'gb')
             category: Category filter (business, technology, etc.)
@@ -117,45 +880,86 @@ class NewsAPIService:
             page_size: Number of articles per page
 
         Returns:
-            NewsResponse with articles
+            NewsResult with the response and its cache status
 
         Raises:
             NewsAPIError: If the API request fails
         """
-        # Build cache key parameters
-        cache_params = {
-            'country': country or 'us',  # Default to US
-            'category': category,
-            'page': page,
-            'pageSize': page_size
-        }
+        # Canonical parameters (defaults filled) key the cache entry
+        cache_params = normalize_headline_params(country, category)
+        self.headline_popularity[(cache_params['country'], cache_params['category'])] += 1
 
-        # Check cache
-        cached = self.cache.get('headlines', cache_params)
-        if cached:
-            return NewsResponse(**cached)
+        # Build API request parameters from the same canonical values
+        params = {k: v for k, v in cache_params.items() if v is not None}
 
-        # Build API request parameters
-        params = {'pageSize': page_size, 'page': page}
+        return await self._get_page(
+            'headlines', cache_params, 'top-headlines', params, page, page_size
+        )
 
-        if country:
-            params['country'] = country
-        else:
-            params['country'] = 'us'  # Default country
+    async def warm_headlines(
+        self,
+        country: Optional[str] = None,
+        category: Optional[str] = None,
+        ahead: float = 0.0
+    ) -> bool:
+        """
+        Refresh the first headline window unless it stays fresh long enough.
 
-        if category:
-            params['category'] = category
+        Runs at background priority, so it stops before the quota reserved
+        for user-facing misses.
 
-        # Make API request
-        data = await self._make_request('top-headlines', params)
+        Args:
+            country: 2-letter country code
+            category: Category filter
+            ahead: Also refresh entries that go stale within this many seconds
 
-        # Transform response
-        response = self._transform_response(data, page, page_size)
+        Returns:
+            True if NewsAPI was called, False if the cached entry was fresh
 
-        # Cache the result
-        self.cache.set('headlines', cache_params, response.model_dump())
+        Raises:
+            NewsAPIError: If the API request fails or is not admitted
+        """
+        base = normalize_headline_params(country, category)
+        cache_params = {**base, 'page': 1, 'pageSize': self.window_size}
+
+        entry = self.cache.peek('headlines', cache_params)
+        if entry is not None and entry.fresh_until - time.time() > ahead:
+            return False
+
+        params = {k: v for k, v in cache_params.items() if v is not None}
+        key = self.cache._generate_key('headlines', cache_params)
+        await self._inflight.do(key, lambda: self._fetch_window(
+            'headlines', cache_params, 'top-headlines', params, BACKGROUND
+        ))
+        return True
+
+    async def fetch_latest(self, cache_endpoint: str, base_params: Dict[str, Any]) -> List[str]:
+        """
+        Fetch the newest window of headlines or search results.
+
+        Always calls NewsAPI (at background priority) and refreshes the
+        cached first window, but leaves publishing the articles to the
+        caller. Used by the ingestion worker.
+
+        Args:
+            cache_endpoint: 'headlines' or 'search'
+            base_params: Canonical parameters, from normalize_headline_params
+                or normalize_search_params
+
+        Returns:
+            Encoded articles of the first window
 
-        return response
+        Raises:
+            NewsAPIError: If the API request fails or is not admitted
+        """
+        api_endpoint = 'top-headlines' if cache_endpoint == 'headlines' else 'everything'
+        cache_params = {**base_params, 'page': 1, 'pageSize': self.window_size}
+        params = {k: v for k, v in cache_params.items() if v is not None}
+        key = self.cache._generate_key(cache_endpoint, cache_params)
+        entry = await self._inflight.do(key, lambda: self._fetch_window(
+            cache_endpoint, cache_params, api_endpoint, params, BACKGROUND, publish=False
+        ))
+        return entry.value['articles']
 
     async def search_news(
         self,
@@ -170,6 +974,27 @@ class NewsAPIService:
         """
         Search news articles by keyword.
 
+        Same as search_news_result, without the cache metadata.
+        """
+        result = await self.search_news_result(
+            query, language, from_date, to_date, sort_by, page, page_size
+        )
+        return result.response
+
+    async def search_news_result(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        sort_by: str = 'publishedAt',
+        page: int = 1,
+        page_size: int = 10,
+        mode: Optional[str] = None
+    ) -> NewsResult:
+        """
+        Search news articles by keyword.
+
         Args:
             query: Search keyword (required)
             language: 2-letter language code (e.g., 'en', 'es')
@@ -178,9 +1003,13 @@ class NewsAPIService:
             sort_by: Sort option (relevancy, popularity, publishedAt)
             page: Page number (1-indexed)
             page_size: Number of articles per page
+            mode: 'upstream' or 'local_first' (default: the search_mode
+                setting). local_first answers from locally indexed articles
+                when they have enough matches, and calls NewsAPI otherwise.
 
         Returns:
-            NewsResponse with articles
+            NewsResult with the response and its cache status ('LOCAL'
+            when answered from local articles)
 
         Raises:
             NewsAPIError: If the API request fails
@@ -188,58 +1017,129 @@ class NewsAPIService:
         if not query or query.strip() == '':
             raise NewsAPIError("Search query cannot be empty")
 
-        # Build cache key parameters
-        cache_params = {
-            'q': query,
-            'language': language,
-            'from': from_date,
-            'to': to_date,
-            'sortBy': sort_by,
-            'page': page,
-            'pageSize': page_size
-        }
+        # Canonical parameters, so equivalent searches share one entry
+        cache_params = normalize_search_params(query, language, from_date, to_date, sort_by)
 
-        # Check cache
-        cached = self.cache.get('search', cache_params)
-        if cached:
-            return NewsResponse(**cached)
-
-        # Build API request parameters
-        params = {
-            'q': query,
-            'sortBy': sort_by,
-            'pageSize': page_size,
-            'page': page
-        }
+        if (mode or self.search_mode) == 'local_first':
+            local = self._search_local(cache_params, page, page_size)
+            if local is not None:
+                return local
 
-        if language:
-            params['language'] = language
+        # Build API request parameters from the same canonical values
+        params = {k: v for k, v in cache_params.items() if v is not None}
 
-        if from_date:
-            params['from'] = from_date
+        return await self._get_page(
+            'search', cache_params, 'everything', params, page, page_size
+        )
 
-        if to_date:
-            params['to'] = to_date
+    def _search_local(self, params: Dict[str, Any], page: int, page_size: int) -> Optional[NewsResult]:
+        """
+        Answer a search from local articles if they cover the request.
 
-        # Make API request
-        data = await self._make_request('everything', params)
+        publishedAt-sorted searches whose from date falls within the
+        in-memory index's window use the index (recent articles, fetch
+        order); everything else uses the article store (BM25 ranking, full
+        retention). Either is a coverage gap (and NewsAPI is
+        asked instead) when it has fewer than local_search_min_results
+        matches or not enough to fill the requested page.
 
-        # Transform response
-        response = self._transform_response(data, page, page_size)
+        Args:
+            params: Canonical search parameters
+            page: Page number (1-indexed)
+            page_size: Number of articles per page
+
+        Returns:
+            NewsResult with cache status 'LOCAL', or None to go upstream
+        """
+        offset = (page - 1) * page_size
+        if self._index_covers(params):
+            found = self.article_index.search(
+                params['q'],
+                language=params['language'],
+                from_date=params['from'],
+                to_date=params['to'],
+                limit=page_size,
+                offset=offset
+            )
+        elif self.article_store is not None:
+            found = self.article_store.search(
+                params['q'],
+                language=params['language'],
+                from_date=params['from'],
+                to_date=params['to'],
+                sort_by=params['sortBy'],
+                limit=page_size,
+                offset=offset
+            )
+        else:
+            return None
+        if found is None:
+            return None
+        total, articles = found
+        if total < max(self.local_search_min_results, page * page_size):
+            return None
 
-        # Cache the result
-        self.cache.set('search', cache_params, response.model_dump())
+        body = self._encode_page(
+            {'status': 'ok', 'totalResults': total, 'articles': articles}, page, page_size
+        )
+        return NewsResult(body, 'LOCAL')
 
-        return response
+    def _index_covers(self, params: Dict[str, Any]) -> bool:
+        """Check whether the in-memory index can answer a search."""
+        if self.article_index is None:
+            return False
+        if self.article_store is None:
+            return True
+        if params['sortBy'] != 'publishedAt' or not params['from']:
+            return False
+        window_start = datetime.now(timezone.utc) - timedelta(seconds=self.article_index.window)
+        return params['from'][:10] >= window_start.date().isoformat()
 
     def clear_cache(self) -> None:
         """Clear all cached responses."""
         self.cache.clear()
 
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        cache_stats = self.cache.stats()
         return {
-            'size': self.cache.size(),
-            'max_size': 100,
-            'ttl_seconds': self.settings.cache_ttl
+            **cache_stats,
+            'size': cache_stats['entries'],
+            'max_size': cache_stats.get('max_entries'),
+            'ttl_seconds': self.settings.cache_ttl,
+            'stale_ttl_seconds': self.cache.stale_ttl,
+            'upstream_calls': self._inflight.calls,
+            'coalesced_calls': self._inflight.coalesced,
+            'negative_hits': self.negative_hits,
+            'listener_errors': self.listener_errors,
+            'stored_articles': self.article_store.size() if self.article_store is not None else None,
+            'indexed_articles': self.article_index.size() if self.article_index is not None else None,
+            'clustered_articles': self.story_clusters.size() if self.story_clusters is not None else None
         }
+
+    def get_quota_status(self) -> Dict[str, Any]:
+        """Get the remaining NewsAPI request budget."""
+        return self.quota.status()
+
+    def get_upstream_status(self) -> Dict[str, Any]:
+        """Get the circuit breaker state (and hedging stats) for NewsAPI."""
+        status = {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.failures
+        }
+        if self.hedge is not None:
+            status['hedge_delay_seconds'] = self.hedge.delay()
+            status['hedged_requests'] = self.hedge.hedges
+        return status
+
+
+@lru_cache
+def get_news_service() -> NewsAPIService:
+    """
+    Get the process-wide NewsAPIService instance.
+
+    Used as a FastAPI dependency so the cache and settings live for the
+    whole worker lifetime instead of a single request. Tests can swap it
+    out through ``app.dependency_overrides[get_news_service]``.
+    """
+    return NewsAPIService()
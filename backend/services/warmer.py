@@ -0,0 +1,130 @@
+"""
+Background cache warming for top headlines.
+
+Keeps a configured set of (country, category) headline pages in the cache
+so first visitors get a cache hit instead of waiting on NewsAPI.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+
+from backend.routers.filters import CATEGORIES, COUNTRIES
+from backend.services.news_api import (
+    CircuitOpenError,
+    NewsAPIError,
+    NewsAPIService,
+    QuotaExhaustedError
+)
+from backend.utils.normalize import normalize_headline_params
+
+Target = Tuple[str, Optional[str]]
+
+
+def parse_targets(specs: Iterable[str]) -> List[Target]:
+    """
+    Parse warming targets from settings.
+
+    Each spec is 'country' (all categories combined), 'country:category',
+    or '*' for every country and category listed in the filters.
+
+    Args:
+        specs: Target specifications
+
+    Returns:
+        Unique canonical (country, category) pairs, in the given order
+    """
+    targets: List[Target] = []
+    for spec in specs:
+        if spec.strip() == '*':
+            pairs = [
+                (country.code, category)
+                for country in COUNTRIES
+                for category in [None, *CATEGORIES]
+            ]
+        else:
+            country, _, category = spec.partition(':')
+            pairs = [(country, category or None)]
+
+        for country, category in pairs:
+            params = normalize_headline_params(country, category)
+            target = (params['country'], params['category'])
+            if target not in targets:
+                targets.append(target)
+    return targets
+
+
+class CacheWarmer:
+    """
+    Periodically refresh popular headline pages before they go stale.
+
+    Each cycle visits the targets most requested first (configured order
+    breaks ties) and refreshes at most ``max_per_cycle`` of them. Calls run
+    at background priority, so warming stops as soon as the remaining
+    quota is reserved for user-facing requests.
+    """
+
+    def __init__(
+        self,
+        service: NewsAPIService,
+        targets: List[Target],
+        interval: float = 120,
+        max_per_cycle: int = 5
+    ):
+        """
+        Initialize the warmer.
+
+        Args:
+            service: NewsAPI service whose cache is warmed
+            targets: (country, category) pairs to keep warm
+            interval: Seconds between warming cycles
+            max_per_cycle: Upstream calls allowed per cycle
+        """
+        self.service = service
+        self.targets = targets
+        self.interval = interval
+        self.max_per_cycle = max_per_cycle
+        self.refreshed = 0
+        self.failures = 0
+
+    def ordered_targets(self) -> List[Target]:
+        """Targets sorted by observed request count, most popular first."""
+        popularity = self.service.headline_popularity
+        return sorted(self.targets, key=lambda target: -popularity[target])
+
+    async def run_once(self) -> int:
+        """
+        Run one warming cycle.
+
+        Returns:
+            Number of headline pages refreshed from NewsAPI
+        """
+        refreshed = 0
+        for country, category in self.ordered_targets():
+            if refreshed >= self.max_per_cycle:
+                break
+            try:
+                # Refresh anything that would go stale before the next cycle
+                if await self.service.warm_headlines(country, category, ahead=self.interval):
+                    refreshed += 1
+            except (QuotaExhaustedError, CircuitOpenError):
+                # No budget or NewsAPI is down: try again next cycle
+                self.failures += 1
+                break
+            except NewsAPIError:
+                self.failures += 1
+
+        self.refreshed += refreshed
+        return refreshed
+
+    async def run(self) -> None:
+        """Warm the cache every interval seconds until cancelled."""
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get warming statistics."""
+        return {
+            'targets': len(self.targets),
+            'refreshed': self.refreshed,
+            'failures': self.failures
+        }
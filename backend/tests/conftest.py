@@ -1,9 +1,16 @@
 """
 Pytest configuration and fixtures
 """
+import os
+
+# Keep the upstream budget per process instead of in the default state file
+os.environ.setdefault("QUOTA_STATE_PATH", ":memory:")
+
 import pytest
+from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 from backend.main import app
+from backend.services.news_api import get_news_service
 
 
 @pytest.fixture
@@ -12,6 +19,23 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def mock_service():
+    """Override the NewsAPIService dependency with a mock"""
+    service = AsyncMock()
+    app.dependency_overrides[get_news_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_news_service, None)
+
+
+@pytest.fixture
+def news_service():
+    """Fresh process-wide NewsAPIService, reset after the test"""
+    get_news_service.cache_clear()
+    yield get_news_service()
+    get_news_service.cache_clear()
+
+
 @pytest.fixture
 def mock_news_response():
     """Mock NewsAPI response data"""
@@ -0,0 +1,10 @@
+"""
+Shared helpers for building service results in tests
+"""
+from backend.models.article import NewsResponse
+from backend.services.news_api import NewsResult
+
+
+def news_result(response: NewsResponse, cache_status: str = 'MISS') -> NewsResult:
+    """Encode a NewsResponse the way the service returns pages"""
+    return NewsResult(response.model_dump_json(by_alias=True).encode(), cache_status)
@@ -0,0 +1,135 @@
+"""
+Unit tests for the in-memory article index
+"""
+import json
+import pytest
+from backend.services.article_index import ArticleIndex
+from backend.utils.query import parse_query, tokenize
+
+
+def make_article(i, title, description='', published='2024-01-15T10:30:00Z'):
+    """Encode an article the way the service caches it"""
+    return json.dumps({
+        'source': {'id': None, 'name': 'Example'},
+        'author': None,
+        'title': title,
+        'description': description,
+        'url': f'https://example.com/{i}',
+        'urlToImage': None,
+        'publishedAt': published,
+        'content': None
+    })
+
+
+def urls(found):
+    """URLs of a search result"""
+    return [json.loads(body)['url'] for body in found[1]]
+
+
+class TestQueryParsing:
+    """Tokenizer and query parser"""
+
+    def test_tokenize_folds_case_and_diacritics(self):
+        """Accented and upper-case words fold to the same token"""
+        assert tokenize('Café CRÈME, naïve São-Paulo') == ['cafe', 'creme', 'naive', 'sao', 'paulo']
+
+    @pytest.mark.parametrize('query,expected', [
+        ('bitcoin', ('phrase', ('bitcoin',))),
+        ('"Climate Change"', ('phrase', ('climate', 'change'))),
+        ('a b', ('and', [('phrase', ('a',)), ('phrase', ('b',))])),
+        ('a OR b c', ('or', [('phrase', ('a',)), ('and', [('phrase', ('b',)), ('phrase', ('c',))])])),
+        ('(a OR b) -c', ('not', ('or', [('phrase', ('a',)), ('phrase', ('b',))]), ('phrase', ('c',)))),
+    ])
+    def test_parse(self, query, expected):
+        """Operators nest with NOT > AND > OR precedence"""
+        assert parse_query(query) == expected
+
+    @pytest.mark.parametrize('query', ['-bitcoin', 'NOT a', 'a OR -b', '(a', 'a)', '!!!'])
+    def test_unparseable(self, query):
+        """Purely negative or malformed queries are rejected"""
+        assert parse_query(query) is None
+
+
+class TestArticleIndex:
+    """Posting-list search with expiry"""
+
+    @pytest.fixture
+    def index(self):
+        index = ArticleIndex(window=100)
+        index.add([
+            make_article(1, 'Markets rally in São Paulo', 'Stocks climbing', '2024-01-10T08:00:00Z'),
+            make_article(2, 'Election results', 'Markets react to the vote', '2024-01-12T08:00:00Z'),
+            make_article(3, 'Weather', 'Sunny in Paulo Alto', '2024-01-14T08:00:00Z'),
+        ], {'language': 'en'}, now=0)
+        return index
+
+    def test_boolean_queries(self, index):
+        """AND, OR and NOT map to posting list operations"""
+        # Fetch order: NewsAPI's own order within a window
+        assert urls(index.search('markets', now=1)) == ['https://example.com/1', 'https://example.com/2']
+        assert urls(index.search('markets stocks', now=1)) == ['https://example.com/1']
+        assert index.search('weather OR election', now=1)[0] == 2
+        assert urls(index.search('markets -vote', now=1)) == ['https://example.com/1']
+        assert index.search('-markets', now=1) is None
+
+    def test_phrases_and_folding(self, index):
+        """Phrases must match in sequence; accents are ignored"""
+        assert urls(index.search('"sao paulo"', now=1)) == ['https://example.com/1']
+        assert index.search('"paulo sao"', now=1) == (0, [])
+        assert index.search('SAO', now=1)[0] == 1
+
+        # Verified phrase matches are cached; later articles are checked too
+        index.add([make_article(4, 'Flights to Sao Paulo')], now=1)
+        assert urls(index.search('"sao paulo"', now=1)) == ['https://example.com/4', 'https://example.com/1']
+
+    def test_filters_and_paging(self, index):
+        """Language and date filters, then slices in fetch order"""
+        assert index.search('markets', language='de', now=1) == (0, [])
+        assert index.search('markets', from_date='2024-01-11', now=1)[0] == 1
+        assert index.search('markets', to_date='2024-01-11', now=1)[0] == 1
+        assert urls(index.search('markets', limit=1, offset=1, now=1)) == ['https://example.com/2']
+        assert urls(index.search('markets', language='en', limit=1, offset=1, now=1)) == ['https://example.com/2']
+
+    def test_refetch_replaces_article(self, index):
+        """A re-fetched URL is indexed under its new text only"""
+        index.add([make_article(1, 'Corrected headline')], now=1)
+        assert index.size() == 3
+        assert index.search('markets', now=1) == (1, [make_article(2, 'Election results', 'Markets react to the vote',
+                                                                    '2024-01-12T08:00:00Z')])
+        assert urls(index.search('corrected OR weather', now=1)) == ['https://example.com/1', 'https://example.com/3']
+
+    def test_unchanged_refetch_is_noop(self, index):
+        """Re-fetching the same article keeps its id and postings"""
+        postings = index.stats()['postings']
+        assert index.add([make_article(3, 'Weather', 'Sunny in Paulo Alto', '2024-01-14T08:00:00Z')], now=1) == 0
+        assert index.stats()['postings'] == postings
+
+    def test_cached_bitmaps_follow_new_postings(self, index):
+        """Cached term bitmaps pick up articles added after caching"""
+        index.BITMAP_MIN_POSTINGS = 1
+        assert index.search('markets OR weather', now=1)[0] == 3
+        index.add([make_article(4, 'Markets later')], now=1)
+        assert urls(index.search('markets OR weather', limit=2, now=1)) == ['https://example.com/4', 'https://example.com/1']
+        assert index.search('markets OR weather', now=1)[0] == 4
+
+    def test_expiry(self, index):
+        """Articles older than the window are dropped with their postings"""
+        index.add([make_article(4, 'Markets later')], now=50)
+        assert index.expire(now=120) == 3
+        assert index.size() == 1
+        assert urls(index.search('markets', now=120)) == ['https://example.com/4']
+        assert index.stats()['postings'] == len(set(tokenize('Markets later Example')))
+
+    def test_search_skips_unswept_articles(self, index):
+        """Searches ignore articles past the window before any sweep"""
+        index.add([make_article(4, 'Markets later')], now=50)
+        assert index.search('markets', now=101) == (1, [make_article(4, 'Markets later')])
+        assert index.search('markets OR weather', now=101)[0] == 1
+        assert index.search('markets', language='en', now=101) == (0, [])
+        assert index.size() == 4
+
+    def test_expiry_during_add(self, index):
+        """Adds sweep expired articles periodically"""
+        index.EXPIRE_EVERY = 2
+        index.add([make_article(4, 'Later'), make_article(5, 'Later')], now=200)
+        assert index.size() == 2
@@ -0,0 +1,157 @@
+"""
+Unit tests for the local article store and query translation
+"""
+import json
+import time
+import pytest
+from backend.services.article_store import ArticleStore
+from backend.utils.query import to_fts_query
+
+
+def make_article(i, title, description='', published='2024-01-15T10:30:00Z'):
+    """Encode an article the way the service caches it"""
+    return json.dumps({
+        'source': {'id': None, 'name': 'Example'},
+        'author': None,
+        'title': title,
+        'description': description,
+        'url': f'https://example.com/{i}',
+        'urlToImage': None,
+        'publishedAt': published,
+        'content': None
+    })
+
+
+class TestQueryTranslation:
+    """NewsAPI query syntax to FTS5"""
+
+    @pytest.mark.parametrize('query,expected', [
+        ('bitcoin', '"bitcoin"'),
+        ('crypto bitcoin', '"crypto" "bitcoin"'),
+        ('"climate change"', '"climate change"'),
+        ('crypto -bitcoin', '"crypto" NOT "bitcoin"'),
+        ('crypto AND NOT bitcoin', '"crypto" NOT "bitcoin"'),
+        ('+crypto OR (ai AND chips)', '"crypto" OR ( "ai" AND "chips" )'),
+        ('c++ AND', '"c"'),
+    ])
+    def test_translation(self, query, expected):
+        """Terms are quoted and operators kept"""
+        assert to_fts_query(query) == expected
+
+    @pytest.mark.parametrize('query', ['-bitcoin', 'NOT bitcoin', 'crypto OR -bitcoin', '!!!'])
+    def test_untranslatable(self, query):
+        """Queries FTS5 cannot express are left to NewsAPI"""
+        assert to_fts_query(query) is None
+
+
+class TestArticleStore:
+    """SQLite FTS5 article store"""
+
+    @pytest.fixture
+    def store(self):
+        store = ArticleStore()
+        yield store
+        store.close()
+
+    def test_search_ranks_and_filters(self, store):
+        """Matches are found by stem, language and date"""
+        store.add([
+            make_article(1, 'Markets rally', 'Stocks climbing', '2024-01-10T08:00:00Z'),
+            make_article(2, 'Election results', 'Markets react', '2024-01-12T08:00:00Z'),
+            make_article(3, 'Weather', 'Sunny', '2024-01-14T08:00:00Z'),
+        ], {'language': 'en'})
+
+        total, bodies = store.search('market')
+        assert total == 2
+        # Newest first by default
+        assert [json.loads(b)['url'] for b in bodies] == ['https://example.com/2', 'https://example.com/1']
+
+        # Title matches outrank description matches
+        _, bodies = store.search('market', sort_by='relevancy')
+        assert json.loads(bodies[0])['url'] == 'https://example.com/1'
+
+        assert store.search('market', language='de') == (0, [])
+        assert store.search('market', from_date='2024-01-11')[0] == 1
+        assert store.search('market -election')[0] == 1
+        assert store.search('stocks', limit=1, offset=1) == (1, [])
+
+    def test_upsert_by_url(self, store):
+        """Re-fetched articles replace their earlier copy in the index"""
+        store.add([make_article(1, 'Old headline')])
+        store.add([make_article(1, 'New headline')])
+
+        assert store.size() == 1
+        assert store.search('old') == (0, [])
+        assert store.search('new')[0] == 1
+
+    def test_retention(self, store):
+        """Articles not fetched within the retention are pruned"""
+        store.retention = 0.01
+        store.add([make_article(1, 'Markets', 'Stocks climb in Asia')])
+        time.sleep(0.02)
+        store.add([make_article(2, 'Markets', 'Bond yields fall after jobs data')])
+
+        assert store.prune() == 1
+        assert store.search('markets')[0] == 1
+
+    def test_near_duplicates_merged(self, store):
+        """Copies of a stored story are counted on it, idempotently"""
+        wire = ('The Federal Reserve raised its benchmark rate on Wednesday, citing persistent '
+                'inflation and a strong labor market.')
+        story = make_article(1, 'Fed raises interest rates by a quarter point', wire)
+        copy = make_article(2, 'Fed raises interest rates by a quarter point - Reuters', wire)
+        other = make_article(3, 'Local team wins championship', 'Fans celebrated downtown')
+        store.add([story, copy, other])
+        # Re-fetching the copy, now carrying a window-level count, replaces its count
+        store.add([json.dumps({**json.loads(copy), 'duplicates': 2})])
+
+        assert store.size() == 2
+        total, bodies = store.search('federal reserve')
+        assert total == 1
+        assert json.loads(bodies[0])['url'] == 'https://example.com/1'
+        assert json.loads(bodies[0])['duplicates'] == 3
+
+    def test_refetch_keeps_signature_index_flat(self, store):
+        """Re-fetching a story does not grow the signature lookup; edits replace it"""
+        wire = ('The Federal Reserve raised its benchmark rate on Wednesday, citing persistent '
+                'inflation and a strong labor market.')
+
+        def entries():
+            return sum(len(band) for table in store._signatures._tables for band in table.values())
+
+        store.add([make_article(1, 'Fed raises interest rates by a quarter point', wire)])
+        indexed = entries()
+        for _ in range(20):
+            store.add([make_article(1, 'Fed raises interest rates by a quarter point', wire)])
+        assert entries() == indexed
+
+        store.add([make_article(1, 'Local team wins championship after a dramatic overtime win', wire[:40])])
+        assert entries() == indexed
+        # The old text no longer finds the story
+        copy = make_article(2, 'Fed raises interest rates by a quarter point - Reuters', wire)
+        store.add([copy])
+        assert store.size() == 2
+
+    def test_failed_batch_rolls_back(self, store):
+        """A batch that fails part-way stores nothing"""
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday citing inflation'
+        with pytest.raises(ValueError):
+            store.add([make_article(1, 'Fed raises rates', wire), '{not json'])
+
+        assert store.size() == 0
+        assert not store._conn.in_transaction
+        store.add([make_article(2, 'Fed raises rates', wire)])
+        assert store.size() == 1
+
+    def test_dedup_disabled(self):
+        """Without a distance every URL is stored"""
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday citing inflation'
+        store = ArticleStore(dedup_threshold=None)
+        store.add([make_article(1, 'Fed raises rates', wire), make_article(2, 'Fed raises rates', wire)])
+        assert store.size() == 2
+
+    def test_untranslatable_query(self, store):
+        """Queries the index cannot evaluate return None"""
+        store.add([make_article(1, 'Markets')])
+        assert store.search('-markets') is None
+        assert store.search('(markets') is None
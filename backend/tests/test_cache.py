@@ -0,0 +1,374 @@
+"""
+Unit tests for NewsCache storage backends
+"""
+import time
+import pytest
+from backend.utils.cache import NewsCache
+from backend.utils.cache_backends import (
+    CacheEntry,
+    EntryCodec,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    TieredBackend,
+    create_cache_backend
+)
+from backend.utils.config import Settings
+from backend.utils.ttl import AdaptiveTTL
+
+
+def make_entry(value, ttl=60.0):
+    """Build a fresh cache entry expiring after ttl seconds"""
+    now = time.time()
+    return CacheEntry(value=value, stored_at=now, fresh_until=now + ttl, expires_at=now + ttl)
+
+
+@pytest.fixture
+def redis_backend():
+    """Redis backend backed by an in-process fakeredis server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = RedisBackend(client=fakeredis.FakeRedis())
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    """SQLite backend in a temporary file"""
+    backend = SQLiteBackend(path=str(tmp_path / "cache.sqlite3"))
+    yield backend
+    backend.close()
+
+
+@pytest.fixture(params=["memory", "redis", "sqlite"])
+def backend(request):
+    """Each backend implementation in turn"""
+    if request.param == "memory":
+        return MemoryBackend(maxsize=10)
+    return request.getfixturevalue(f"{request.param}_backend")
+
+
+class TestCacheBackends:
+    """Behaviour shared by every backend"""
+
+    def test_set_get_roundtrip(self, backend):
+        """Stored entries come back with the same value"""
+        backend.set('k', make_entry({'articles': [{'title': 'a'}]}))
+        entry = backend.get('k')
+
+        assert entry.value == {'articles': [{'title': 'a'}]}
+        assert not entry.is_stale
+        assert backend.size() == 1
+
+    def test_missing_key(self, backend):
+        """Unknown keys return None"""
+        assert backend.get('missing') is None
+
+    def test_expired_entry_dropped(self, backend):
+        """Entries disappear after expires_at"""
+        backend.set('k', make_entry('v', ttl=0.1))
+        time.sleep(0.15)
+        assert backend.get('k') is None
+
+    def test_delete_and_clear(self, backend):
+        """delete removes one entry, clear removes all"""
+        backend.set('a', make_entry(1))
+        backend.set('b', make_entry(2))
+
+        backend.delete('a')
+        assert backend.get('a') is None
+        assert backend.size() == 1
+
+        backend.clear()
+        assert backend.size() == 0
+
+
+class TestMemoryBackendBounds:
+    """Byte and entry bounds with eviction accounting"""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Exceeding max_bytes evicts the least recently used entry"""
+        size = len(make_entry('x' * 100).to_bytes())
+        # Room for two entries, not three (timestamps vary the size slightly)
+        backend = MemoryBackend(maxsize=100, max_bytes=int(size * 2.5))
+
+        backend.set('a', make_entry('x' * 100))
+        backend.set('b', make_entry('x' * 100))
+        backend.get('a')  # 'b' is now least recently used
+        backend.set('c', make_entry('x' * 100))
+
+        assert backend.get('b') is None
+        assert backend.get('a') is not None
+        assert backend.get('c') is not None
+        stats = backend.stats()
+        assert size * 2 - 10 <= stats['bytes'] <= backend.max_bytes
+        assert stats['evictions'] == 1
+
+    def test_expired_entries_dropped_before_lru(self):
+        """Expired entries make room before any live entry is evicted"""
+        backend = MemoryBackend(maxsize=2)
+        backend.set('old', make_entry('v', ttl=0.05))
+        backend.set('live', make_entry('v'))
+        time.sleep(0.1)
+        backend.set('new', make_entry('v'))
+
+        assert backend.get('live') is not None
+        stats = backend.stats()
+        assert stats['expirations'] == 1
+        assert stats['evictions'] == 0
+
+    def test_oversized_entry_not_cached(self):
+        """An entry larger than the whole budget is skipped"""
+        backend = MemoryBackend(max_bytes=10)
+        backend.set('big', make_entry('x' * 100))
+
+        assert backend.get('big') is None
+        assert backend.stats()['bytes'] == 0
+
+    def test_bytes_released_on_replace_and_delete(self):
+        """Byte accounting follows overwrites and deletes"""
+        backend = MemoryBackend()
+        backend.set('k', make_entry('x' * 10))
+        backend.set('k', make_entry('x' * 500))
+        assert 500 < backend.stats()['bytes'] < 650
+
+        backend.delete('k')
+        assert backend.stats()['bytes'] == 0
+
+    def test_hits_and_misses_per_endpoint(self):
+        """NewsCache counts hits and misses per endpoint"""
+        cache = NewsCache()
+        cache.set('headlines', {'country': 'us'}, {'status': 'ok'})
+
+        cache.get('headlines', {'country': 'us'})
+        cache.get('headlines', {'country': 'gb'})
+        cache.get('search', {'q': 'bitcoin'})
+
+        endpoints = cache.stats()['endpoints']
+        assert endpoints['headlines'] == {'hits': 1, 'stale_hits': 0, 'misses': 1}
+        assert endpoints['search'] == {'hits': 0, 'stale_hits': 0, 'misses': 1}
+
+
+class TestSharedBackends:
+    """Entries written through one handle are visible through another"""
+
+    def test_sqlite_shared_between_connections(self, tmp_path):
+        """Two workers opening the same file share entries"""
+        path = str(tmp_path / "shared.sqlite3")
+        worker_a = NewsCache(backend=SQLiteBackend(path))
+        worker_b = NewsCache(backend=SQLiteBackend(path))
+
+        worker_a.set('headlines', {'country': 'us'}, {'status': 'ok'})
+        assert worker_b.get('headlines', {'country': 'us'}) == {'status': 'ok'}
+
+    def test_redis_shared_between_clients(self):
+        """Two workers on one Redis server share entries"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        worker_a = NewsCache(backend=RedisBackend(client=fakeredis.FakeRedis(server=server)))
+        worker_b = NewsCache(backend=RedisBackend(client=fakeredis.FakeRedis(server=server)))
+
+        worker_a.set('search', {'q': 'bitcoin'}, {'status': 'ok'})
+        assert worker_b.get('search', {'q': 'bitcoin'}) == {'status': 'ok'}
+
+    def test_sqlite_compact(self, sqlite_backend):
+        """compact removes only expired rows"""
+        sqlite_backend.set('old', make_entry('v', ttl=0.05))
+        sqlite_backend.set('new', make_entry('v', ttl=60))
+        time.sleep(0.1)
+
+        assert sqlite_backend.compact() == 1
+        assert sqlite_backend.get('new') is not None
+
+
+class TestDiskTier:
+    """Memory cache backed by a persistent SQLite tier"""
+
+    def test_restarted_worker_loads_from_disk(self, tmp_path):
+        """A fresh process finds entries written before the restart"""
+        path = str(tmp_path / "disk.sqlite3")
+        before = NewsCache(backend=TieredBackend(MemoryBackend(), SQLiteBackend(path)))
+        before.set('headlines', {'country': 'us'}, {'status': 'ok'})
+        before.close()
+
+        after = NewsCache(backend=TieredBackend(MemoryBackend(), SQLiteBackend(path)))
+        assert after.backend.primary.size() == 0
+        assert after.get('headlines', {'country': 'us'}) == {'status': 'ok'}
+        # Promoted to memory on first read
+        assert after.backend.primary.size() == 1
+        after.close()
+
+    def test_tier_compaction(self, tmp_path):
+        """compact sweeps expired entries from memory and disk"""
+        cache = NewsCache(
+            ttl=0.05,
+            backend=TieredBackend(MemoryBackend(), SQLiteBackend(str(tmp_path / "d.db")))
+        )
+        cache.set('search', {'q': 'a'}, {'status': 'ok'})
+        time.sleep(0.1)
+
+        # One expired copy in each tier
+        assert cache.compact() == 2
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_compact_periodically(self, tmp_path):
+        """Background compaction runs until cancelled"""
+        import asyncio
+
+        cache = NewsCache(ttl=0.01, backend=SQLiteBackend(str(tmp_path / "p.db")))
+        cache.set('search', {'q': 'a'}, {'status': 'ok'})
+
+        task = asyncio.create_task(cache.compact_periodically(0.05))
+        await asyncio.sleep(0.12)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert cache.backend._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+        cache.close()
+
+
+class TestBackendSelection:
+    """Backend is chosen from Settings"""
+
+    def test_default_is_memory(self):
+        """Default settings use the in-memory backend"""
+        assert isinstance(create_cache_backend(Settings()), MemoryBackend)
+
+    def test_sqlite_from_settings(self, tmp_path):
+        """CACHE_BACKEND=sqlite selects the SQLite backend"""
+        settings = Settings(cache_backend="sqlite", cache_sqlite_path=str(tmp_path / "c.db"))
+        backend = create_cache_backend(settings)
+        assert isinstance(backend, SQLiteBackend)
+        backend.close()
+
+    def test_news_response_roundtrip(self, sqlite_backend, mock_news_response):
+        """Cached responses survive serialization in a shared backend"""
+        from backend.models.article import NewsResponse
+        from backend.services.news_api import NewsAPIService
+
+        response = NewsAPIService()._transform_response(mock_news_response, 1, 10)
+        cache = NewsCache(backend=sqlite_backend)
+        cache.set('headlines', {'country': 'us'}, response.model_dump(mode='json'))
+
+        restored = NewsResponse(**cache.get('headlines', {'country': 'us'}))
+        assert restored == response
+
+    def test_disk_tier_from_settings(self, tmp_path):
+        """CACHE_DISK_PATH wraps the memory backend with a disk tier"""
+        settings = Settings(cache_disk_path=str(tmp_path / "disk.db"))
+        backend = create_cache_backend(settings)
+        assert isinstance(backend, TieredBackend)
+        assert isinstance(backend.primary, MemoryBackend)
+        backend.close()
+
+
+class TestCompression:
+    """Compressed entry storage"""
+
+    @pytest.fixture(params=["zlib", "zstd"])
+    def codec(self, request):
+        """Each compressing codec in turn"""
+        if request.param == "zstd":
+            pytest.importorskip("zstandard")
+        return EntryCodec(request.param)
+
+    def test_roundtrip(self, codec):
+        """Compressed entries decode back to the same entry"""
+        entry = make_entry({'articles': ['{"title":"x"}'] * 50})
+        assert codec.decode(codec.encode(entry)) == entry
+
+    def test_decode_detects_format(self, codec):
+        """Any codec reads entries written uncompressed or by another codec"""
+        entry = make_entry({'v': 1})
+        assert EntryCodec().decode(codec.encode(entry)) == entry
+        assert codec.decode(EntryCodec().encode(entry)) == entry
+
+    def test_memory_backend_charges_compressed_size(self, codec):
+        """Compressed entries take a fraction of the bytes budget"""
+        value = {'articles': ['{"content":"Body text of the article..."}'] * 100}
+        plain = MemoryBackend(maxsize=10)
+        compressed = MemoryBackend(maxsize=10, codec=codec)
+        plain.set('k', make_entry(value))
+        compressed.set('k', make_entry(value))
+
+        assert compressed.get('k').value == value
+        assert compressed.bytes * 5 < plain.bytes
+        assert compressed.stats()['compression'] == codec.compression
+
+    def test_shared_backend_compressed(self, tmp_path, codec):
+        """Shared backends store compressed blobs too"""
+        backend = SQLiteBackend(path=str(tmp_path / "c.db"), codec=codec)
+        backend.set('k', make_entry({'v': 'x' * 1000}))
+        assert backend.get('k').value == {'v': 'x' * 1000}
+        backend.close()
+
+    def test_from_settings(self):
+        """CACHE_COMPRESSION selects the codec of the memory backend"""
+        backend = create_cache_backend(Settings(cache_compression="zlib", cache_compression_level=1))
+        assert backend.codec.compression == "zlib"
+        assert backend.codec.level == 1
+
+    def test_unknown_compression_rejected(self):
+        """Typos in the compression name fail loudly"""
+        with pytest.raises(ValueError):
+            EntryCodec("lz4")
+
+
+class TestAdaptiveTTL:
+    """Popularity-adaptive TTLs"""
+
+    def test_one_off_key_gets_minimum(self):
+        """A key read once is cached for the endpoint minimum"""
+        policy = AdaptiveTTL({'search': (60, 600)})
+        policy.record_access('k')
+        assert policy.ttl_for('search', 'k', {'articles': [1]}) == 60
+
+    def test_hot_key_gets_longer_ttl(self):
+        """TTL grows with reads per lifetime, up to the maximum"""
+        policy = AdaptiveTTL({'headlines': (100, 1000)})
+        for _ in range(8):
+            policy.record_access('hot')
+        assert policy.ttl_for('headlines', 'hot', {'v': 1}) == 400
+
+        for _ in range(10000):
+            policy.record_access('hot')
+        assert policy.ttl_for('headlines', 'hot', {'v': 2}) == 1000
+
+    def test_unchanged_content_extends_ttl(self):
+        """Refreshes returning the same content double the TTL"""
+        policy = AdaptiveTTL({'headlines': (100, 1000)})
+        ttls = [policy.ttl_for('headlines', 'k', {'v': 1}) for _ in range(5)]
+        assert ttls == [100, 200, 400, 800, 800]
+        assert policy.ttl_for('headlines', 'k', {'v': 2}) == 100
+
+    def test_unbounded_endpoint_uses_default(self):
+        """Endpoints without bounds keep the default TTL"""
+        policy = AdaptiveTTL({'search': (60, 600)}, default_ttl=180)
+        assert policy.ttl_for('headlines', 'k', {}) == 180
+
+    def test_cache_applies_policy_and_reports_distribution(self):
+        """NewsCache stores entries with the policy TTL and reports it"""
+        cache = NewsCache(ttl=180, stale_ttl=1800, ttl_policy=AdaptiveTTL({'search': (60, 600)}))
+        for _ in range(4):
+            cache.get_entry('search', {'q': 'hot'})
+        cache.set('search', {'q': 'hot'}, {'v': 1})
+        cache.get_entry('search', {'q': 'rare'})
+        cache.set('search', {'q': 'rare'}, {'v': 1})
+
+        hot = cache.peek('search', {'q': 'hot'})
+        assert hot.fresh_until - hot.stored_at == pytest.approx(180)
+        assert hot.expires_at - hot.stored_at == pytest.approx(1800)
+
+        stats = cache.stats()
+        assert stats['ttl_distribution']['search'] == {
+            'count': 2, 'min': 60, 'median': 120.0, 'max': 180, 'mean': 120.0
+        }
+        assert stats['tracked_keys'] == 2
+
+    def test_tracked_keys_bounded(self):
+        """Only the most recently used keys keep statistics"""
+        policy = AdaptiveTTL({}, max_keys=3)
+        for i in range(10):
+            policy.record_access(f'k{i}')
+        assert policy.tracked_keys() == 3
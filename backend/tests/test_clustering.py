@@ -0,0 +1,134 @@
+"""
+Unit tests for incremental story clustering
+"""
+import json
+
+from backend.services.clustering import StoryClusterer
+
+FED = [
+    ('Fed raises interest rates by a quarter point',
+     'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.', 'AP'),
+    ('Federal Reserve hikes rates again amid inflation worries',
+     'US central bank lifts benchmark interest rate a quarter point as inflation persists.', 'Reuters'),
+    ('Fed lifts interest rates, signals more hikes',
+     'The Federal Reserve raised rates by a quarter point and signaled more increases to fight inflation.', 'CNN'),
+]
+OTHER = [
+    ('Local team wins championship in overtime',
+     'The home team clinched the title in a dramatic overtime win on Sunday night.', 'ESPN'),
+    ('New smartphone unveiled with bigger battery',
+     'The company showed off its latest phone with a larger battery and faster chip.', 'Verge'),
+]
+
+
+def make_article(n, title, description, source='Example', published='2024-01-15T10:00:00Z', **extra):
+    """Encoded article as cached by the service"""
+    return json.dumps({
+        'source': {'id': None, 'name': source},
+        'author': None,
+        'title': title,
+        'description': description,
+        'url': f'https://example.com/{n}',
+        'urlToImage': None,
+        'publishedAt': published,
+        'content': None,
+        **extra
+    })
+
+
+def stories(clusterer):
+    """Titles of every story's members"""
+    return sorted(
+        sorted(json.loads(body)['title'] for _, _, _, body in story.members)
+        for story in clusterer._rows.values()
+    )
+
+
+class TestStoryClusterer:
+    """Clustering, ranking and expiry"""
+
+    def test_related_articles_grouped(self):
+        """Articles about one story share a cluster; others stay apart"""
+        clusterer = StoryClusterer()
+        articles = [make_article(i, title, description, source) for i, (title, description, source) in
+                    enumerate(FED[:1] + OTHER[:1] + FED[1:] + OTHER[1:])]
+        assert clusterer.add(articles, now=0) == 5
+
+        assert stories(clusterer) == [
+            sorted(title for title, _, _ in FED),
+            [OTHER[0][0]],
+            [OTHER[1][0]]
+        ]
+
+    def test_clusters_ranked_with_sources_and_representative(self):
+        """Largest stories first, each with its sources and a member article"""
+        clusterer = StoryClusterer()
+        clusterer.add([
+            make_article(i, title, description, source, published=f'2024-01-15T1{i}:00:00Z')
+            for i, (title, description, source) in enumerate(FED + OTHER)
+        ], now=0)
+
+        total, clusters = clusterer.clusters(now=0)
+        assert total == 1
+        story = clusters[0]
+        assert story['size'] == 3
+        assert story['sources'] == ['AP', 'Reuters', 'CNN']
+        assert story['latestPublishedAt'] == '2024-01-15T12:00:00Z'
+        assert story['article']['title'] in [title for title, _, _ in FED]
+
+        total, clusters = clusterer.clusters(min_size=1, limit=2, now=0)
+        assert total == 3
+        assert [c['size'] for c in clusters] == [3, 1]
+
+    def test_size_counts_collapsed_duplicates(self):
+        """Near-duplicates folded into an article count towards its story"""
+        clusterer = StoryClusterer()
+        clusterer.add([make_article(0, *FED[0], duplicates=4)], now=0)
+
+        _, clusters = clusterer.clusters(now=0)
+        assert clusters[0]['size'] == 5
+
+    def test_refetch_not_counted_twice(self):
+        """Re-fetching an article keeps its story alive without growing it"""
+        clusterer = StoryClusterer(window=100)
+        articles = [make_article(i, *fed) for i, fed in enumerate(FED)]
+        clusterer.add(articles, now=0)
+        assert clusterer.add(articles[:1], now=90) == 0
+
+        _, clusters = clusterer.clusters(now=150)
+        assert clusters[0]['size'] == 3
+        assert clusterer.size() == 3
+
+    def test_language_filter(self):
+        """Stories remember the language their first article was fetched for"""
+        clusterer = StoryClusterer()
+        clusterer.add([make_article(i, *fed) for i, fed in enumerate(FED)], {'language': 'en'}, now=0)
+
+        assert clusterer.clusters(language='en', now=0)[0] == 1
+        assert clusterer.clusters(language='de', now=0) == (0, [])
+
+    def test_expiry(self):
+        """Stories without new articles for the window are dropped and their rows reused"""
+        clusterer = StoryClusterer(window=100)
+        clusterer.add([make_article(i, *fed) for i, fed in enumerate(FED)], now=0)
+        clusterer.add([make_article(10, *OTHER[0])], now=60)
+
+        assert clusterer.clusters(min_size=1, now=120)[0] == 1
+        assert clusterer.expire(now=120) == 1
+        assert clusterer.stats() == {'articles': 1, 'stories': 1, 'centroid_entries': clusterer._entries}
+
+        # The expired URLs are new again and the story forms afresh
+        assert clusterer.add([make_article(i, *fed) for i, fed in enumerate(FED)], now=130) == 3
+        _, clusters = clusterer.clusters(now=130)
+        assert clusters[0]['size'] == 3
+        assert clusterer._used == 2
+
+    def test_repeated_expiry_skips_free_rows(self):
+        """Rows freed by one sweep are not expired again by the next"""
+        clusterer = StoryClusterer(window=100)
+        clusterer.add([make_article(0, *FED[0]), make_article(1, *OTHER[0])], now=0)
+        clusterer.add([make_article(2, *OTHER[1])], now=150)
+
+        assert clusterer.expire(now=150) == 2
+        assert clusterer.expire(now=151) == 0
+        assert clusterer.stats()['stories'] == 1
@@ -0,0 +1,87 @@
+"""
+Unit tests for MinHash-LSH near-duplicate detection
+"""
+from backend.utils.dedup import (
+    NUM_HASHES,
+    MinHashLSH,
+    article_signature,
+    collapse,
+    pack,
+    signature,
+    similarity,
+    unpack
+)
+
+WIRE = ('The Federal Reserve raised its benchmark rate on Wednesday, citing persistent '
+        'inflation and a strong labor market.')
+
+
+class TestSignatures:
+    """MinHash signatures and similarity estimates"""
+
+    def test_similar_texts(self):
+        """Small edits keep the estimate high; unrelated texts score low"""
+        story = article_signature('Fed raises interest rates by a quarter point', WIRE, None)
+        copy = article_signature('Fed raises interest rates by a quarter point - Reuters', WIRE, 'Fed [+120 chars]')
+        other = article_signature(
+            'Local team wins championship', 'The home team clinched the title in overtime on Sunday night.', None
+        )
+        assert len(story) == NUM_HASHES
+        assert similarity(story, copy) > 0.8
+        assert similarity(story, other) < 0.3
+
+    def test_folding_and_truncation_marker(self):
+        """Case, accents and NewsAPI's truncation marker do not matter"""
+        text = 'Café owners in São Paulo protest new rules on outdoor seating this summer'
+        assert signature(text) == signature(text.upper())
+        assert article_signature('T', text, 'Owners [+2048 chars]') == article_signature('T', text, 'Owners')
+
+    def test_short_texts_unsigned(self):
+        """Texts too short for a reliable estimate get no signature"""
+        assert signature('Article 5') == ()
+        assert similarity((), ()) == 0.0
+
+    def test_pack_roundtrip(self):
+        """Signatures survive serialization"""
+        value = signature(WIRE)
+        assert unpack(pack(value)) == value
+
+
+class TestMinHashLSH:
+    """Banded lookup and collapsing"""
+
+    def test_band_layout_follows_threshold(self):
+        """Stricter thresholds use longer bands"""
+        assert MinHashLSH(0.5).rows < MinHashLSH(0.7).rows < MinHashLSH(0.9).rows
+        lsh = MinHashLSH(0.7)
+        assert lsh.rows * lsh.bands <= NUM_HASHES
+
+    def test_find(self):
+        """Only entries at or above the threshold match"""
+        lsh = MinHashLSH(0.7)
+        lsh.add(article_signature('Fed raises interest rates by a quarter point', WIRE, None), 'fed')
+        assert lsh.find(article_signature('Fed raises rates by a quarter point', WIRE, None)) == 'fed'
+        assert lsh.find(signature('Local team wins championship after dramatic overtime win on Sunday')) is None
+        assert lsh.find(()) is None
+
+    def test_remove(self):
+        """Removed entries are no longer found"""
+        lsh = MinHashLSH(0.7)
+        value = article_signature('Fed raises interest rates by a quarter point', WIRE, None)
+        lsh.add(value, 'fed')
+        lsh.remove(value, 'fed')
+        assert lsh.find(value) is None
+        assert all(not table for table in lsh._tables)
+
+    def test_collapse(self):
+        """The first copy of each story is kept, with its duplicates"""
+        items = [
+            (article_signature('Fed raises rates', WIRE, None), 'ap'),
+            (article_signature('Local team wins', 'Fans celebrated downtown after the dramatic win', None), 'sports'),
+            (article_signature('Fed raises rates - Reuters', WIRE, None), 'reuters'),
+            ((), 'short'),
+            ((), 'short-2'),
+        ]
+        assert collapse(items, 0.7) == [
+            ('ap', ['reuters']), ('sports', []), ('short', []), ('short-2', [])
+        ]
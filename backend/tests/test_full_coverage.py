@@ -3,11 +3,26 @@ Additional tests to achieve 100% coverage
 Covers the remaining 4 untested lines
 """
 import pytest
+from contextlib import contextmanager
 from unittest.mock import patch, AsyncMock, MagicMock
 import subprocess
 import sys
 
 
+@contextmanager
+def override_news_service():
+    """Temporarily replace the NewsAPIService dependency with a mock"""
+    from backend.main import app
+    from backend.services.news_api import get_news_service
+
+    mock_service = AsyncMock()
+    app.dependency_overrides[get_news_service] = lambda: mock_service
+    try:
+        yield mock_service
+    finally:
+        app.dependency_overrides.pop(get_news_service, None)
+
+
 class TestMainEntryPoint:
     """Test the __main__ entry point"""
 
@@ -115,7 +130,7 @@ class TestNewsAPIServiceAdditional:
         assert 'size' in stats
         assert 'max_size' in stats
         assert 'ttl_seconds' in stats
-        assert stats['max_size'] == 100
+        assert stats['max_size'] == service.settings.cache_max_entries
         assert stats['ttl_seconds'] == 180
 
     @pytest.mark.asyncio
@@ -138,7 +153,7 @@ class TestNewsAPIServiceAdditional:
 
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_response
             )
             mock_client.return_value = mock_instance
@@ -152,7 +167,7 @@ class TestNewsAPIServiceAdditional:
             assert result2.status == 'ok'
 
             # Verify cache was used (API called only once)
-            assert mock_instance.__aenter__.return_value.get.call_count == 1
+            assert mock_instance.get.call_count == 1
 
 
 class TestCacheImplementation:
@@ -181,6 +196,31 @@ class TestCacheImplementation:
         result = cache.get('test', {'key': 'value'})
         assert result is None
 
+    def test_cache_soft_and_hard_ttl(self):
+        """Stale entries stay available via get_entry until the hard TTL"""
+        from backend.utils.cache import NewsCache
+        import time
+
+        cache = NewsCache(ttl=0.1, maxsize=10, stale_ttl=0.4)
+        cache.set('test', {'key': 'value'}, {'data': 'test'})
+
+        entry = cache.get_entry('test', {'key': 'value'})
+        assert not entry.is_stale
+
+        time.sleep(0.15)
+
+        # Past the soft TTL: get() misses, get_entry() returns the stale value
+        assert cache.get('test', {'key': 'value'}) is None
+        entry = cache.get_entry('test', {'key': 'value'})
+        assert entry.is_stale
+        assert entry.value == {'data': 'test'}
+        assert entry.age >= 0.1
+
+        time.sleep(0.3)
+
+        # Past the hard TTL: gone
+        assert cache.get_entry('test', {'key': 'value'}) is None
+
 
 class TestIntegrationFullPath:
     """Integration tests for full request/response paths"""
@@ -190,13 +230,13 @@ class TestIntegrationFullPath:
         """Test headlines endpoint with all possible parameters"""
         from fastapi.testclient import TestClient
         from backend.main import app
-        from unittest.mock import patch, AsyncMock
+        from unittest.mock import AsyncMock
         from backend.models.article import NewsResponse
+        from backend.tests.helpers import news_result
 
         client = TestClient(app)
 
-        with patch('backend.routers.headlines.NewsAPIService') as mock_service_class:
-            mock_service = AsyncMock()
+        with override_news_service() as mock_service:
             mock_response = NewsResponse(
                 status='ok',
                 totalResults=100,
@@ -205,8 +245,7 @@ class TestIntegrationFullPath:
                 totalPages=5,
                 articles=[]
             )
-            mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-            mock_service_class.return_value = mock_service
+            mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
             response = client.get('/api/headlines?country=us&category=technology&page=2&page_size=20')
             assert response.status_code == 200
@@ -218,13 +257,13 @@ class TestIntegrationFullPath:
         """Test search endpoint with all possible parameters"""
         from fastapi.testclient import TestClient
         from backend.main import app
-        from unittest.mock import patch, AsyncMock
+        from unittest.mock import AsyncMock
         from backend.models.article import NewsResponse
+        from backend.tests.helpers import news_result
 
         client = TestClient(app)
 
-        with patch('backend.routers.search.NewsAPIService') as mock_service_class:
-            mock_service = AsyncMock()
+        with override_news_service() as mock_service:
             mock_response = NewsResponse(
                 status='ok',
                 totalResults=50,
@@ -233,8 +272,7 @@ class TestIntegrationFullPath:
                 totalPages=4,
                 articles=[]
             )
-            mock_service.search_news = AsyncMock(return_value=mock_response)
-            mock_service_class.return_value = mock_service
+            mock_service.search_news_result = AsyncMock(return_value=news_result(mock_response))
 
             response = client.get(
                 '/api/search?q=test&language=en&from=2024-01-01&to=2024-01-31&sortBy=relevancy&page=1&page_size=15'
@@ -0,0 +1,101 @@
+"""
+Unit tests for the background ingestion worker
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.ingest import IngestWorker, _main, parse_sources
+from backend.services.news_api import NewsAPIService
+from backend.utils.quota import QuotaTracker
+
+
+class TestParseSources:
+    """Ingestion source specifications"""
+
+    def test_targets_and_queries(self):
+        """Headline targets and searches are canonicalized and deduplicated"""
+        sources = parse_sources(['us', 'US:Technology'], ['Climate', 'climate'], language='EN')
+        assert sources == [
+            ('headlines', {'country': 'us', 'category': None}),
+            ('headlines', {'country': 'us', 'category': 'technology'}),
+            ('search', {'q': 'climate', 'language': 'en', 'from': None, 'to': None, 'sortBy': 'publishedAt'})
+        ]
+
+
+@pytest.mark.asyncio
+class TestIngestWorker:
+    """Deduplicated, batched ingestion"""
+
+    @pytest.fixture
+    def service(self, mock_news_response):
+        """Service whose upstream always answers with mock_news_response"""
+        service = NewsAPIService()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = mock_news_response
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+            yield service
+
+    async def test_cycle_deduplicates_and_batches(self, service):
+        """Articles seen under several sources are written once, in one batch"""
+        writes = []
+        service.add_article_listener(lambda articles, params: writes.append((len(articles), params)))
+        worker = IngestWorker(service, parse_sources(['us', 'gb'], ['test'], 'en'))
+
+        stats = await worker.run_once()
+        assert service.client.get.call_count == 3
+        assert stats['sources'] == 3
+        assert stats['fetched'] == 6
+        assert stats['new'] == 2
+        assert stats['duplicates'] == 4
+        assert stats['max_lag_seconds'] > 0
+        # One write per language, not one per fetched window
+        assert writes == [(2, {'language': None})]
+        assert service.article_store.size() == 2
+
+        # Unchanged articles are not written again
+        stats = await worker.run_once()
+        assert stats['new'] == 0
+        assert len(writes) == 1
+        assert worker.stats()['cycles'] == 2
+
+    async def test_batch_size(self, service):
+        """Full batches are written before the end of the cycle"""
+        writes = []
+        service.add_article_listener(lambda articles, params: writes.append(len(articles)))
+        worker = IngestWorker(service, parse_sources(['us'], []), batch_size=1)
+
+        await worker.run_once()
+        assert writes == [2]
+
+    async def test_changed_article_rewritten(self, service, mock_news_response):
+        """A changed article at a known URL is ingested again"""
+        worker = IngestWorker(service, parse_sources(['us'], []))
+        await worker.run_once()
+
+        changed = json.loads(json.dumps(mock_news_response))
+        changed['articles'][0]['title'] = 'Updated title'
+        service.client.get.return_value.json.return_value = changed
+        stats = await worker.run_once()
+        assert stats['new'] == 1
+        assert stats['duplicates'] == 1
+
+    async def test_stops_at_background_reserve(self, service):
+        """Ingestion leaves the reserved budget to user-facing requests"""
+        service.quota = QuotaTracker(limit=4, background_reserve=2, safety_margin=1)
+        worker = IngestWorker(service, parse_sources(['us', 'gb', 'de'], []))
+
+        stats = await worker.run_once()
+        assert stats['sources'] == 1
+        assert worker.stats()['failures'] == 1
+
+    async def test_standalone_needs_shared_store(self):
+        """The standalone worker will not ingest into a private in-memory store"""
+        with patch('backend.ingest.get_news_service') as get_service:
+            with pytest.raises(SystemExit, match='ARTICLE_STORE_PATH'):
+                await _main(once=True)
+
+        get_service.assert_not_called()
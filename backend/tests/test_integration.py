@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
 from backend.main import app
 from backend.services.news_api import NewsAPIService, NewsAPIError
+from backend.tests.helpers import news_result
 
 
 client = TestClient(app)
@@ -26,14 +27,11 @@ class TestMainApplication:
 class TestErrorCoverage:
     """Tests for error handling paths"""
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_headlines_exception_handling(self, mock_service_class):
+    def test_headlines_exception_handling(self, mock_service):
         """Test generic exception in headlines endpoint"""
-        mock_service = AsyncMock()
-        mock_service.get_top_headlines = AsyncMock(
+        mock_service.get_top_headlines_result = AsyncMock(
             side_effect=Exception("Unexpected error")
         )
-        mock_service_class.return_value = mock_service
 
         response = client.get('/api/headlines')
         assert response.status_code == 500
@@ -41,14 +39,11 @@ class TestErrorCoverage:
         assert 'detail' in data
         assert data['detail']['error'] == 'INTERNAL_ERROR'
 
-    @patch('backend.routers.search.NewsAPIService')
-    def test_search_exception_handling(self, mock_service_class):
+    def test_search_exception_handling(self, mock_service):
         """Test generic exception in search endpoint"""
-        mock_service = AsyncMock()
-        mock_service.search_news = AsyncMock(
+        mock_service.search_news_result = AsyncMock(
             side_effect=Exception("Unexpected error")
         )
-        mock_service_class.return_value = mock_service
 
         response = client.get('/api/search?q=test')
         assert response.status_code == 500
@@ -70,7 +65,7 @@ class TestNewsAPIServiceCoverage:
 
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_response
             )
             mock_client.return_value = mock_instance
@@ -111,7 +106,7 @@ class TestNewsAPIServiceCoverage:
 
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_response
             )
             mock_client.return_value = mock_instance
@@ -230,12 +225,10 @@ class TestAPIEndpointsWithRealServer:
 class TestEdgeCases:
     """Test edge cases and boundary conditions"""
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_headlines_with_maximum_page_size(self, mock_service_class):
+    def test_headlines_with_maximum_page_size(self, mock_service):
         """Test headlines with maximum allowed page size"""
         from backend.models.article import NewsResponse
 
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=500,
@@ -244,8 +237,7 @@ class TestEdgeCases:
             totalPages=5,
             articles=[]
         )
-        mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/headlines?page_size=100')
         assert response.status_code == 200
@@ -254,12 +246,10 @@ class TestEdgeCases:
         page_size = data.get('page_size') or data.get('pageSize')
         assert page_size == 100
 
-    @patch('backend.routers.search.NewsAPIService')
-    def test_search_with_special_characters(self, mock_service_class):
+    def test_search_with_special_characters(self, mock_service):
         """Test search with special characters in query"""
         from backend.models.article import NewsResponse
 
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=10,
@@ -268,8 +258,7 @@ class TestEdgeCases:
             totalPages=1,
             articles=[]
         )
-        mock_service.search_news = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.search_news_result = AsyncMock(return_value=news_result(mock_response))
 
         # Test with special characters
         response = client.get('/api/search?q=test%20query%20%26%20more')
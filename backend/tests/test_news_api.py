@@ -1,6 +1,7 @@
 """
 Unit tests for NewsAPI service
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from backend.services.news_api import NewsAPIService, NewsAPIError
@@ -14,7 +15,10 @@ class TestNewsAPIService:
     @pytest.fixture
     def service(self):
         """Create a NewsAPIService instance"""
-        return NewsAPIService()
+        service = NewsAPIService()
+        # Retries still happen, just without waiting between attempts
+        service.retry_backoff_base = 0
+        return service
 
     @pytest.fixture
     def mock_successful_response(self, mock_news_response):
@@ -28,7 +32,7 @@ class TestNewsAPIService:
         """Test successful fetch of top headlines"""
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_successful_response
             )
             mock_client.return_value = mock_instance
@@ -45,7 +49,7 @@ class TestNewsAPIService:
         """Test headlines with category filter"""
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_successful_response
             )
             mock_client.return_value = mock_instance
@@ -65,7 +69,7 @@ class TestNewsAPIService:
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
             mock_get = AsyncMock(return_value=mock_successful_response)
-            mock_instance.__aenter__.return_value.get = mock_get
+            mock_instance.get = mock_get
             mock_client.return_value = mock_instance
 
             # First call - should hit API
@@ -81,7 +85,7 @@ class TestNewsAPIService:
         """Test successful news search"""
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_successful_response
             )
             mock_client.return_value = mock_instance
@@ -112,7 +116,7 @@ class TestNewsAPIService:
 
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_response
             )
             mock_client.return_value = mock_instance
@@ -130,7 +134,7 @@ class TestNewsAPIService:
 
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 return_value=mock_response
             )
             mock_client.return_value = mock_instance
@@ -144,7 +148,7 @@ class TestNewsAPIService:
         """Test handling of network timeout"""
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 side_effect=httpx.TimeoutException("Request timeout")
             )
             mock_client.return_value = mock_instance
@@ -158,7 +162,7 @@ class TestNewsAPIService:
         """Test handling of network errors"""
         with patch('httpx.AsyncClient') as mock_client:
             mock_instance = AsyncMock()
-            mock_instance.__aenter__.return_value.get = AsyncMock(
+            mock_instance.get = AsyncMock(
                 side_effect=httpx.RequestError("Network error")
             )
             mock_client.return_value = mock_instance
@@ -168,6 +172,806 @@ class TestNewsAPIService:
 
             assert 'Network error' in str(exc_info.value)
 
+    async def test_client_reused_across_requests(self, service, mock_successful_response):
+        """The pooled HTTP client is built once and reused"""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            await service.get_top_headlines(country='us')
+            await service.get_top_headlines(country='gb')
+            await service.search_news(query='bitcoin')
+
+            assert mock_client.call_count == 1
+            assert mock_instance.get.call_count == 3
+
+    async def test_client_built_from_settings(self, service):
+        """Pool limits and split timeouts come from Settings"""
+        with patch('httpx.AsyncClient') as mock_client:
+            service.client
+
+        kwargs = mock_client.call_args.kwargs
+        settings = service.settings
+        assert kwargs['limits'].max_connections == settings.http_max_connections
+        assert kwargs['limits'].max_keepalive_connections == settings.http_max_keepalive_connections
+        assert kwargs['limits'].keepalive_expiry == settings.http_keepalive_expiry
+        assert kwargs['timeout'].connect == settings.http_connect_timeout
+        assert kwargs['timeout'].read == settings.http_read_timeout
+        assert kwargs['timeout'].pool == settings.http_pool_timeout
+
+    async def test_aclose_releases_client(self, service):
+        """aclose() closes the client and the service refuses further use"""
+        client = service.client
+        await service.aclose()
+
+        assert client.is_closed
+        with pytest.raises(RuntimeError):
+            service.client
+        await service.aclose()
+
+    async def test_no_publishing_after_close(self, service):
+        """Articles arriving after shutdown never reach the listeners"""
+        received = []
+        service.add_article_listener(lambda articles, params: received.append(articles))
+        await service.aclose()
+
+        service.publish_articles(['{}'], {})
+        assert received == []
+        assert service._publisher is None
+
+    async def test_concurrent_misses_coalesced(self, service, mock_successful_response):
+        """Concurrent identical requests share one upstream call"""
+        import asyncio
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return mock_successful_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=slow_get)
+            mock_client.return_value = mock_instance
+
+            results = await asyncio.gather(*[
+                service.get_top_headlines(country='us', category='sports')
+                for _ in range(5)
+            ])
+
+            assert mock_instance.get.call_count == 1
+            assert all(r.total_results == 38 for r in results)
+
+        stats = service.get_cache_stats()
+        assert stats['upstream_calls'] == 1
+        assert stats['coalesced_calls'] == 4
+
+    async def test_coalesced_callers_share_error(self, service):
+        """An upstream failure is raised to every coalesced caller"""
+        import asyncio
+
+        async def failing_get(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            raise httpx.RequestError("Network error")
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=failing_get)
+            mock_client.return_value = mock_instance
+
+            results = await asyncio.gather(
+                *[service.search_news(query='bitcoin') for _ in range(3)],
+                return_exceptions=True
+            )
+
+            # One request (with its retries) shared by all callers
+            assert mock_instance.get.call_count == service.retries + 1
+            assert all(isinstance(r, NewsAPIError) for r in results)
+
+        # Nothing left in flight, so a retry goes upstream again
+        assert service._inflight.in_flight() == 0
+
+    async def test_stale_entry_served_while_refreshing(self, service, mock_successful_response):
+        """Stale entries are returned immediately and refreshed in the background"""
+        import asyncio
+        from backend.utils.cache import NewsCache
+
+        service.cache = NewsCache(ttl=0.05, stale_ttl=5)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            first = await service.get_top_headlines_result(country='us')
+            assert first.cache_status == 'MISS'
+            assert (await service.get_top_headlines_result(country='us')).cache_status == 'HIT'
+
+            await asyncio.sleep(0.06)
+            stale = await service.get_top_headlines_result(country='us')
+            assert stale.cache_status == 'STALE'
+            assert stale.response.total_results == 38
+
+            # Let the background refresh finish
+            await asyncio.gather(*service._background)
+            assert mock_instance.get.call_count == 2
+            assert (await service.get_top_headlines_result(country='us')).cache_status == 'HIT'
+
+    async def test_stale_entry_survives_failed_refresh(self, service, mock_successful_response):
+        """A failing refresh keeps the stale entry in service"""
+        import asyncio
+        from backend.utils.cache import NewsCache
+
+        service.cache = NewsCache(ttl=0.05, stale_ttl=5)
+        rate_limited = MagicMock()
+        rate_limited.status_code = 429
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=[
+                mock_successful_response, rate_limited, rate_limited
+            ])
+            mock_client.return_value = mock_instance
+
+            await service.search_news(query='bitcoin')
+            await asyncio.sleep(0.06)
+
+            for _ in range(2):
+                result = await service.search_news_result(query='bitcoin')
+                assert result.cache_status == 'STALE'
+                assert len(result.response.articles) == 2
+                await asyncio.gather(*service._background)
+
+            # The 429 puts the quota into cooldown, so the second refresh
+            # does not reach NewsAPI at all
+            assert mock_instance.get.call_count == 2
+            assert service.get_quota_status()['cache_only']
+
+    async def test_aclose_cancels_background_refresh(self, service):
+        """Shutdown cancels pending background refreshes"""
+        import asyncio
+
+        async def never_finishes():
+            await asyncio.sleep(60)
+
+        service._refresh_in_background('key', never_finishes)
+        assert len(service._background) == 1
+        # Let the refresh start its shielded fetch
+        await asyncio.sleep(0)
+        assert service._inflight.in_flight() == 1
+
+        await service.aclose()
+        await asyncio.sleep(0)
+        assert len(service._background) == 0
+        assert service._inflight.in_flight() == 0
+
+    @staticmethod
+    def _window_response(total, count, start=0):
+        """Mock NewsAPI response with `count` numbered articles"""
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            'status': 'ok',
+            'totalResults': total,
+            'articles': [
+                {
+                    'source': {'id': None, 'name': 'Source'},
+                    'title': f'Article {start + i}',
+                    'url': f'https://example.com/{start + i}',
+                    'publishedAt': '2024-01-15T10:30:00Z'
+                }
+                for i in range(count)
+            ]
+        }
+        return response
+
+    async def test_pages_sliced_from_one_window(self, service):
+        """Different page/page_size combinations share one upstream window"""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=self._window_response(100, 100))
+            mock_client.return_value = mock_instance
+
+            page1 = await service.get_top_headlines(country='us', page=1, page_size=10)
+            page2 = await service.get_top_headlines(country='us', page=2, page_size=10)
+            page3 = await service.get_top_headlines(country='us', page=3, page_size=25)
+
+            assert mock_instance.get.call_count == 1
+            params = mock_instance.get.call_args.kwargs['params']
+            assert params['page'] == 1
+            assert params['pageSize'] == 100
+
+        assert [a.title for a in page1.articles] == [f'Article {i}' for i in range(10)]
+        assert [a.title for a in page2.articles] == [f'Article {i}' for i in range(10, 20)]
+        assert [a.title for a in page3.articles] == [f'Article {i}' for i in range(50, 75)]
+        assert page1.total_pages == 10
+        assert page3.total_pages == 4
+
+    async def test_page_spanning_two_windows(self, service):
+        """A page crossing a window boundary is stitched from both windows"""
+        service.window_size = 20
+        service.max_results = 0
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=[
+                self._window_response(60, 20, start=0),
+                self._window_response(60, 20, start=20)
+            ])
+            mock_client.return_value = mock_instance
+
+            result = await service.search_news(query='bitcoin', page=2, page_size=15)
+
+            assert mock_instance.get.call_count == 2
+
+        assert [a.title for a in result.articles] == [f'Article {i}' for i in range(15, 30)]
+        assert result.total_pages == 4
+
+    async def test_pages_beyond_result_cap_skip_upstream(self, service):
+        """Pages past the upstream result cap are empty, not extra requests"""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=self._window_response(500, 100))
+            mock_client.return_value = mock_instance
+
+            first = await service.search_news(query='bitcoin', page=1, page_size=10)
+            beyond = await service.search_news(query='bitcoin', page=11, page_size=10)
+
+            assert mock_instance.get.call_count == 1
+
+        assert first.total_results == 500
+        assert first.total_pages == 10
+        assert beyond.articles == []
+
+    async def test_near_duplicates_collapsed(self, service):
+        """Wire copies from other sources are merged into the first one"""
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.'
+        response = self._window_response(3, 3)
+        articles = response.json.return_value['articles']
+        articles[0].update(title='Fed raises rates', description=wire)
+        articles[2].update(title='Fed raises rates - Reuters', description=wire)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            result = await service.get_top_headlines(country='us', page=1, page_size=10)
+
+        assert [(a.title, a.duplicates) for a in result.articles] == [
+            ('Fed raises rates', 1), ('Article 1', 0)
+        ]
+
+    async def test_collapsed_window_counts_served_articles(self, service):
+        """A single collapsed window reports the articles it can serve"""
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.'
+        response = self._window_response(12, 12)
+        for article in response.json.return_value['articles'][:3]:
+            article.update(title='Fed raises rates', description=wire)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            first = await service.get_top_headlines(country='us', page=1, page_size=5)
+            last = await service.get_top_headlines(country='us', page=2, page_size=5)
+
+        assert first.total_results == 10
+        assert first.total_pages == 2
+        assert [a.title for a in last.articles] == [f'Article {i}' for i in range(7, 12)]
+
+    async def test_collapsed_windows_fill_pages(self, service):
+        """Pages after a collapsed window are filled from the next one"""
+        service.window_size = 20
+        service.max_results = 0
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.'
+        first_window = self._window_response(40, 20, start=0)
+        for article in first_window.json.return_value['articles'][:3]:
+            article.update(title='Fed raises rates', description=wire)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=[
+                first_window,
+                self._window_response(40, 20, start=20)
+            ])
+            mock_client.return_value = mock_instance
+
+            pages = [
+                await service.search_news(query='bitcoin', page=page, page_size=8)
+                for page in range(1, 6)
+            ]
+
+        titles = [a.title for page in pages for a in page.articles]
+        assert [len(page.articles) for page in pages] == [8, 8, 8, 8, 6]
+        assert len(set(titles)) == 38
+        assert titles[-1] == 'Article 39'
+        assert pages[-1].total_results == 38
+        assert pages[-1].total_pages == 5
+
+    async def test_total_pages_match_served_pages(self, service):
+        """Every page promised by totalPages has articles"""
+        service.max_results = 100
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.'
+        response = self._window_response(5000, 100)
+        for article in response.json.return_value['articles'][::2]:
+            article.update(title='Fed raises rates', description=wire)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            first = await service.search_news(query='bitcoin', page=1, page_size=10)
+            pages = [
+                await service.search_news(query='bitcoin', page=page, page_size=10)
+                for page in range(1, 11)
+            ]
+
+            assert mock_instance.get.call_count == 1
+
+        served = [page for page in pages if page.articles]
+        assert first.total_pages == len(served) == 6
+        assert all(page.total_pages == 6 for page in pages)
+
+    async def test_encoded_body_matches_model_serialization(self, service, mock_successful_response):
+        """Pre-encoded bodies are identical to serializing the NewsResponse"""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            result = await service.get_top_headlines_result(country='us', page=1, page_size=10)
+
+        expected = service._transform_response(
+            mock_successful_response.json.return_value, 1, 10
+        )
+        assert result.body == expected.model_dump_json(by_alias=True).encode()
+        assert result.response == expected
+
+    async def test_cache_hit_skips_validation(self, service, mock_successful_response):
+        """Articles are validated once on the miss path, never on hits"""
+        from backend.services import news_api
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            with patch.object(
+                news_api._ARTICLES, 'validate_python',
+                wraps=news_api._ARTICLES.validate_python
+            ) as validate:
+                miss = await service.search_news_result(query='bitcoin')
+                hit = await service.search_news_result(query='bitcoin')
+
+            assert validate.call_count == 1
+
+        assert miss.cache_status == 'MISS'
+        assert hit.cache_status == 'HIT'
+        assert hit.body == miss.body
+
+    async def test_quota_switches_to_cache_only(self, service, mock_successful_response):
+        """User misses stop before the limit; cached pages keep working"""
+        from backend.services.news_api import QuotaExhaustedError
+        from backend.utils.quota import QuotaTracker
+
+        service.quota = QuotaTracker(limit=4, background_reserve=1, safety_margin=1)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            for country in ('us', 'gb', 'de'):
+                await service.get_top_headlines(country=country)
+
+            with pytest.raises(QuotaExhaustedError):
+                await service.get_top_headlines(country='fr')
+
+            # Already cached: still served
+            assert (await service.get_top_headlines_result(country='us')).cache_status == 'HIT'
+            assert mock_instance.get.call_count == 3
+
+        status = service.get_quota_status()
+        assert status['used'] == 3
+        assert status['remaining'] == 1
+        assert status['cache_only']
+
+    async def test_background_refresh_yields_to_users(self, service, mock_successful_response):
+        """Background refreshes stop while user misses still have budget"""
+        import asyncio
+        from backend.utils.cache import NewsCache
+        from backend.utils.quota import QuotaTracker
+
+        service.cache = NewsCache(ttl=0.05, stale_ttl=5)
+        service.quota = QuotaTracker(limit=4, background_reserve=2, safety_margin=0)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            await service.get_top_headlines(country='us')
+            await service.get_top_headlines(country='gb')
+            await asyncio.sleep(0.06)
+
+            # Stale: the refresh would need budget reserved for users
+            assert (await service.get_top_headlines_result(country='us')).cache_status == 'STALE'
+            await asyncio.gather(*service._background)
+            assert mock_instance.get.call_count == 2
+
+            # A user-facing miss may still use the reserve
+            await service.get_top_headlines(country='de')
+            assert mock_instance.get.call_count == 3
+
+    async def test_transient_errors_retried(self, service, mock_successful_response):
+        """Timeouts and 5xx responses are retried, each attempt counted"""
+        error_response = MagicMock()
+        error_response.status_code = 503
+        error_response.json.return_value = {'message': 'Service unavailable'}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=[
+                httpx.TimeoutException("Timeout"),
+                error_response,
+                mock_successful_response
+            ])
+            mock_client.return_value = mock_instance
+
+            result = await service.get_top_headlines(country='us')
+
+            assert result.total_results == 38
+            assert mock_instance.get.call_count == 3
+            assert service.get_quota_status()['used'] == 3
+            assert service.breaker.failures == 0
+
+    async def test_client_errors_not_retried(self, service):
+        """A 4xx response is final and does not count as an outage"""
+        error_response = MagicMock()
+        error_response.status_code = 400
+        error_response.json.return_value = {'message': 'Bad parameter'}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=error_response)
+            mock_client.return_value = mock_instance
+
+            with pytest.raises(NewsAPIError, match="Bad parameter"):
+                await service.search_news(query='bitcoin')
+
+            assert mock_instance.get.call_count == 1
+            assert service.breaker.failures == 0
+
+    async def test_circuit_opens_and_fails_fast(self, service):
+        """Repeated failures open the circuit; later misses skip the network"""
+        from backend.services.news_api import CircuitOpenError
+        from backend.utils.resilience import CircuitBreaker
+
+        service.retries = 0
+        service.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+            mock_client.return_value = mock_instance
+
+            for query in ('one', 'two'):
+                with pytest.raises(NewsAPIError, match="Network error"):
+                    await service.search_news(query=query)
+
+            with pytest.raises(CircuitOpenError):
+                await service.search_news(query='three')
+
+            assert mock_instance.get.call_count == 2
+            assert service.get_upstream_status()['circuit'] == 'open'
+
+    async def test_open_circuit_serves_stale(self, service, mock_successful_response):
+        """While the circuit is open, stale entries keep being served"""
+        import asyncio
+        from backend.utils.cache import NewsCache
+        from backend.utils.resilience import CircuitBreaker
+
+        service.cache = NewsCache(ttl=0.05, stale_ttl=5)
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            await service.get_top_headlines(country='us')
+            await asyncio.sleep(0.06)
+
+            service.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+            service.breaker.record_failure()
+
+            stale = await service.get_top_headlines_result(country='us')
+            await asyncio.gather(*service._background)
+
+            assert stale.cache_status == 'STALE'
+            assert stale.response.total_results == 38
+            assert mock_instance.get.call_count == 1
+
+    async def test_hedged_request_wins(self, service, mock_successful_response):
+        """A slow call is duplicated and the faster answer is used"""
+        import asyncio
+        from backend.utils.resilience import HedgePolicy
+
+        service.hedge = HedgePolicy(max_rate=1, initial_delay=0.02)
+        calls = []
+
+        async def get(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return mock_successful_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=get)
+            mock_client.return_value = mock_instance
+
+            result = await asyncio.wait_for(service.search_news(query='bitcoin'), timeout=1)
+
+            assert result.total_results == 38
+            assert len(calls) == 2
+            assert service.get_quota_status()['used'] == 2
+            assert service.get_upstream_status()['hedged_requests'] == 1
+
+    async def test_hedge_rate_capped(self, service, mock_successful_response):
+        """Without hedge budget a slow call is simply awaited"""
+        import asyncio
+        from backend.utils.resilience import HedgePolicy
+
+        service.hedge = HedgePolicy(max_rate=0, initial_delay=0.01)
+
+        async def get(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return mock_successful_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=get)
+            mock_client.return_value = mock_instance
+
+            result = await service.search_news(query='bitcoin')
+
+            assert result.total_results == 38
+            assert mock_instance.get.call_count == 1
+            assert service.get_quota_status()['used'] == 1
+
+    async def test_hedge_survives_failed_primary(self, service, mock_successful_response):
+        """If one of the hedged calls fails, the other one's answer is used"""
+        import asyncio
+        from backend.utils.resilience import HedgePolicy
+
+        service.hedge = HedgePolicy(max_rate=1, initial_delay=0.01)
+        calls = []
+
+        async def get(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                raise httpx.ConnectError("Connection reset")
+            await asyncio.sleep(0.1)
+            return mock_successful_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(side_effect=get)
+            mock_client.return_value = mock_instance
+
+            result = await service.search_news(query='bitcoin')
+
+            assert result.total_results == 38
+            assert len(calls) == 2
+
+    async def test_rejected_query_negatively_cached(self, service):
+        """A 400 for a query is remembered, so retries cost nothing upstream"""
+        error_response = MagicMock()
+        error_response.status_code = 400
+        error_response.json.return_value = {
+            'status': 'error', 'code': 'parameterInvalid', 'message': 'Bad date'
+        }
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=error_response)
+            mock_client.return_value = mock_instance
+
+            for _ in range(3):
+                with pytest.raises(NewsAPIError, match="Bad date") as exc_info:
+                    await service.search_news(query='bitcoin', from_date='1999-01-01')
+                assert exc_info.value.status_code == 400
+                assert exc_info.value.code == 'parameterInvalid'
+
+            assert mock_instance.get.call_count == 1
+            assert service.get_cache_stats()['negative_hits'] == 2
+
+    async def test_transient_errors_not_negatively_cached(self, service):
+        """Server errors and rate limits are not remembered"""
+        service.retries = 0
+        error_response = MagicMock()
+        error_response.status_code = 500
+        error_response.json.return_value = {'message': 'Server error'}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=error_response)
+            mock_client.return_value = mock_instance
+
+            for _ in range(2):
+                with pytest.raises(NewsAPIError):
+                    await service.search_news(query='bitcoin')
+
+            assert mock_instance.get.call_count == 2
+
+    async def test_empty_results_cached_briefly(self, service):
+        """Zero-result answers are cached, but only for the negative TTL"""
+        import asyncio
+
+        service.negative_ttl = 0.05
+        empty_response = MagicMock()
+        empty_response.status_code = 200
+        empty_response.json.return_value = {'status': 'ok', 'totalResults': 0, 'articles': []}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=empty_response)
+            mock_client.return_value = mock_instance
+
+            first = await service.search_news_result(query='xyzzy')
+            second = await service.search_news_result(query='XYZZY')
+            assert first.response.total_results == 0
+            assert second.cache_status == 'HIT'
+            assert mock_instance.get.call_count == 1
+
+            await asyncio.sleep(0.06)
+            third = await service.search_news_result(query='xyzzy')
+            assert third.cache_status == 'MISS'
+            assert mock_instance.get.call_count == 2
+
+    async def test_page_etag_and_freshness(self, service, mock_news_response):
+        """Pages get content ETags and Age/max-age from their cache entries"""
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = mock_news_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            miss = await service.get_top_headlines_result(country='us')
+            hit = await service.get_top_headlines_result(country='us')
+            other_page = await service.get_top_headlines_result(country='us', page_size=5)
+
+            assert hit.cache_status == 'HIT'
+            assert hit.etag == miss.etag
+            assert other_page.etag != miss.etag
+            assert 0 < hit.max_age <= service.cache.ttl_policy.bounds['headlines'][1]
+            assert hit.age < 1
+
+            # New content upstream yields a new ETag
+            service.clear_cache()
+            changed = {**mock_news_response, 'totalResults': 39}
+            response.json.return_value = changed
+            refreshed = await service.get_top_headlines_result(country='us')
+            assert refreshed.etag != miss.etag
+
+    async def test_page_body_encoded_lazily(self, service, mock_successful_response):
+        """The ETag is available without encoding the page body"""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            result = await service.get_top_headlines_result(country='us')
+            with patch.object(service, '_encode_page', wraps=service._encode_page) as encode:
+                assert result.etag
+                assert encode.call_count == 0
+                assert result.response.total_results == 38
+                assert encode.call_count == 1
+
+    async def test_fetched_articles_indexed_locally(self, service, mock_successful_response):
+        """local_first searches are answered from articles already fetched"""
+        service.local_search_min_results = 1
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            await service.get_top_headlines_result(country='us')
+            await service.flush_articles()
+            assert service.get_cache_stats()['stored_articles'] == 2
+
+            local = await service.search_news_result(query='test', page_size=1, mode='local_first')
+            assert local.cache_status == 'LOCAL'
+            assert local.response.total_results == 2
+            assert len(local.response.articles) == 1
+            assert mock_instance.get.call_count == 1
+
+            # Too few local matches, or upstream mode: ask NewsAPI
+            missing = await service.search_news_result(query='nothingmatches', mode='local_first')
+            assert missing.cache_status == 'MISS'
+            upstream = await service.search_news_result(query='test')
+            assert upstream.cache_status == 'MISS'
+            assert mock_instance.get.call_count == 3
+
+    async def test_failing_listener_keeps_window(self, service, mock_successful_response):
+        """A listener error is logged; the window stays cached and is served"""
+        import sqlite3
+        received = []
+        service._article_listeners.insert(0, MagicMock(side_effect=sqlite3.OperationalError('database is locked')))
+        service.add_article_listener(lambda articles, params: received.append(articles))
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            first = await service.get_top_headlines_result(country='us')
+            second = await service.get_top_headlines_result(country='us')
+            await service.flush_articles()
+
+            assert mock_instance.get.call_count == 1
+
+        assert first.cache_status == 'MISS'
+        assert second.cache_status == 'HIT'
+        assert len(received) == 1
+        assert service.get_cache_stats()['listener_errors'] == 1
+
+    async def test_listeners_run_off_the_event_loop(self, service, mock_successful_response):
+        """Responses do not wait for the listeners, which run in a worker thread"""
+        import threading
+        started, release = threading.Event(), threading.Event()
+
+        def slow_listener(articles, params):
+            started.set()
+            release.wait(5)
+
+        service.add_article_listener(slow_listener)
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+
+            result = await service.get_top_headlines_result(country='us')
+            assert result.cache_status == 'MISS'
+
+        await asyncio.to_thread(started.wait, 5)
+        assert service.get_cache_stats()['listener_errors'] == 0
+        release.set()
+        await service.flush_articles()
+
+    async def test_recent_searches_use_memory_index(self, service, mock_successful_response):
+        """Newest-first searches within the index window skip SQLite"""
+        from datetime import date
+        service.local_search_min_results = 1
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_successful_response)
+            mock_client.return_value = mock_instance
+            await service.get_top_headlines_result(country='us')
+            await service.flush_articles()
+
+        assert service.get_cache_stats()['indexed_articles'] == 2
+        with patch.object(service.article_store, 'search') as store_search:
+            # Publication dates in the fixture are old, so no dated match
+            recent = await service.search_news_result(
+                query='test', from_date=date.today().isoformat(), mode='local_first'
+            )
+            assert store_search.call_count == 0
+            assert recent.cache_status == 'MISS'
+
+            service.article_store = None
+            result = await service.search_news_result(query='another', page_size=1, mode='local_first')
+            assert result.cache_status == 'LOCAL'
+            assert result.response.total_results == 1
+
     def test_cache_clear(self, service):
         """Test cache clearing functionality"""
         service.cache.set('test', {'key': 'value'}, {'data': 'test'})
@@ -183,4 +987,6 @@ class TestNewsAPIService:
         assert 'size' in stats
         assert 'max_size' in stats
         assert 'ttl_seconds' in stats
-        assert stats['max_size'] == 100
+        assert stats['max_size'] == service.settings.cache_max_entries
+        assert stats['max_bytes'] == service.settings.cache_max_bytes
+        assert {'bytes', 'evictions', 'expirations', 'endpoints'} <= stats.keys()
@@ -0,0 +1,120 @@
+"""
+Unit tests for request parameter canonicalization
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.services.news_api import NewsAPIService
+from backend.utils.normalize import (
+    normalize_date,
+    normalize_headline_params,
+    normalize_query,
+    normalize_search_params
+)
+
+
+class TestNormalizeQuery:
+    """Search query canonicalization"""
+
+    @pytest.mark.parametrize('raw', ['Bitcoin', 'bitcoin ', '  BITCOIN', 'bitCoin\t'])
+    def test_case_and_whitespace_folded(self, raw):
+        """Case and surrounding whitespace do not matter"""
+        assert normalize_query(raw) == 'bitcoin'
+
+    def test_inner_whitespace_collapsed(self):
+        """Runs of whitespace become one space"""
+        assert normalize_query('climate    change\n policy') == 'climate change policy'
+
+    def test_operators_preserved(self):
+        """Upper-case boolean operators keep their meaning"""
+        assert normalize_query('Bitcoin AND  Ethereum NOT doge') == 'bitcoin AND ethereum NOT doge'
+        assert normalize_query('cats and dogs') == 'cats and dogs'
+
+    def test_phrases_lowercased(self):
+        """Quoted phrases are folded like other terms"""
+        assert normalize_query('"Climate Change"') == '"climate change"'
+
+
+class TestNormalizeParams:
+    """Default filling and date normalization"""
+
+    def test_headline_defaults(self):
+        """Missing country defaults to us, codes are lower-cased"""
+        assert normalize_headline_params() == {'country': 'us', 'category': None}
+        assert normalize_headline_params('GB', ' Sports ') == {'country': 'gb', 'category': 'sports'}
+
+    def test_search_defaults(self):
+        """None and default sort order map to the same parameters"""
+        assert normalize_search_params('x', sort_by=None) == normalize_search_params('x', sort_by='publishedAt')
+        assert normalize_search_params('x', language='') == normalize_search_params('x', language=None)
+
+    @pytest.mark.parametrize('raw,expected', [
+        ('2024-01-05', '2024-01-05'),
+        (' 2024-01-05 ', '2024-01-05'),
+        ('2024-01-05T10:30:00Z', '2024-01-05'),
+        ('2024-01-05T23:59:59+02:00', '2024-01-05'),
+        ('', None),
+        (None, None),
+        ('not-a-date', 'not-a-date')
+    ])
+    def test_dates(self, raw, expected):
+        """Dates and timestamps canonicalize to YYYY-MM-DD"""
+        assert normalize_date(raw) == expected
+
+
+@pytest.mark.asyncio
+class TestCacheHitRate:
+    """Equivalent requests share cache entries and upstream calls"""
+
+    # Realistic search log: the same few topics typed in many ways
+    QUERY_LOG = [
+        ('Bitcoin', None, None), ('bitcoin ', None, None), ('  BITCOIN', None, None),
+        ('bitcoin', None, 'publishedAt'), ('Bitcoin', '', None),
+        ('climate change', 'en', None), ('Climate  Change', 'en', None),
+        ('climate change ', 'EN', 'publishedAt'),
+        ('Apple AND iPhone', None, None), ('apple AND iphone', None, None),
+        ('APPLE  AND IPHONE ', None, None),
+        ('elections', 'en', 'relevancy'), ('Elections', 'en', 'relevancy'),
+        ('World Cup', None, None), ('world cup', None, None), ('WORLD CUP', None, None),
+    ]
+
+    async def test_query_log_hit_rate(self):
+        """16 requests for 5 distinct searches cost 5 upstream calls"""
+        service = NewsAPIService()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'status': 'ok', 'totalResults': 0, 'articles': []}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            statuses = [
+                (await service.search_news_result(query=q, language=lang, sort_by=sort)).cache_status
+                for q, lang, sort in self.QUERY_LOG
+            ]
+
+            assert mock_instance.get.call_count == 5
+            sent = {call.kwargs['params']['q'] for call in mock_instance.get.call_args_list}
+
+        assert sent == {'bitcoin', 'climate change', 'apple AND iphone', 'elections', 'world cup'}
+        hit_rate = statuses.count('HIT') / len(statuses)
+        assert hit_rate == pytest.approx(11 / 16)
+
+    async def test_headline_defaults_share_entry(self):
+        """country=None and country='us' are the same request"""
+        service = NewsAPIService()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'status': 'ok', 'totalResults': 0, 'articles': []}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+
+            await service.get_top_headlines()
+            await service.get_top_headlines(country='us')
+            await service.get_top_headlines(country='US', category=None)
+
+            assert mock_instance.get.call_count == 1
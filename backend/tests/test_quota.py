@@ -0,0 +1,75 @@
+"""
+Unit tests for the upstream quota tracker
+"""
+import sqlite3
+import time
+import pytest
+from backend.utils.quota import BACKGROUND, USER, QuotaTracker
+
+
+class TestQuotaTracker:
+    """Rolling-window upstream budget"""
+
+    def test_priorities(self):
+        """Background calls stop before user calls, both before the limit"""
+        quota = QuotaTracker(limit=10, background_reserve=3, safety_margin=2)
+
+        admitted_background = sum(quota.try_acquire(BACKGROUND) for _ in range(10))
+        assert admitted_background == 5
+        admitted_user = sum(quota.try_acquire(USER) for _ in range(10))
+        assert admitted_user == 3
+        assert quota.remaining() == 2
+
+    def test_rolling_window(self):
+        """Calls older than the window no longer count"""
+        quota = QuotaTracker(limit=2, window=0.1, background_reserve=0, safety_margin=0)
+        assert quota.try_acquire()
+        assert quota.try_acquire()
+        assert not quota.try_acquire()
+
+        time.sleep(0.15)
+        assert quota.try_acquire()
+
+    def test_persisted_across_restarts(self, tmp_path):
+        """A file-backed tracker remembers calls after a restart"""
+        path = str(tmp_path / "quota.sqlite3")
+        before = QuotaTracker(limit=10, path=path)
+        for _ in range(4):
+            before.try_acquire()
+        before.mark_exhausted()
+        before.close()
+
+        after = QuotaTracker(limit=10, path=path)
+        assert after.status()['used'] == 4
+        assert after.status()['cache_only']
+        assert not after.try_acquire()
+        after.close()
+
+    def test_failed_acquire_rolls_back(self):
+        """A call that fails part-way is not counted"""
+        class FailingDelete:
+            def __init__(self, conn):
+                self.conn = conn
+
+            def execute(self, sql, *args):
+                if sql.startswith("DELETE"):
+                    raise sqlite3.OperationalError("disk I/O error")
+                return self.conn.execute(sql, *args)
+
+        quota = QuotaTracker(limit=10)
+        conn = quota._conn
+        quota._conn = FailingDelete(conn)
+        with pytest.raises(sqlite3.OperationalError):
+            quota.try_acquire()
+        quota._conn = conn
+
+        assert not conn.in_transaction
+        assert quota.status()['used'] == 0
+        assert quota.try_acquire()
+
+    def test_unlimited(self):
+        """limit=0 never refuses but still counts"""
+        quota = QuotaTracker(limit=0)
+        assert all(quota.try_acquire() for _ in range(200))
+        assert quota.remaining() is None
+        assert quota.status()['used'] == 200
@@ -0,0 +1,104 @@
+"""
+Unit tests for retry backoff and the circuit breaker
+"""
+import time
+from backend.utils.resilience import CircuitBreaker, HedgePolicy, backoff_delays
+
+
+class TestBackoffDelays:
+    """Jittered exponential backoff"""
+
+    def test_delays_bounded_by_growing_ceiling(self):
+        """Each delay stays under base * 2**n, capped"""
+        delays = backoff_delays(base=0.1, cap=0.5)
+        for ceiling in (0.1, 0.2, 0.4, 0.5, 0.5):
+            assert 0 <= next(delays) <= ceiling
+
+    def test_delays_are_jittered(self):
+        """Concurrent retriers do not all wait the same time"""
+        firsts = {next(backoff_delays(base=1, cap=1)) for _ in range(20)}
+        assert len(firsts) > 1
+
+
+class TestCircuitBreaker:
+    """Closed / open / half-open transitions"""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the circuit; a success resets the count"""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+    def test_half_open_single_probe(self):
+        """After the reset timeout only one probe is let through"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """A failing probe opens the circuit for another reset timeout"""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.05)
+        for _ in range(5):
+            breaker.record_failure()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+    def test_released_probe_can_be_retried(self):
+        """An abandoned probe does not leave the circuit stuck half-open"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.allow()
+
+
+class TestHedgePolicy:
+    """Percentile-derived hedge delay and rate cap"""
+
+    def test_initial_delay_until_enough_samples(self):
+        """The configured delay is used until latencies are known"""
+        policy = HedgePolicy(initial_delay=0.5, min_samples=3)
+        policy.record(0.01)
+        assert policy.delay() == 0.5
+
+    def test_delay_follows_percentile(self):
+        """The delay is the configured percentile of recent latencies"""
+        policy = HedgePolicy(percentile=90, min_samples=1, window=100)
+        for i in range(1, 101):
+            policy.record(i / 100)
+        assert policy.delay() == 0.9
+
+        # Old latencies fall out of the window
+        for _ in range(100):
+            policy.record(0.05)
+        assert policy.delay() == 0.05
+
+    def test_rate_cap(self):
+        """No more than max_rate of requests are hedged"""
+        policy = HedgePolicy(max_rate=0.1)
+        hedged = 0
+        for _ in range(100):
+            policy.begin()
+            hedged += policy.try_hedge()
+        assert hedged == 10
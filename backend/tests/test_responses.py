@@ -0,0 +1,87 @@
+"""
+Unit tests for the fast JSON response class
+"""
+import json
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.models.article import NewsResponse
+from backend.utils import responses
+from backend.utils.responses import FastJSONResponse, dumps, etag_matches, make_etag
+
+
+client = TestClient(app)
+
+
+def make_response(mock_news_response):
+    """NewsResponse model with datetimes and URLs"""
+    return NewsResponse(**{**mock_news_response, 'page': 1, 'pageSize': 10, 'totalPages': 4})
+
+
+class TestDumps:
+    """orjson encoding and its stdlib fallback"""
+
+    def test_matches_pydantic_json(self, mock_news_response):
+        """Native datetime/HttpUrl encoding equals Pydantic's JSON output"""
+        model = make_response(mock_news_response)
+        expected = json.loads(model.model_dump_json(by_alias=True))
+        assert json.loads(dumps(model.model_dump(by_alias=True))) == expected
+        assert json.loads(dumps(model)) == expected
+
+    def test_stdlib_fallback(self, mock_news_response, monkeypatch):
+        """Without orjson the output is the same JSON"""
+        model = make_response(mock_news_response)
+        expected = dumps(model.model_dump(by_alias=True))
+
+        monkeypatch.setattr(responses, 'orjson', None)
+        assert json.loads(dumps(model.model_dump(by_alias=True))) == json.loads(expected)
+
+    def test_utc_datetime_uses_z(self, monkeypatch):
+        """UTC datetimes are encoded like Pydantic does, with both encoders"""
+        value = {'at': datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)}
+        assert dumps(value) == b'{"at":"2024-01-15T10:30:00Z"}'
+        monkeypatch.setattr(responses, 'orjson', None)
+        assert dumps(value) == b'{"at":"2024-01-15T10:30:00Z"}'
+
+    def test_response_render(self):
+        """FastJSONResponse renders compact JSON"""
+        response = FastJSONResponse({'status': 'ok', 'items': [1, 2]})
+        assert response.body == b'{"status":"ok","items":[1,2]}'
+        assert response.media_type == 'application/json'
+
+
+class TestETags:
+    """ETag generation and If-None-Match matching"""
+
+    def test_etag_tracks_content(self):
+        """Equal bodies share an ETag, different bodies do not"""
+        assert make_etag(b'{"a":1}') == make_etag(b'{"a":1}')
+        assert make_etag(b'{"a":1}') != make_etag(b'{"a":2}')
+
+    def test_if_none_match(self):
+        """Lists, weak tags and '*' match; missing headers do not"""
+        etag = make_etag(b'body')
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"x", W/{etag}', etag)
+        assert etag_matches('*', etag)
+        assert not etag_matches('"x"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestDefaultResponseClass:
+    """The app encodes its JSON endpoints with FastJSONResponse"""
+
+    def test_endpoints_use_fast_json(self):
+        """Root, health and filters return compact JSON"""
+        for path in ('/', '/health', '/api/filters'):
+            response = client.get(path)
+            assert response.status_code == 200
+            assert response.headers['content-type'] == 'application/json'
+            assert b'": ' not in response.content
+
+    def test_filters_payload_unchanged(self):
+        """Filters keep their field names and values"""
+        data = client.get('/api/filters').json()
+        assert 'technology' in data['categories']
+        assert {'code': 'us', 'name': 'United States'} in data['countries']
+        assert data['sort_options'][0].keys() == {'value', 'label'}
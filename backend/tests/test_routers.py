@@ -1,12 +1,14 @@
 """
 Unit tests for API routers
 """
+import json
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from backend.main import app
 from backend.models.article import NewsResponse
-from backend.services.news_api import NewsAPIError
+from backend.services.news_api import CircuitOpenError, NewsAPIError, NewsResult, QuotaExhaustedError
+from backend.tests.helpers import news_result
 
 
 client = TestClient(app)
@@ -24,6 +26,15 @@ class TestHealthEndpoint:
         assert 'timestamp' in data
         assert 'version' in data
 
+    def test_health_check_uses_injected_service(self, mock_service):
+        """Health reports come from the overridable service dependency"""
+        mock_service.get_quota_status = MagicMock(return_value={'remaining': 7})
+        mock_service.get_upstream_status = MagicMock(return_value={'circuit': 'closed'})
+
+        data = client.get('/health').json()
+        assert data['quota'] == {'remaining': 7}
+        assert data['upstream'] == {'circuit': 'closed'}
+
 
 class TestRootEndpoint:
     """Test root endpoint"""
@@ -41,10 +52,8 @@ class TestRootEndpoint:
 class TestHeadlinesRouter:
     """Test headlines router endpoints"""
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_get_headlines_success(self, mock_service_class):
+    def test_get_headlines_success(self, mock_service):
         """Test successful headlines fetch"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=10,
@@ -53,8 +62,7 @@ class TestHeadlinesRouter:
             totalPages=1,
             articles=[]
         )
-        mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/headlines')
         assert response.status_code == 200
@@ -62,10 +70,8 @@ class TestHeadlinesRouter:
         assert data['status'] == 'ok'
         assert data['page'] == 1
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_get_headlines_with_country(self, mock_service_class):
+    def test_get_headlines_with_country(self, mock_service):
         """Test headlines with country filter"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=10,
@@ -74,16 +80,13 @@ class TestHeadlinesRouter:
             totalPages=1,
             articles=[]
         )
-        mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/headlines?country=us')
         assert response.status_code == 200
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_get_headlines_with_category(self, mock_service_class):
+    def test_get_headlines_with_category(self, mock_service):
         """Test headlines with category filter"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=10,
@@ -92,8 +95,7 @@ class TestHeadlinesRouter:
             totalPages=1,
             articles=[]
         )
-        mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/headlines?category=technology')
         assert response.status_code == 200
@@ -108,14 +110,11 @@ class TestHeadlinesRouter:
         response = client.get('/api/headlines?category=invalid')
         assert response.status_code == 422  # Validation error
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_get_headlines_api_error(self, mock_service_class):
+    def test_get_headlines_api_error(self, mock_service):
         """Test headlines endpoint with API error"""
-        mock_service = AsyncMock()
-        mock_service.get_top_headlines = AsyncMock(
+        mock_service.get_top_headlines_result = AsyncMock(
             side_effect=NewsAPIError("API Error")
         )
-        mock_service_class.return_value = mock_service
 
         response = client.get('/api/headlines')
         assert response.status_code == 500
@@ -123,13 +122,55 @@ class TestHeadlinesRouter:
         assert 'detail' in data
 
 
+    def test_get_headlines_quota_exhausted(self, mock_service):
+        """Budget exhaustion is reported as 503, not a server error"""
+        mock_service.get_top_headlines_result = AsyncMock(
+            side_effect=QuotaExhaustedError("NewsAPI request budget exhausted")
+        )
+
+        response = client.get('/api/headlines')
+        assert response.status_code == 503
+        assert response.json()['detail']['error'] == 'QUOTA_EXHAUSTED'
+
+    def test_get_headlines_circuit_open(self, mock_service):
+        """An open circuit is reported as 503 without waiting on NewsAPI"""
+        mock_service.get_top_headlines_result = AsyncMock(
+            side_effect=CircuitOpenError("NewsAPI is unavailable")
+        )
+
+        response = client.get('/api/headlines')
+        assert response.status_code == 503
+        assert response.json()['detail']['error'] == 'UPSTREAM_UNAVAILABLE'
+
+
+    def test_get_headlines_conditional(self, mock_service, mock_news_response):
+        """ETag and cache headers are sent; a matching If-None-Match gets 304"""
+        result = news_result(NewsResponse(
+            status='ok', totalResults=38, page=1, pageSize=10, totalPages=4,
+            articles=mock_news_response['articles']
+        ), 'HIT')
+        result.age = 42.7
+        result.max_age = 120.2
+        mock_service.get_top_headlines_result = AsyncMock(return_value=result)
+
+        response = client.get('/api/headlines')
+        assert response.status_code == 200
+        etag = response.headers['etag']
+        assert response.headers['cache-control'] == 'public, max-age=120'
+        assert response.headers['age'] == '42'
+        assert response.headers['x-cache'] == 'HIT'
+
+        not_modified = client.get('/api/headlines', headers={'If-None-Match': etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b''
+        assert not_modified.headers['etag'] == etag
+
+
 class TestSearchRouter:
     """Test search router endpoints"""
 
-    @patch('backend.routers.search.NewsAPIService')
-    def test_search_news_success(self, mock_service_class):
+    def test_search_news_success(self, mock_service):
         """Test successful news search"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=20,
@@ -138,8 +179,7 @@ class TestSearchRouter:
             totalPages=2,
             articles=[]
         )
-        mock_service.search_news = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.search_news_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/search?q=bitcoin')
         assert response.status_code == 200
@@ -151,10 +191,8 @@ class TestSearchRouter:
         response = client.get('/api/search')
         assert response.status_code == 422  # Validation error
 
-    @patch('backend.routers.search.NewsAPIService')
-    def test_search_news_with_filters(self, mock_service_class):
+    def test_search_news_with_filters(self, mock_service):
         """Test search with all filters"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=5,
@@ -163,8 +201,7 @@ class TestSearchRouter:
             totalPages=1,
             articles=[]
         )
-        mock_service.search_news = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.search_news_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get(
             '/api/search?q=technology&language=en&sortBy=publishedAt&from=2024-01-01&to=2024-01-31'
@@ -187,20 +224,26 @@ class TestSearchRouter:
         response = client.get('/api/search?q=test&from=invalid-date')
         assert response.status_code == 422  # Validation error
 
-    @patch('backend.routers.search.NewsAPIService')
-    def test_search_news_empty_query_error(self, mock_service_class):
+    def test_search_news_empty_query_error(self, mock_service):
         """Test search with empty query error from service"""
-        mock_service = AsyncMock()
-        mock_service.search_news = AsyncMock(
+        mock_service.search_news_result = AsyncMock(
             side_effect=NewsAPIError("Search query cannot be empty")
         )
-        mock_service_class.return_value = mock_service
 
         response = client.get('/api/search?q= ')
         assert response.status_code == 400
         data = response.json()
         assert 'detail' in data
 
+    def test_search_conditional(self, mock_service, mock_news_response):
+        """Search answers 304 for a current ETag"""
+        result = NewsResult(b'{"status":"ok"}', 'HIT', etag='"abc"')
+        mock_service.search_news_result = AsyncMock(return_value=result)
+
+        response = client.get('/api/search?q=bitcoin', headers={'If-None-Match': '"abc"'})
+        assert response.status_code == 304
+        assert response.headers['etag'] == '"abc"'
+
 
 class TestFiltersRouter:
     """Test filters router endpoints"""
@@ -233,14 +276,76 @@ class TestFiltersRouter:
         assert isinstance(data['sort_options'], list)
         assert any(opt['value'] == 'publishedAt' for opt in data['sort_options'])
 
+    def test_filters_etag_and_cache_control(self):
+        """Filters carry a stable strong ETag and a long Cache-Control"""
+        first = client.get('/api/filters')
+        second = client.get('/api/filters')
+
+        etag = first.headers['etag']
+        assert etag.startswith('"') and not etag.startswith('W/')
+        assert second.headers['etag'] == etag
+        assert first.headers['cache-control'] == 'public, max-age=86400'
+
+    def test_filters_not_modified(self):
+        """A matching If-None-Match gets an empty 304"""
+        etag = client.get('/api/filters').headers['etag']
+
+        response = client.get('/api/filters', headers={'If-None-Match': f'"other", {etag}'})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+
+        stale = client.get('/api/filters', headers={'If-None-Match': '"other"'})
+        assert stale.status_code == 200
+        assert stale.json()['categories']
+
+
+class TestClustersRouter:
+    """Test clusters router endpoint"""
+
+    def test_get_clusters(self, news_service):
+        """Stories built from fetched articles are listed with a representative"""
+        wire = 'The Federal Reserve raised its benchmark rate on Wednesday, citing persistent inflation.'
+        news_service.story_clusters.add([
+            json.dumps({
+                'source': {'id': None, 'name': source},
+                'title': title,
+                'description': wire,
+                'url': f'https://example.com/{source}',
+                'publishedAt': '2024-01-15T10:00:00Z'
+            })
+            for source, title in [('AP', 'Fed raises rates'), ('Reuters', 'Federal Reserve lifts rates')]
+        ])
+
+        response = client.get('/api/clusters')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['totalClusters'] == 1
+        story = data['clusters'][0]
+        assert story['size'] == 2
+        assert story['sources'] == ['AP', 'Reuters']
+        assert story['latestPublishedAt'] == '2024-01-15T10:00:00Z'
+        assert story['article']['url'] in ('https://example.com/AP', 'https://example.com/Reuters')
+
+    def test_clustering_disabled(self, mock_service):
+        """Without a clusterer the endpoint reports 503"""
+        mock_service.story_clusters = None
+
+        response = client.get('/api/clusters')
+        assert response.status_code == 503
+        assert response.json()['detail']['error'] == 'CLUSTERING_DISABLED'
+
+    def test_invalid_limit(self):
+        """Limits outside 1-100 are rejected"""
+        assert client.get('/api/clusters?limit=0').status_code == 422
+        assert client.get('/api/clusters?limit=101').status_code == 422
+
 
 class TestPagination:
     """Test pagination functionality"""
 
-    @patch('backend.routers.headlines.NewsAPIService')
-    def test_headlines_pagination(self, mock_service_class):
+    def test_headlines_pagination(self, mock_service):
         """Test headlines pagination"""
-        mock_service = AsyncMock()
         mock_response = NewsResponse(
             status='ok',
             totalResults=50,
@@ -249,8 +354,7 @@ class TestPagination:
             totalPages=5,
             articles=[]
         )
-        mock_service.get_top_headlines = AsyncMock(return_value=mock_response)
-        mock_service_class.return_value = mock_service
+        mock_service.get_top_headlines_result = AsyncMock(return_value=news_result(mock_response))
 
         response = client.get('/api/headlines?page=2&page_size=10')
         assert response.status_code == 200
@@ -273,3 +377,56 @@ class TestPagination:
         """Test with page size exceeding maximum"""
         response = client.get('/api/headlines?page_size=200')
         assert response.status_code == 422
+
+
+class TestSharedService:
+    """Test that the NewsAPIService is shared across requests"""
+
+    def test_repeated_request_served_from_cache(self, news_service, mock_news_response):
+        """Second identical request must not reach NewsAPI"""
+        from unittest.mock import MagicMock
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_news_response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_instance.get = mock_get
+            mock_client.return_value = mock_instance
+
+            first = client.get('/api/headlines?country=gb&category=science')
+            second = client.get('/api/headlines?country=gb&category=science')
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json() == second.json()
+        assert mock_get.call_count == 1
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+
+    def test_stale_response_marked(self, mock_service):
+        """Stale responses carry X-Cache: STALE"""
+        mock_response = NewsResponse(
+            status='ok',
+            totalResults=1,
+            page=1,
+            pageSize=10,
+            totalPages=1,
+            articles=[]
+        )
+        mock_service.search_news_result = AsyncMock(
+            return_value=news_result(mock_response, 'STALE')
+        )
+
+        response = client.get('/api/search?q=bitcoin')
+        assert response.status_code == 200
+        assert response.headers['X-Cache'] == 'STALE'
+
+    def test_dependency_returns_singleton(self, news_service):
+        """get_news_service always hands out the same instance"""
+        from backend.services.news_api import get_news_service
+
+        assert get_news_service() is news_service
+        assert get_news_service().cache is news_service.cache
@@ -0,0 +1,81 @@
+"""
+Unit tests for the headline cache warmer
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.services.news_api import NewsAPIService
+from backend.services.warmer import CacheWarmer, parse_targets
+from backend.utils.quota import QuotaTracker
+
+
+class TestParseTargets:
+    """Warming target specifications"""
+
+    def test_country_and_category(self):
+        """Specs are canonicalized and deduplicated"""
+        assert parse_targets(['US', 'us:Technology', 'us:technology', 'gb:']) == [
+            ('us', None), ('us', 'technology'), ('gb', None)
+        ]
+
+    def test_full_matrix(self):
+        """'*' expands to every country with and without each category"""
+        targets = parse_targets(['*'])
+        assert len(targets) == 54 * 8
+        assert ('us', None) in targets
+        assert ('de', 'sports') in targets
+
+
+@pytest.mark.asyncio
+class TestCacheWarmer:
+    """Popularity-ordered, quota-bounded warming"""
+
+    @pytest.fixture
+    def service(self, mock_news_response):
+        """Service whose upstream always answers with mock_news_response"""
+        service = NewsAPIService()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = mock_news_response
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=response)
+            mock_client.return_value = mock_instance
+            yield service
+
+    async def test_warms_popular_targets_first(self, service):
+        """Most requested targets are refreshed first, up to the cycle limit"""
+        service.headline_popularity[('gb', None)] = 5
+        service.headline_popularity[('de', None)] = 2
+        warmer = CacheWarmer(service, parse_targets(['us', 'de', 'gb']), max_per_cycle=2)
+
+        assert await warmer.run_once() == 2
+        assert service.client.get.call_count == 2
+        countries = [call.kwargs['params']['country'] for call in service.client.get.call_args_list]
+        assert countries == ['gb', 'de']
+
+        # Warmed pages are cache hits for users
+        result = await service.get_top_headlines_result(country='gb')
+        assert result.cache_status == 'HIT'
+
+    async def test_fresh_entries_skipped(self, service):
+        """Pages that stay fresh until the next cycle are not refetched"""
+        warmer = CacheWarmer(service, parse_targets(['us']), interval=10)
+        assert await warmer.run_once() == 1
+        assert await warmer.run_once() == 0
+        assert service.client.get.call_count == 1
+
+        # Refreshed ahead of time when it would go stale before the next cycle
+        warmer.interval = service.cache.ttl + 1
+        assert await warmer.run_once() == 1
+
+    async def test_stops_at_background_reserve(self, service):
+        """Warming leaves the reserved budget to user-facing requests"""
+        service.quota = QuotaTracker(limit=5, background_reserve=2, safety_margin=1)
+        warmer = CacheWarmer(service, parse_targets(['us', 'gb', 'de', 'fr']), max_per_cycle=10)
+
+        assert await warmer.run_once() == 2
+        assert warmer.stats()['failures'] == 1
+
+        # A user miss still gets through
+        result = await service.get_top_headlines_result(country='it')
+        assert result.cache_status == 'MISS'
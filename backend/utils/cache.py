@@ -1,27 +1,63 @@
 """
 Caching utility for API responses.
 """
-from cachetools import TTLCache
-from typing import Any, Optional
+from collections import defaultdict
+from typing import Any, Dict, Optional
+import asyncio
 import hashlib
 import json
+import time
+
+from backend.utils.cache_backends import CacheBackend, CacheEntry, MemoryBackend
+from backend.utils.ttl import AdaptiveTTL
 
 
 class NewsCache:
     """
     TTL-based cache for NewsAPI responses.
     Helps reduce API calls and improve response times.
+
+    Entries have a soft TTL (``ttl``) after which they are stale, and a
+    hard TTL (``stale_ttl``) after which they are dropped. Stale entries
+    are only returned by ``get_entry`` so callers can serve them while
+    refreshing in the background.
+
+    Storage is delegated to a CacheBackend (in-memory by default, or a
+    shared Redis/SQLite store when several workers should share entries).
+
+    With a ``ttl_policy`` the soft TTL is chosen per entry from how often
+    its key is read instead of using ``ttl`` for everything.
     """
 
-    def __init__(self, ttl: int = 180, maxsize: int = 100):
+    def __init__(
+        self,
+        ttl: int = 180,
+        maxsize: int = 100,
+        stale_ttl: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+        max_bytes: Optional[int] = None,
+        ttl_policy: Optional[AdaptiveTTL] = None
+    ):
         """
         Initialize cache with TTL and max size.
 
         Args:
             ttl: Time-to-live in seconds (default: 180s = 3 minutes)
             maxsize: Maximum number of cached items (default: 100)
+            stale_ttl: Hard TTL in seconds; stale entries are kept until
+                then (default: same as ttl, i.e. no stale serving)
+            backend: Storage backend (default: in-memory, bounded by
+                maxsize and max_bytes)
+            max_bytes: Total size limit for the default in-memory backend
+            ttl_policy: Optional per-key TTL policy (overrides ttl)
         """
-        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl or ttl)
+        self.backend = backend or MemoryBackend(maxsize=maxsize, max_bytes=max_bytes)
+        self.ttl_policy = ttl_policy
+        self._endpoint_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'hits': 0, 'stale_hits': 0, 'misses': 0}
+        )
 
     def _generate_key(self, endpoint: str, params: dict) -> str:
         """
@@ -45,19 +81,62 @@ class NewsCache:
 
     def get(self, endpoint: str, params: dict) -> Optional[Any]:
         """
-        Get cached response if available.
+        Get cached response if available and still fresh.
+
+        Args:
+            endpoint: API endpoint name
+            params: Query parameters dictionary
+
+        Returns:
+            Cached response or None if not found or stale
+        """
+        entry = self.get_entry(endpoint, params)
+        if entry is None or entry.is_stale:
+            return None
+        return entry.value
+
+    def get_entry(self, endpoint: str, params: dict) -> Optional[CacheEntry]:
+        """
+        Get the cache entry, including stale entries within the hard TTL.
 
         Args:
             endpoint: API endpoint name
             params: Query parameters dictionary
 
         Returns:
-            Cached response or None if not found
+            CacheEntry or None if not found
         """
         key = self._generate_key(endpoint, params)
-        return self._cache.get(key)
+        entry = self.backend.get(key)
+        if self.ttl_policy is not None:
+            self.ttl_policy.record_access(key)
+
+        counters = self._endpoint_stats[endpoint]
+        if entry is None:
+            counters['misses'] += 1
+        elif entry.is_stale:
+            counters['stale_hits'] += 1
+        else:
+            counters['hits'] += 1
+        return entry
+
+    def peek(self, endpoint: str, params: dict) -> Optional[CacheEntry]:
+        """
+        Get the cache entry without counting a hit or miss.
+
+        Used by background work (e.g. warming) that must not skew the
+        per-endpoint statistics.
+
+        Args:
+            endpoint: API endpoint name
+            params: Query parameters dictionary
+
+        Returns:
+            CacheEntry or None if not found
+        """
+        return self.backend.get(self._generate_key(endpoint, params))
 
-    def set(self, endpoint: str, params: dict, value: Any) -> None:
+    def set(self, endpoint: str, params: dict, value: Any, ttl: Optional[float] = None) -> CacheEntry:
         """
         Store response in cache.
 
@@ -65,14 +144,87 @@ class NewsCache:
             endpoint: API endpoint name
             params: Query parameters dictionary
             value: Response data to cache
+            ttl: Fixed lifetime in seconds for this entry; it is neither
+                adapted by the TTL policy nor served stale afterwards
+
+        Returns:
+            The stored entry (with its freshness window)
         """
         key = self._generate_key(endpoint, params)
-        self._cache[key] = value
+        now = time.time()
+
+        if ttl is not None:
+            entry = CacheEntry(
+                value=value,
+                stored_at=now,
+                fresh_until=now + ttl,
+                expires_at=now + ttl
+            )
+            self.backend.set(key, entry)
+            return entry
+
+        ttl = self.ttl
+        if self.ttl_policy is not None:
+            ttl = self.ttl_policy.ttl_for(endpoint, key, value)
+
+        entry = CacheEntry(
+            value=value,
+            stored_at=now,
+            fresh_until=now + ttl,
+            expires_at=now + max(ttl, self.stale_ttl)
+        )
+        self.backend.set(key, entry)
+        return entry
 
     def clear(self) -> None:
         """Clear all cached items."""
-        self._cache.clear()
+        self.backend.clear()
 
     def size(self) -> int:
         """Get current number of cached items."""
-        return len(self._cache)
+        return self.backend.size()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Backend statistics (entries, bytes, evictions, ... where the
+            backend tracks them) plus hits and misses per endpoint and,
+            with a TTL policy, the distribution of assigned TTLs
+        """
+        stats = {
+            **self.backend.stats(),
+            'endpoints': {name: dict(counters) for name, counters in self._endpoint_stats.items()}
+        }
+        if self.ttl_policy is not None:
+            stats['ttl_distribution'] = self.ttl_policy.stats()
+            stats['tracked_keys'] = self.ttl_policy.tracked_keys()
+        return stats
+
+    def compact(self) -> int:
+        """
+        Remove expired entries from the backend.
+
+        Returns:
+            Number of entries removed
+        """
+        return self.backend.compact()
+
+    async def compact_periodically(self, interval: float) -> None:
+        """
+        Run compact() every interval seconds until cancelled.
+
+        Compaction runs in a worker thread so disk I/O does not block the
+        event loop.
+
+        Args:
+            interval: Seconds between compactions
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.compact)
+
+    def close(self) -> None:
+        """Release backend resources."""
+        self.backend.close()
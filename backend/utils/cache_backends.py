@@ -0,0 +1,492 @@
+"""
+Storage backends for NewsCache.
+
+The in-memory backend keeps entries per process. The Redis and SQLite
+backends store serialized entries outside the process, so every
+uvicorn/gunicorn worker shares one cache (and one set of upstream calls).
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with the time it was stored and its freshness window."""
+    value: Any
+    stored_at: float
+    fresh_until: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was stored."""
+        return max(0.0, time.time() - self.stored_at)
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the entry is past its soft TTL."""
+        return time.time() >= self.fresh_until
+
+    def to_bytes(self) -> bytes:
+        """Serialize the entry for shared backends."""
+        return json.dumps(asdict(self)).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CacheEntry":
+        """Deserialize an entry written by to_bytes."""
+        return cls(**json.loads(data))
+
+
+class EntryCodec:
+    """
+    Serialize cache entries, optionally compressed with zlib or zstd.
+
+    Decoding detects the format from the first bytes (JSON, a zlib stream
+    or a zstd frame), so a shared store can switch compression without
+    being flushed.
+    """
+
+    ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+    def __init__(self, compression: str = "none", level: Optional[int] = None):
+        """
+        Initialize the codec.
+
+        Args:
+            compression: 'none', 'zlib' or 'zstd'
+            level: Compression level (default: 6 for zlib, 3 for zstd)
+        """
+        if compression not in ("none", "zlib", "zstd"):
+            raise ValueError(f"Unknown cache compression: {compression}")
+        self.compression = compression
+        self.level = level
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+        if compression == "zstd":
+            zstd = self._zstd()
+            self._zstd_compressor = zstd.ZstdCompressor(level=3 if level is None else level)
+
+    @staticmethod
+    def _zstd():
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd cache compression requires the 'zstandard' package: pip install zstandard"
+            ) from e
+        return zstandard
+
+    @property
+    def compressed(self) -> bool:
+        """Whether encoded entries are compressed."""
+        return self.compression != "none"
+
+    def encode(self, entry: CacheEntry) -> bytes:
+        """Serialize (and compress) an entry."""
+        data = entry.to_bytes()
+        if self.compression == "zlib":
+            return zlib.compress(data, 6 if self.level is None else self.level)
+        if self.compression == "zstd":
+            return self._zstd_compressor.compress(data)
+        return data
+
+    def decode(self, data: bytes) -> CacheEntry:
+        """Deserialize an entry written by encode with any compression."""
+        if data[:4] == self.ZSTD_MAGIC:
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = self._zstd().ZstdDecompressor()
+            data = self._zstd_decompressor.decompress(data)
+        elif data[:1] == b'\x78':
+            data = zlib.decompress(data)
+        return CacheEntry.from_bytes(data)
+
+
+class CacheBackend(ABC):
+    """Key/value store for cache entries with per-entry expiry."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an unexpired entry, or None."""
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry until its expires_at time."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Get the number of stored entries."""
+
+    def compact(self) -> int:
+        """
+        Drop expired entries that the store does not evict by itself.
+
+        Returns:
+            Number of entries removed
+        """
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {'entries': self.size()}
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process LRU backend bounded by entry count and total bytes.
+
+    Each entry is charged its serialized size. When either bound is
+    exceeded, expired entries are dropped first, then least recently used
+    ones, and both kinds of removal are counted.
+
+    With a compressing codec, entries are kept as compressed blobs and
+    decoded on every hit, trading hit latency for many more entries in
+    the same max_bytes.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100,
+        max_bytes: Optional[int] = None,
+        codec: Optional[EntryCodec] = None
+    ):
+        """
+        Initialize the in-memory store.
+
+        Args:
+            maxsize: Maximum number of cached items
+            max_bytes: Maximum total size of cached items (None = unbounded)
+            codec: Compressing codec for stored entries (None = keep objects)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.codec = codec if codec is not None and codec.compressed else None
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (entry or compressed blob, expires_at, charged size)
+        self._entries: "OrderedDict[str, Tuple[Union[CacheEntry, bytes], float, int]]" = OrderedDict()
+        # compact() may run in a worker thread
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored, expires_at, _ = item
+            if expires_at <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+
+        if self.codec is not None:
+            return self.codec.decode(stored)
+        return stored
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if self.codec is not None:
+            stored = self.codec.encode(entry)
+            size = len(stored)
+        else:
+            stored = entry
+            size = len(entry.to_bytes())
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Larger than the whole cache: not worth evicting everything for
+                return
+            self._entries[key] = (stored, entry.expires_at, size)
+            self.bytes += size
+            self._evict()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _over_capacity(self) -> bool:
+        if len(self._entries) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        if not self._over_capacity():
+            return
+        self.compact()
+        while self._over_capacity():
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def compact(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.maxsize,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'compression': self.codec.compression if self.codec is not None else 'none'
+        }
+
+
+class RedisBackend(CacheBackend):
+    """
+    Shared backend storing entries in Redis (or any Redis-protocol server).
+
+    Expiry is delegated to Redis key TTLs; memory bounds come from the
+    server's maxmemory policy.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        client: Any = None,
+        prefix: str = "newshub:",
+        codec: Optional[EntryCodec] = None
+    ):
+        """
+        Initialize the Redis store.
+
+        Args:
+            url: Redis connection URL (ignored when client is given)
+            client: Optional pre-built synchronous Redis client
+            prefix: Key prefix isolating this cache in a shared database
+            codec: Entry serialization (default: uncompressed JSON)
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "The redis cache backend requires the 'redis' package: pip install redis"
+                ) from e
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self._prefix = prefix
+        self._codec = codec or EntryCodec()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        data = self._client.get(self._prefix + key)
+        if data is None:
+            return None
+        return self._codec.decode(data)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        ttl_ms = int((entry.expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        self._client.set(self._prefix + key, self._codec.encode(entry), px=ttl_ms)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def _keys(self):
+        return self._client.scan_iter(match=self._prefix + "*")
+
+    def clear(self) -> None:
+        keys = list(self._keys())
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(1 for _ in self._keys())
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Shared backend storing entries in a SQLite database file.
+
+    Needs no server: every worker on the host opens the same file. WAL mode
+    lets readers proceed while another worker writes.
+    """
+
+    def __init__(self, path: str = "news_cache.sqlite3", codec: Optional[EntryCodec] = None):
+        """
+        Initialize the SQLite store.
+
+        Args:
+            path: Database file path (':memory:' for a private store)
+            codec: Entry serialization (default: uncompressed JSON)
+        """
+        self._codec = codec or EntryCodec()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return self._codec.decode(row[0])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, self._codec.encode(entry), entry.expires_at)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def size(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return row[0]
+
+    def compact(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredBackend(CacheBackend):
+    """
+    Two-level backend: a fast primary store in front of a persistent one.
+
+    Writes go to both levels. Reads hit the primary first and lazily load
+    from the secondary on a miss, promoting the entry, so a restarted
+    worker serves warm entries from disk instead of calling NewsAPI.
+    """
+
+    def __init__(self, primary: CacheBackend, secondary: CacheBackend):
+        """
+        Initialize the tiered store.
+
+        Args:
+            primary: Fast store consulted first (usually in-memory)
+            secondary: Persistent store backing it (usually SQLite on disk)
+        """
+        self.primary = primary
+        self.secondary = secondary
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.primary.get(key)
+        if entry is None:
+            entry = self.secondary.get(key)
+            if entry is not None:
+                self.primary.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.primary.set(key, entry)
+        self.secondary.set(key, entry)
+
+    def delete(self, key: str) -> None:
+        self.primary.delete(key)
+        self.secondary.delete(key)
+
+    def clear(self) -> None:
+        self.primary.clear()
+        self.secondary.clear()
+
+    def size(self) -> int:
+        return self.secondary.size()
+
+    def compact(self) -> int:
+        return self.primary.compact() + self.secondary.compact()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.primary.stats(), 'disk_entries': self.secondary.size()}
+
+    def close(self) -> None:
+        self.primary.close()
+        self.secondary.close()
+
+
+def create_cache_backend(settings) -> CacheBackend:
+    """
+    Build the cache backend selected in settings.
+
+    Args:
+        settings: Application Settings
+
+    Returns:
+        Configured CacheBackend
+    """
+    codec = EntryCodec(settings.cache_compression, settings.cache_compression_level)
+
+    if settings.cache_backend == "redis":
+        backend = RedisBackend(url=settings.cache_redis_url, codec=codec)
+    elif settings.cache_backend == "sqlite":
+        return SQLiteBackend(path=settings.cache_sqlite_path, codec=codec)
+    else:
+        backend = MemoryBackend(
+            maxsize=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            codec=codec
+        )
+
+    if settings.cache_disk_path:
+        return TieredBackend(backend, SQLiteBackend(path=settings.cache_disk_path, codec=codec))
+    return backend
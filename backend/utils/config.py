@@ -5,7 +5,7 @@ Handles environment variables and application settings.
 import os
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -30,11 +30,105 @@ class Settings(BaseSettings):
 
     # Cache Configuration (in seconds)
     cache_ttl: int = 180  # 3 minutes
+    cache_stale_ttl: int = 1800  # stale entries served while refreshing, up to 30 minutes
+    cache_max_bytes: int = 64 * 1024 * 1024  # in-memory cache size limit (64 MiB)
+    cache_max_entries: int = 1000
+    cache_negative_ttl: int = 60  # rejected (400) and empty queries; 0 = not cached
+    cache_compression: Literal["none", "zlib", "zstd"] = "none"  # zstd needs 'zstandard'
+    cache_compression_level: Optional[int] = None  # default: zlib 6, zstd 3
+
+    # Popularity-adaptive TTLs: per-endpoint (min, max) fresh TTL in seconds.
+    # Keys read once get the minimum, hot keys with unchanged content the maximum.
+    cache_adaptive_ttl: bool = True
+    cache_ttl_bounds: dict[str, tuple[int, int]] = {
+        "headlines": (180, 1800),
+        "search": (60, 600)
+    }
+
+    # Cache backend: per-process memory, or shared across workers
+    cache_backend: Literal["memory", "redis", "sqlite"] = "memory"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_sqlite_path: str = "news_cache.sqlite3"
+
+    # Optional on-disk tier behind the memory/redis cache (survives restarts)
+    cache_disk_path: Optional[str] = None
+    cache_compact_interval: int = 300  # seconds between expired-entry sweeps
+
+    # Upstream HTTP client (connection pool shared for the worker lifetime)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept
+    http2: bool = False  # requires the optional 'h2' package
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 10.0
+    http_write_timeout: float = 10.0
+    http_pool_timeout: float = 5.0  # wait for a free pooled connection
+
+    # Upstream resilience: retries for transient failures, then fail fast
+    upstream_retries: int = 2  # extra attempts after a timeout, network error or 5xx
+    retry_backoff_base: float = 0.25  # first retry waits up to this long (jittered)
+    retry_backoff_max: float = 2.0
+    circuit_failure_threshold: int = 5  # consecutive failed requests that open the circuit
+    circuit_reset_timeout: float = 30.0  # seconds before a probe request is let through
+
+    # Hedged requests: duplicate a slow upstream call, keep the first answer
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0  # hedge calls slower than this latency percentile
+    hedge_max_rate: float = 0.1  # at most this fraction of calls is duplicated
+    hedge_initial_delay: float = 1.0  # seconds, until enough latencies are observed
+
+    # NewsAPI request budget (free tier: 100 requests/day)
+    quota_limit: int = 100  # 0 = unlimited
+    quota_window: int = 86400  # rolling window in seconds
+    quota_background_reserve: int = 20  # calls kept for user-facing misses
+    quota_safety_margin: int = 5  # switch to cache-only with this many calls left
+    quota_cooldown: int = 3600  # stop calling for this long after a 429
+    quota_state_path: str = "news_quota.sqlite3"  # SQLite file to persist the budget
+
+    # Background cache warming for top headlines ('us', 'us:technology' or '*')
+    warmer_targets: list[str] = []  # empty = warming disabled
+    warmer_interval: int = 120  # seconds between warming cycles
+    warmer_max_per_cycle: int = 5  # upstream calls per cycle
+
+    # Local article store: every fetched article is indexed for full-text search
+    article_store_enabled: bool = True
+    article_store_path: str = ":memory:"  # SQLite file to share/persist the store
+    article_store_retention: int = 7 * 86400  # seconds an article is kept
+    # In-memory inverted index over recently fetched articles
+    article_index_enabled: bool = True
+    article_index_window: int = 72 * 3600  # seconds an article stays indexed
+    # 'local_first' answers searches from the store when it has enough matches
+    search_mode: Literal["upstream", "local_first"] = "upstream"
+    local_search_min_results: int = 20
+
+    # Near-duplicate stories (MinHash-LSH) are collapsed into one article
+    dedup_enabled: bool = True
+    dedup_similarity: float = 0.7  # estimated Jaccard similarity of word sets
+
+    # Incremental TF-IDF story clustering of fetched articles (/api/clusters)
+    clusters_enabled: bool = True
+    clusters_window: int = 24 * 3600  # seconds a story stays active after its last article
+    clusters_similarity: float = 0.3  # cosine similarity to join a story
+
+    # Background ingestion into the local store (also: python -m backend.ingest)
+    ingest_enabled: bool = False  # run the worker inside the app
+    ingest_targets: list[str] = []  # headline targets, as for the warmer
+    ingest_queries: list[str] = []  # searches to follow
+    ingest_language: Optional[str] = None  # language of the searches
+    ingest_interval: int = 300  # seconds between cycle starts
+    ingest_batch_size: int = 500  # articles per store write
+
+    # Browser/CDN caching of the static /api/filters payload (seconds)
+    filters_cache_max_age: int = 86400
 
     # Pagination
     default_page_size: int = 10
     max_page_size: int = 100
 
+    # Upstream paging: fetch aligned windows and slice client pages locally
+    upstream_window_size: int = 100  # NewsAPI maximum pageSize
+    upstream_max_results: int = 100  # results NewsAPI lets us page through (0 = no cap)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
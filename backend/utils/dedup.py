@@ -0,0 +1,207 @@
+"""
+Near-duplicate detection with MinHash-LSH.
+
+The same wire story is republished by many sources with small edits. Each
+article gets a MinHash signature of its distinct words; articles whose
+estimated Jaccard similarity reaches a threshold are treated as one
+story. Locality-sensitive hashing over signature bands finds candidates
+without comparing every pair.
+
+Signatures use one-permutation hashing: each word is hashed once and
+lands in one of NUM_HASHES bins, keeping the bin minimum, with empty
+bins filled from other bins (densification). That costs one hash per
+word instead of one per word and hash function.
+"""
+from functools import lru_cache
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+import hashlib
+import re
+
+from backend.utils.query import tokenize
+
+# Bins (minimum hash values) per signature
+NUM_HASHES = 64
+_BIN_BITS = 6
+_EMPTY = 1 << 64
+# Shorter texts get no signature: their similarity estimates are noise
+MIN_WORDS = 8
+
+
+def _probe_order(slot: int) -> Tuple[int, ...]:
+    """Fixed pseudo-random order in which an empty bin looks for a donor."""
+    return tuple(sorted(
+        (other for other in range(NUM_HASHES) if other != slot),
+        key=lambda other: hashlib.blake2b(bytes((slot, other)), digest_size=8).digest()
+    ))
+
+
+# Each empty bin probes its own sequence, so neighbouring empty bins
+# borrow from different donors and bands of borrowed values do not
+# collide across unrelated texts that share a single word
+_PROBES = tuple(_probe_order(slot) for slot in range(NUM_HASHES))
+
+# NewsAPI appends e.g. "… [+1234 chars]" to truncated content
+_TRUNCATION = re.compile(r'\[\+\d+ chars\]\s*$')
+
+Signature = Tuple[int, ...]
+K = TypeVar('K')
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_hash(word: str) -> int:
+    """64-bit hash of a word."""
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'little')
+
+
+def signature(text: str) -> Signature:
+    """
+    Compute the MinHash signature of a text's distinct folded words.
+
+    Args:
+        text: Text to sign
+
+    Returns:
+        NUM_HASHES minimum hash values (empty for texts with fewer than
+        MIN_WORDS distinct words)
+    """
+    words = set(tokenize(text))
+    if len(words) < MIN_WORDS:
+        return ()
+
+    bins = [_EMPTY] * NUM_HASHES
+    for value in map(_word_hash, words):
+        slot = value & (NUM_HASHES - 1)
+        value >>= _BIN_BITS
+        if value < bins[slot]:
+            bins[slot] = value
+
+    # Densify: an empty bin takes the value of the first filled bin in its
+    # probe order, offset by the attempt so borrowed values differ
+    if _EMPTY in bins:
+        filled = tuple(bins)
+        for slot, value in enumerate(filled):
+            if value == _EMPTY:
+                for attempt, donor in enumerate(_PROBES[slot], 1):
+                    if filled[donor] != _EMPTY:
+                        bins[slot] = filled[donor] + attempt * _EMPTY
+                        break
+    return tuple(bins)
+
+
+def article_signature(title: Optional[str], description: Optional[str], content: Optional[str]) -> Signature:
+    """Signature of an article's title, description and content."""
+    if content:
+        content = _TRUNCATION.sub('', content)
+    return signature(' '.join(filter(None, (title, description, content))))
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the word sets behind two signatures."""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def pack(value: Signature) -> bytes:
+    """Serialize a signature (e.g. for SQLite)."""
+    return b''.join(v.to_bytes(9, 'little') for v in value)
+
+
+def unpack(data: bytes) -> Signature:
+    """Inverse of pack()."""
+    return tuple(int.from_bytes(data[i:i + 9], 'little') for i in range(0, len(data), 9))
+
+
+class MinHashLSH(Generic[K]):
+    """
+    Lookup of signatures at or above a similarity threshold.
+
+    Signatures are cut into bands of ``rows`` values; entries sharing any
+    complete band become candidates, which are then checked against the
+    threshold. The band layout is the widest one whose detection curve
+    rises around the threshold, so few true matches are missed.
+    """
+
+    def __init__(self, threshold: float = 0.7):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of a match
+        """
+        self.threshold = threshold
+        self.rows = 1
+        for rows in range(1, NUM_HASHES + 1):
+            bands = NUM_HASHES // rows
+            # Similarity at which a pair becomes a candidate with ~50% chance
+            if (1 / bands) ** (1 / rows) <= threshold:
+                self.rows = rows
+        self.bands = NUM_HASHES // self.rows
+        self._tables: List[Dict[Signature, List[Tuple[Signature, K]]]] = [{} for _ in range(self.bands)]
+
+    def _keys(self, value: Signature):
+        rows = self.rows
+        return (value[i * rows:(i + 1) * rows] for i in range(self.bands))
+
+    def add(self, value: Signature, key: K) -> None:
+        """Add a signature under a key."""
+        if not value:
+            return
+        for table, band in zip(self._tables, self._keys(value)):
+            table.setdefault(band, []).append((value, key))
+
+    def remove(self, value: Signature, key: K) -> None:
+        """Remove a signature added under a key."""
+        if not value:
+            return
+        for table, band in zip(self._tables, self._keys(value)):
+            entries = table.get(band)
+            if entries is None:
+                continue
+            entries[:] = [entry for entry in entries if entry[1] != key]
+            if not entries:
+                del table[band]
+
+    def find(self, value: Signature) -> Optional[K]:
+        """
+        Find an entry similar to a signature.
+
+        Returns:
+            Key of a matching entry, or None
+        """
+        if not value:
+            return None
+        for table, band in zip(self._tables, self._keys(value)):
+            for other, key in table.get(band, ()):
+                if similarity(value, other) >= self.threshold:
+                    return key
+        return None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for table in self._tables:
+            table.clear()
+
+
+def collapse(items: Iterable[Tuple[Signature, K]], threshold: float) -> List[Tuple[K, List[K]]]:
+    """
+    Group near-duplicate items, keeping the first of each group.
+
+    Args:
+        items: (signature, item) pairs in priority order
+        threshold: Minimum estimated Jaccard similarity of duplicates
+
+    Returns:
+        (kept item, its duplicates) pairs in the order of the kept items
+    """
+    index: MinHashLSH[int] = MinHashLSH(threshold)
+    groups: List[Tuple[K, List[K]]] = []
+    for value, item in items:
+        match = index.find(value)
+        if match is None:
+            # Items too short to sign (empty signature) are never merged
+            index.add(value, len(groups))
+            groups.append((item, []))
+        else:
+            groups[match][1].append(item)
+    return groups
@@ -0,0 +1,118 @@
+"""
+Canonicalization of request parameters.
+
+Equivalent requests ("Bitcoin", "bitcoin ", "  BITCOIN") must map to the
+same cache entry and the same upstream request, so parameters are
+normalized before either is built.
+"""
+from datetime import date, datetime
+from typing import Dict, Optional
+
+DEFAULT_COUNTRY = 'us'
+DEFAULT_SORT_BY = 'publishedAt'
+
+# NewsAPI only treats these as operators when written in upper case
+QUERY_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonicalize a search query.
+
+    Whitespace is collapsed and terms are lower-cased (NewsAPI matching is
+    case-insensitive), while upper-case AND/OR/NOT operators are kept so
+    the query keeps its meaning.
+
+    Args:
+        query: Raw search query
+
+    Returns:
+        Canonical query string
+    """
+    return ' '.join(
+        token if token in QUERY_OPERATORS else token.lower()
+        for token in query.split()
+    )
+
+
+def normalize_code(value: Optional[str]) -> Optional[str]:
+    """Lower-case a country/language/category code; blank becomes None."""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """
+    Canonicalize a date to YYYY-MM-DD.
+
+    Full ISO timestamps are truncated to their date. Values that cannot be
+    parsed are passed through (stripped) for NewsAPI to reject.
+
+    Args:
+        value: Date or datetime string
+
+    Returns:
+        ISO date string, or None when empty
+    """
+    if value is None or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date().isoformat()
+    except ValueError:
+        return value
+
+
+def normalize_headline_params(
+    country: Optional[str] = None,
+    category: Optional[str] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Canonical parameters for a top-headlines request.
+
+    Args:
+        country: 2-letter country code (defaults to 'us')
+        category: Category filter
+
+    Returns:
+        Dict with 'country' and 'category'
+    """
+    return {
+        'country': normalize_code(country) or DEFAULT_COUNTRY,
+        'category': normalize_code(category)
+    }
+
+
+def normalize_search_params(
+    query: str,
+    language: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    sort_by: Optional[str] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Canonical parameters for an everything (search) request.
+
+    Args:
+        query: Search query
+        language: 2-letter language code
+        from_date: Start date
+        to_date: End date
+        sort_by: Sort option (defaults to 'publishedAt')
+
+    Returns:
+        Dict with 'q', 'language', 'from', 'to' and 'sortBy'
+    """
+    return {
+        'q': normalize_query(query),
+        'language': normalize_code(language),
+        'from': normalize_date(from_date),
+        'to': normalize_date(to_date),
+        'sortBy': (sort_by or '').strip() or DEFAULT_SORT_BY
+    }
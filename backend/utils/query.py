@@ -0,0 +1,204 @@
+"""
+Translation of NewsAPI search queries for the local full-text index.
+
+NewsAPI's ``q`` accepts terms, "exact phrases", +required and -excluded
+terms, AND/OR/NOT and parentheses. The same query is turned into an
+SQLite FTS5 match expression, or parsed into a tree for the in-memory
+index, so local results follow NewsAPI semantics.
+"""
+from typing import Any, List, Optional, Tuple
+import re
+import unicodedata
+
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+_TOKENS = re.compile(r'[+-]?"[^"]*"?|\(|\)|[^\s()]+')
+_WORDS = re.compile(r'\w+')
+_COMBINING = re.compile(r'[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+# Parsed query: ('phrase', words) | ('and', [nodes]) | ('or', [nodes])
+# | ('not', included, excluded)
+QueryNode = Tuple[Any, ...]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into case- and diacritic-folded words.
+
+    'Café' and 'CAFE' both become 'cafe', so queries match regardless of
+    accents or case.
+
+    Args:
+        text: Article or query text
+
+    Returns:
+        Folded words in order
+    """
+    if not text.isascii():
+        text = _COMBINING.sub('', unicodedata.normalize('NFKD', text))
+    return _WORDS.findall(text.casefold())
+
+
+def _phrase(text: str) -> Optional[str]:
+    """Quote the words of text as one FTS5 phrase (None if it has none)."""
+    words = _WORDS.findall(text)
+    if not words:
+        return None
+    return '"' + ' '.join(words) + '"'
+
+
+def to_fts_query(query: str) -> Optional[str]:
+    """
+    Convert a NewsAPI query to an FTS5 match expression.
+
+    Every term is quoted, so punctuation in user input cannot break the
+    FTS5 syntax. Terms without an operator between them are ANDed, as on
+    NewsAPI.
+
+    Args:
+        query: NewsAPI ``q`` value
+
+    Returns:
+        FTS5 expression, or None if the query cannot be answered locally
+        (for example a purely negative query like '-bitcoin')
+    """
+    parts: List[str] = []
+    for token in _TOKENS.findall(query):
+        if token in OPERATORS or token in ('(', ')'):
+            parts.append(token)
+            continue
+
+        excluded = token.startswith('-')
+        phrase = _phrase(token.lstrip('+-'))
+        if phrase is None:
+            continue
+        if excluded:
+            parts.append('NOT')
+        parts.append(phrase)
+
+    # FTS5 NOT is binary: it needs a positive term before it
+    while parts and parts[0] in OPERATORS:
+        if parts[0] == 'NOT':
+            return None
+        parts.pop(0)
+    while parts and parts[-1] in OPERATORS:
+        parts.pop()
+    if not parts:
+        return None
+
+    expression: List[str] = []
+    for part in parts:
+        if expression and part == 'NOT' and expression[-1] in OPERATORS:
+            # "a AND -b" / "a OR NOT b": FTS5 only has binary NOT
+            if expression[-1] == 'OR':
+                return None
+            expression.pop()
+        expression.append(part)
+    return ' '.join(expression)
+
+
+class _Parser:
+    """
+    Recursive-descent parser for NewsAPI queries.
+
+    Precedence follows FTS5 so both local search paths agree: NOT binds
+    tighter than AND (explicit or implied by adjacency), AND tighter
+    than OR.
+    """
+
+    def __init__(self, query: str):
+        self.tokens = _TOKENS.findall(query)
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse_or(self) -> Optional[QueryNode]:
+        children = [self.parse_and()]
+        while self.peek() == 'OR':
+            self.next()
+            children.append(self.parse_and())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def parse_and(self) -> Optional[QueryNode]:
+        node: Optional[QueryNode] = None
+        while self.peek() not in (None, 'OR', ')'):
+            if self.peek() == 'AND':
+                self.next()
+                continue
+            negated, operand = self.parse_not()
+            if operand is None:
+                continue
+            if not negated:
+                node = operand if node is None else _and(node, operand)
+            elif node is None:
+                raise ValueError("negation needs a positive term before it")
+            else:
+                node = ('not', node, operand)
+        return node
+
+    def parse_not(self) -> Tuple[bool, Optional[QueryNode]]:
+        """Parse one operand, returning whether it is excluded."""
+        if self.peek() == 'NOT':
+            self.next()
+            return True, self.parse_primary()
+        token = self.peek()
+        if token.startswith('-'):
+            self.next()
+            return True, _phrase_node(token[1:])
+        return False, self.parse_primary()
+
+    def parse_primary(self) -> Optional[QueryNode]:
+        token = self.peek()
+        if token is None or token in OPERATORS or token == ')':
+            return None
+        self.next()
+        if token == '(':
+            node = self.parse_or()
+            if self.peek() != ')':
+                raise ValueError("unbalanced parentheses")
+            self.next()
+            return node
+        return _phrase_node(token.lstrip('+-'))
+
+
+def _phrase_node(text: str) -> Optional[QueryNode]:
+    words = tuple(tokenize(text))
+    return ('phrase', words) if words else None
+
+
+def _and(left: QueryNode, right: QueryNode) -> QueryNode:
+    if left[0] == 'and':
+        return ('and', [*left[1], right])
+    return ('and', [left, right])
+
+
+def parse_query(query: str) -> Optional[QueryNode]:
+    """
+    Parse a NewsAPI query into a tree of phrases and operators.
+
+    Phrase words are folded with tokenize().
+
+    Args:
+        query: NewsAPI ``q`` value
+
+    Returns:
+        Root node, or None if the query cannot be answered locally
+        (no positive terms, or malformed)
+    """
+    parser = _Parser(query)
+    try:
+        node = parser.parse_or()
+        if parser.peek() is not None:
+            raise ValueError("unbalanced parentheses")
+    except ValueError:
+        return None
+    return node
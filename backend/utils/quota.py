@@ -0,0 +1,155 @@
+"""
+Upstream request budget tracking.
+
+NewsAPI's free tier allows 100 requests per day. The tracker counts calls
+in a rolling window so the service can stop calling upstream (and serve
+from cache only) before the limit is hit instead of after a 429.
+"""
+from typing import Any, Dict, Optional
+import sqlite3
+import threading
+import time
+
+USER = 'user'
+BACKGROUND = 'background'
+
+
+class QuotaTracker:
+    """
+    Rolling-window counter of upstream calls with priority-aware admission.
+
+    Calls are recorded in SQLite, so a file path persists the budget across
+    restarts and shares it between workers (':memory:' keeps it per process).
+
+    Admission rules, with ``remaining = limit - calls in the window``:
+    - user-facing misses are allowed while remaining > safety_margin
+    - background work (refreshes, warming) is allowed only while
+      remaining > safety_margin + background_reserve
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        window: float = 86400,
+        background_reserve: int = 20,
+        safety_margin: int = 5,
+        cooldown: float = 3600,
+        path: str = ":memory:"
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            limit: Upstream calls allowed per window (0 = unlimited)
+            window: Rolling window length in seconds
+            background_reserve: Calls kept back for user-facing requests
+            safety_margin: Calls left unused before switching to cache-only
+            cooldown: Seconds to stop calling after NewsAPI reports 429
+            path: SQLite database path for the call log
+        """
+        self.limit = limit
+        self.window = window
+        self.background_reserve = background_reserve
+        self.safety_margin = safety_margin
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS quota_calls (ts REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS quota_calls_ts ON quota_calls (ts)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_state (name TEXT PRIMARY KEY, value REAL NOT NULL)"
+        )
+
+    def _used(self, now: float) -> int:
+        """Count calls in the window ending at now (lock must be held)."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM quota_calls WHERE ts > ?", (now - self.window,)
+        ).fetchone()[0]
+
+    def _blocked_until(self) -> float:
+        """End of the current 429 cooldown (lock must be held)."""
+        row = self._conn.execute(
+            "SELECT value FROM quota_state WHERE name = 'blocked_until'"
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def _threshold(self, priority: str) -> int:
+        """Minimum remaining budget required to admit a call."""
+        if priority == BACKGROUND:
+            return self.safety_margin + self.background_reserve
+        return self.safety_margin
+
+    def try_acquire(self, priority: str = USER) -> bool:
+        """
+        Record an upstream call if the budget allows it.
+
+        Args:
+            priority: USER for user-facing misses, BACKGROUND otherwise
+
+        Returns:
+            True if the call may proceed (and was counted)
+        """
+        now = time.time()
+        with self._lock:
+            if self._blocked_until() > now:
+                return False
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                remaining = self.limit - self._used(now)
+                allowed = not self.limit or remaining > self._threshold(priority)
+                if allowed:
+                    self._conn.execute("INSERT INTO quota_calls (ts) VALUES (?)", (now,))
+                self._conn.execute("DELETE FROM quota_calls WHERE ts <= ?", (now - self.window,))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+        return allowed
+
+    def mark_exhausted(self) -> None:
+        """Stop admitting calls for the cooldown period (NewsAPI returned 429)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quota_state (name, value) VALUES ('blocked_until', ?)",
+                (time.time() + self.cooldown,)
+            )
+
+    def remaining(self) -> Optional[int]:
+        """Get the number of calls left in the current window (None if unlimited)."""
+        if not self.limit:
+            return None
+        with self._lock:
+            return max(0, self.limit - self._used(time.time()))
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the current budget.
+
+        Returns:
+            Dict with limit, used, remaining and whether the service is in
+            cache-only mode (user-facing misses are no longer admitted)
+        """
+        now = time.time()
+        with self._lock:
+            used = self._used(now)
+            blocked = self._blocked_until() > now
+
+        remaining = max(0, self.limit - used) if self.limit else None
+        cache_only = blocked or (remaining is not None and remaining <= self.safety_margin)
+        return {
+            'limit': self.limit,
+            'window_seconds': self.window,
+            'used': used,
+            'remaining': remaining,
+            'cache_only': cache_only
+        }
+
+    def close(self) -> None:
+        """Close the call log."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,166 @@
+"""
+Retry, circuit-breaker and hedging helpers for upstream calls.
+"""
+from collections import deque
+from typing import Deque, Iterator
+import math
+import random
+import time
+
+
+def backoff_delays(base: float, cap: float) -> Iterator[float]:
+    """
+    Exponential backoff delays with full jitter.
+
+    The n-th delay is drawn uniformly from [0, min(cap, base * 2**n)], so
+    clients retrying at the same moment spread out instead of hammering
+    the upstream in lockstep.
+
+    Args:
+        base: Delay ceiling for the first retry, in seconds
+        cap: Maximum delay ceiling, in seconds
+
+    Yields:
+        Seconds to wait before each successive retry
+    """
+    attempt = 0
+    while True:
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+        attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused without touching the network. Once ``reset_timeout``
+    has passed a single probe call is let through (half-open); its success
+    closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            True if the call should proceed
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """The upstream answered: close the circuit."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """The upstream failed: open the circuit if the threshold is reached."""
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """An allowed call was abandoned before reaching the upstream."""
+        self._probing = False
+
+
+class HedgePolicy:
+    """
+    Decide when to send a duplicate (hedged) request, and how often.
+
+    The hedge delay is a percentile of recently observed latencies, so only
+    requests slower than, say, 95% of their peers are duplicated. Hedges are
+    additionally capped to a fraction of all requests, which bounds the
+    extra upstream calls no matter how the latencies behave.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        max_rate: float = 0.1,
+        initial_delay: float = 1.0,
+        window: int = 200,
+        min_samples: int = 20
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile used as the hedge delay
+            max_rate: Maximum fraction of requests that may be hedged
+            initial_delay: Delay used until min_samples latencies are known
+            window: Number of recent latencies kept
+            min_samples: Latencies needed before the percentile is used
+        """
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def delay(self) -> float:
+        """Seconds to wait for a response before hedging."""
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(self._latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def begin(self) -> float:
+        """
+        Count a new request.
+
+        Returns:
+            Seconds to wait before hedging it
+        """
+        self.requests += 1
+        return self.delay()
+
+    def try_hedge(self) -> bool:
+        """
+        Count a hedge if the rate cap allows it.
+
+        Returns:
+            True if the duplicate request may be sent
+        """
+        if self.hedges + 1 > self.max_rate * self.requests:
+            return False
+        self.hedges += 1
+        return True
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a completed request."""
+        self._latencies.append(latency)
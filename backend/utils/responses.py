@@ -0,0 +1,131 @@
+"""
+Fast JSON responses and HTTP conditional-request helpers.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Pydantic models, datetimes and URLs are encoded directly, so
+handlers can return model dumps without a jsonable_encoder pass.
+
+Pre-encoded bodies can be served with an ETag so clients revalidate with
+If-None-Match and get an empty 304 instead of the full payload.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Union
+import hashlib
+import json
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON library does not know natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, datetime):
+        if obj.utcoffset() == timedelta(0):
+            return obj.replace(tzinfo=None).isoformat() + 'Z'
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # HttpUrl, UUID, Decimal, ...
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON.
+
+    Args:
+        content: JSON-compatible data, possibly containing pydantic models,
+            datetimes or URLs
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or compact json as a fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag for a response body.
+
+    Args:
+        body: Exact bytes sent to the client
+
+    Returns:
+        Quoted entity tag derived from the body's content
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    'W/' prefixed tags and '*' also match.
+
+    Args:
+        if_none_match: Raw header value (may list several tags)
+        etag: Current entity tag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        tag.strip().removeprefix('W/') == opaque
+        for tag in if_none_match.split(',')
+    )
+
+
+def conditional_response(
+    request: Request,
+    body: Union[bytes, Callable[[], bytes]],
+    etag: str,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = "application/json"
+) -> Response:
+    """
+    Serve a pre-encoded body, or 304 Not Modified if the client has it.
+
+    Args:
+        request: Incoming request (its If-None-Match header is checked)
+        body: Encoded response body, or a function producing it (only
+            called when the body is actually sent)
+        etag: Entity tag of body (see make_etag)
+        headers: Extra headers, e.g. Cache-Control, sent on 200 and 304
+        media_type: Content type of body
+
+    Returns:
+        200 response with body, or an empty 304 response
+    """
+    headers = {**(headers or {}), 'ETag': etag}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    if callable(body):
+        body = body()
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,64 @@
+"""
+Request coalescing for concurrent identical calls.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work; callers arriving while it
+    is still running await the same result (or exception) instead of
+    repeating the call.
+    """
+
+    def __init__(self):
+        """Initialize an empty in-flight map and counters."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Coalescing key (e.g. a NewsCache key)
+            fn: Zero-argument coroutine function doing the actual work
+
+        Returns:
+            The shared result of fn
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled caller does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task from the in-flight map."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    async def cancel_all(self) -> None:
+        """Cancel every in-flight call and wait for them to finish."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def in_flight(self) -> int:
+        """Get the number of keys currently being fetched."""
+        return len(self._inflight)
@@ -0,0 +1,139 @@
+"""
+Popularity-adaptive cache TTLs.
+
+A headline page requested thousands of times an hour is worth keeping
+longer than a search run once. The policy tracks how often each key is
+read and whether refreshes actually changed it, and picks each entry's
+TTL within per-endpoint bounds.
+"""
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Tuple
+import hashlib
+import json
+import math
+import statistics
+import threading
+
+
+class AdaptiveTTL:
+    """
+    Per-key TTLs derived from access frequency and content churn.
+
+    For a key read ``hits`` times since it was last stored, and whose last
+    ``unchanged`` refreshes returned identical content:
+
+        ttl = min_ttl * (1 + log2(hits)) * 2 ** unchanged
+
+    clamped to the endpoint's [min_ttl, max_ttl]. One-off keys get min_ttl;
+    hot, stable keys move towards max_ttl. Per-key state is kept for the
+    ``max_keys`` most recently used keys.
+    """
+
+    # Each unchanged refresh doubles the TTL, up to 2 ** MAX_UNCHANGED
+    MAX_UNCHANGED = 3
+
+    def __init__(
+        self,
+        bounds: Dict[str, Tuple[float, float]],
+        default_ttl: float = 180,
+        max_keys: int = 10000,
+        history: int = 1000
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            bounds: (min_ttl, max_ttl) in seconds per endpoint
+            default_ttl: TTL for endpoints without bounds
+            max_keys: Keys whose access statistics are tracked
+            history: Recent TTL assignments kept per endpoint for stats
+        """
+        self.bounds = {endpoint: (min(b), max(b)) for endpoint, b in bounds.items()}
+        self.default_ttl = default_ttl
+        self.max_keys = max_keys
+        self._keys: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._assigned: Dict[str, Deque[float]] = {}
+        self._history = history
+        # The cache may also be used from worker threads
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> Dict[str, Any]:
+        """Get (or create) the tracked state of a key (lock must be held)."""
+        state = self._keys.get(key)
+        if state is None:
+            state = {'hits': 0, 'unchanged': 0, 'fingerprint': None}
+            self._keys[key] = state
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        return state
+
+    def record_access(self, key: str) -> None:
+        """Count a read of the key (hit or miss)."""
+        with self._lock:
+            self._state(key)['hits'] += 1
+
+    def ttl_for(self, endpoint: str, key: str, value: Any) -> float:
+        """
+        Choose the TTL for a value about to be stored.
+
+        Args:
+            endpoint: Cache namespace, selecting the TTL bounds
+            key: Cache key
+            value: JSON-serializable value being stored
+
+        Returns:
+            TTL in seconds
+        """
+        fingerprint = hashlib.md5(
+            json.dumps(value, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        with self._lock:
+            state = self._state(key)
+            if fingerprint == state['fingerprint']:
+                state['unchanged'] = min(state['unchanged'] + 1, self.MAX_UNCHANGED)
+            else:
+                state['unchanged'] = 0
+            state['fingerprint'] = fingerprint
+            hits = max(1, state['hits'])
+            # Popularity is measured per lifetime of the entry
+            state['hits'] = 0
+
+            if endpoint in self.bounds:
+                low, high = self.bounds[endpoint]
+                ttl = low * (1 + math.log2(hits)) * 2 ** state['unchanged']
+                ttl = min(max(ttl, low), high)
+            else:
+                ttl = self.default_ttl
+
+            self._assigned.setdefault(endpoint, deque(maxlen=self._history)).append(ttl)
+        return ttl
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the distribution of recently assigned TTLs.
+
+        Returns:
+            Per endpoint: number of assignments considered and the
+            min/median/max/mean TTL in seconds
+        """
+        with self._lock:
+            assigned = {endpoint: list(ttls) for endpoint, ttls in self._assigned.items()}
+
+        return {
+            endpoint: {
+                'count': len(ttls),
+                'min': min(ttls),
+                'median': statistics.median(ttls),
+                'max': max(ttls),
+                'mean': round(statistics.fmean(ttls), 1)
+            }
+            for endpoint, ttls in assigned.items()
+            if ttls
+        }
+
+    def tracked_keys(self) -> int:
+        """Number of keys with access statistics."""
+        return len(self._keys)